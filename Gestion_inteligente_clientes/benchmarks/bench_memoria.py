@@ -0,0 +1,90 @@
+"""
+Benchmark de memoria: bytes por cliente antes (__dict__) y después (__slots__).
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/bench_memoria.py [cantidad]
+
+"antes" reproduce el layout anterior: un objeto con __dict__ que guarda los
+mismos atributos (_id, _nombre, _email, ...). "después" usa las clases reales.
+Se informan dos métricas:
+  - objeto: tamaño del objeto (+ su __dict__), sin contar los strings
+  - total: memoria asignada por cliente medida con tracemalloc (incluye strings)
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.cliente_regular import ClienteRegular  # noqa: E402
+from modulos.cliente_premium import ClientePremium  # noqa: E402
+from modulos.cliente_corporativo import ClienteCorporativo  # noqa: E402
+
+
+def _datos(i: int, cls) -> tuple:
+    base = (i, f"Cliente {i}", f"cliente{i}@mail.com", f"+569{i:08d}", f"Calle {i} #100")
+    if cls is ClientePremium:
+        return base, {"nivel": "gold"}
+    if cls is ClienteCorporativo:
+        return base, {"empresa": f"Empresa {i % 100}", "contacto": f"Ejecutivo {i % 50}"}
+    return base, {}
+
+
+def _con_dict(cls):
+    """Réplica del layout previo: mismos atributos, pero en un __dict__."""
+    replica = type(f"{cls.__name__}ConDict", (), {})
+
+    def crear(id_, nombre, email, telefono, direccion, **extra):
+        o = replica()
+        o._gestor = None
+        o._id = int(id_)
+        o._nombre = nombre.strip()
+        o._email = email.strip().lower()
+        o._telefono = telefono.strip()
+        o._direccion = direccion.strip()
+        for k, v in extra.items():
+            setattr(o, f"_{k}", v.strip().lower() if k == "nivel" else v.strip())
+        return o
+
+    return crear
+
+
+def _tamano_objeto(o) -> int:
+    tam = sys.getsizeof(o)
+    if hasattr(o, "__dict__"):
+        tam += sys.getsizeof(o.__dict__)
+    return tam
+
+
+def _medir(fabrica, cls, n: int) -> tuple:
+    filas = [_datos(i, cls) for i in range(n)]
+
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    objetos = [fabrica(*base, **extra) for base, extra in filas]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+
+    # descontar la lista contenedora
+    total -= sys.getsizeof(objetos)
+    return _tamano_objeto(objetos[0]), total / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"Bytes por cliente ({n} instancias)")
+    print("Clase | Objeto antes | Objeto después | Total antes | Total después | Ahorro total")
+    print("-" * 86)
+    for cls in (ClienteRegular, ClientePremium, ClienteCorporativo):
+        obj_antes, total_antes = _medir(_con_dict(cls), cls, n)
+        obj_despues, total_despues = _medir(cls, cls, n)
+        ahorro = (1 - total_despues / total_antes) * 100
+        print(
+            f"{cls.__name__} | {obj_antes} | {obj_despues} | "
+            f"{total_antes:.0f} | {total_despues:.0f} | {ahorro:.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Prueba de carga del servicio HTTP (modulos/servidor_http.py).
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/carga_http.py [conexiones] [pedidos_por_conexion] [profundidad]
+
+Levanta el servidor en un subproceso (puerto libre, almacenamiento en
+memoria), carga clientes por POST y luego abre `conexiones` conexiones
+keep-alive que envían pedidos GET/PATCH/buscar en ráfagas de `profundidad`
+pedidos (pipelining). Informa pedidos por segundo y latencias p50/p99 por
+ráfaga, y verifica que cada respuesta corresponda a su pedido.
+"""
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENTES = 2_000
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pedido(metodo: str, ruta: str, datos: dict = None) -> bytes:
+    cuerpo = b"" if datos is None else json.dumps(datos).encode("utf-8")
+    return (
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(cuerpo)}\r\n\r\n"
+    ).encode("latin-1") + cuerpo
+
+
+async def _leer_respuesta(reader: asyncio.StreamReader) -> tuple:
+    cabecera = await reader.readuntil(b"\r\n\r\n")
+    lineas = cabecera.decode("latin-1").split("\r\n")
+    estado = int(lineas[0].split(" ")[1])
+    largo = 0
+    for linea in lineas[1:]:
+        if linea.lower().startswith("content-length:"):
+            largo = int(linea.split(":", 1)[1])
+    cuerpo = await reader.readexactly(largo) if largo else b""
+    return estado, json.loads(cuerpo) if cuerpo else None
+
+
+async def _esperar_servidor(puerto: int) -> None:
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", puerto)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("El servidor no respondió")
+
+
+async def _cargar(puerto: int) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+    for i in range(CLIENTES):
+        writer.write(_pedido("POST", "/clientes", {
+            "tipo": ("regular", "premium", "corporativo")[i % 3], "id": i, "nombre": f"Cliente {i}",
+            "email": f"cliente{i}@mail.com", "telefono": f"+569{i:08d}", "direccion": f"Calle {i} #100",
+            "nivel": "gold", "empresa": f"Empresa {i % 10}", "contacto": "Ejecutivo",
+        }))
+    await writer.drain()
+    for _ in range(CLIENTES):
+        estado, _ = await _leer_respuesta(reader)
+        assert estado == 201, estado
+    writer.close()
+
+
+async def _conexion(puerto: int, pedidos: int, profundidad: int, semilla: int, latencias: list, fallas: list) -> None:
+    rnd = random.Random(semilla)
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+    enviados = 0
+    while enviados < pedidos:
+        rafaga = []
+        for _ in range(min(profundidad, pedidos - enviados)):
+            id_ = rnd.randrange(CLIENTES)
+            op = rnd.random()
+            if op < 0.7:
+                writer.write(_pedido("GET", f"/clientes/{id_}"))
+                rafaga.append(("id", id_))
+            elif op < 0.9:
+                writer.write(_pedido("PATCH", f"/clientes/{id_}", {"direccion": f"Avenida {rnd.randrange(1000)}"}))
+                rafaga.append(("id", id_))
+            else:
+                writer.write(_pedido("GET", f"/buscar?nombre=Cliente%20{id_ % 100}&limite=10"))
+                rafaga.append(("buscar", None))
+        enviados += len(rafaga)
+
+        t0 = time.perf_counter()
+        await writer.drain()
+        for tipo, id_ in rafaga:
+            estado, datos = await _leer_respuesta(reader)
+            if estado != 200 or (tipo == "id" and datos["id"] != id_):
+                fallas.append((tipo, id_, estado))
+        latencias.append(time.perf_counter() - t0)
+    writer.close()
+
+
+async def _medir(puerto: int, conexiones: int, pedidos: int, profundidad: int) -> None:
+    await _esperar_servidor(puerto)
+    await _cargar(puerto)
+
+    latencias, fallas = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _conexion(puerto, pedidos, profundidad, i, latencias, fallas) for i in range(conexiones)
+    ))
+    duracion = time.perf_counter() - t0
+
+    latencias.sort()
+    total = conexiones * pedidos
+    print(f"{conexiones} conexiones x {pedidos} pedidos, pipelining de {profundidad}: {duracion:.2f}s")
+    print(f"{total / duracion:,.0f} pedidos/s")
+    print(
+        f"latencia por ráfaga: p50={latencias[len(latencias) // 2] * 1000:.2f}ms "
+        f"p99={latencias[int(len(latencias) * 0.99)] * 1000:.2f}ms"
+    )
+    if fallas:
+        print(f"FALLA: {len(fallas)} respuestas incorrectas, p. ej. {fallas[:3]}")
+        sys.exit(1)
+    print("OK: todas las respuestas llegaron en orden")
+
+
+def main():
+    conexiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pedidos = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    profundidad = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    puerto = _puerto_libre()
+    entorno = dict(os.environ, GIC_PUERTO=str(puerto), GIC_ALMACEN="memoria")
+    servidor = subprocess.Popen([sys.executable, "-m", "modulos.servidor_http"], cwd=PROYECTO, env=entorno)
+    try:
+        asyncio.run(_medir(puerto, conexiones, pedidos, profundidad))
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Prueba de estrés del gestor en modo concurrente.
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/estres_concurrencia.py [hilos] [altas_por_hilo] [almacen]
+
+Varios hilos intentan dar de alta clientes cuyos IDs y emails se pisan a
+propósito (cada ID lo intentan varios hilos, con emails que también chocan),
+mientras otros cambian emails, dan de baja y leen (listar, buscar,
+agregados). Al final se verifica:
+  - no hay IDs ni emails repetidos
+  - altas exitosas - bajas == clientes que quedaron
+  - los contadores incrementales coinciden con un recuento completo
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.gestor_clientes import GestorClientes  # noqa: E402
+from modulos.fabrica_clientes import crear_cliente  # noqa: E402
+from modulos.excepciones import GICError  # noqa: E402
+from modulos.logger_config import configurar_logging  # noqa: E402
+
+TIPOS = ("regular", "premium", "corporativo")
+
+
+def _cliente(id_: int, email: str):
+    tipo = TIPOS[id_ % 3]
+    return crear_cliente(
+        tipo, id_, f"Cliente {id_}", email, f"+569{id_:08d}", f"Calle {id_} #100",
+        nivel=("silver", "gold", "platinum")[id_ % 3], empresa=f"Empresa {id_ % 7}", contacto="Ejecutivo",
+    )
+
+
+def main():
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    altas = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    almacen = sys.argv[3] if len(sys.argv) > 3 else "memoria"
+
+    configurar_logging(ruta="logs/estres.log")
+    gestor = GestorClientes(almacen, concurrente=True)
+    espacio = altas * hilos // 4  # pocos IDs para muchos intentos: muchas colisiones
+
+    exitos = Counter()
+    lecturas = Counter()
+    mutex = threading.Lock()  # cada hilo cuenta por su lado y suma al final
+    fin = threading.Event()
+    errores_inesperados = []
+
+    def escritor(n: int):
+        rnd = random.Random(n)
+        propios = Counter()
+        for _ in range(altas):
+            id_ = rnd.randrange(espacio)
+            try:
+                # el email choca con el de otro ID para la mitad de los intentos
+                email = f"c{rnd.randrange(espacio) if rnd.random() < 0.5 else id_}@mail.com"
+                gestor.agregar(_cliente(id_, email))
+                propios["altas"] += 1
+                op = rnd.random()
+                if op < 0.1:
+                    gestor.eliminar(id_)
+                    propios["bajas"] += 1
+                elif op < 0.2:
+                    gestor.actualizar(id_, email=f"otro{rnd.randrange(espacio)}@mail.com")
+            except GICError:
+                pass
+            except Exception as e:  # cualquier otra cosa es un error de concurrencia
+                errores_inesperados.append(repr(e))
+        with mutex:
+            exitos.update(propios)
+
+    def lector(n: int):
+        rnd = random.Random(1000 + n)
+        propias = 0
+        while not fin.is_set():
+            try:
+                op = rnd.random()
+                if op < 0.4:
+                    ids = [c.id for c in gestor.listar()]
+                    if ids != sorted(ids) or len(ids) != len(set(ids)):
+                        errores_inesperados.append("instantánea inconsistente")
+                elif op < 0.7:
+                    gestor.buscar(nombre="Cliente 1", limite=20)
+                else:
+                    gestor.agregados()
+                propias += 1
+            except Exception as e:
+                errores_inesperados.append(repr(e))
+        with mutex:
+            lecturas["ok"] += propias
+
+    t0 = time.perf_counter()
+    lectores = [threading.Thread(target=lector, args=(i,)) for i in range(max(1, hilos // 2))]
+    escritores = [threading.Thread(target=escritor, args=(i,)) for i in range(hilos)]
+    for t in lectores + escritores:
+        t.start()
+    for t in escritores:
+        t.join()
+    fin.set()
+    for t in lectores:
+        t.join()
+    duracion = time.perf_counter() - t0
+
+    clientes = gestor.listar()
+    ids = [c.id for c in clientes]
+    emails = [c.email for c in clientes]
+    recuento = Counter(c.TIPO for c in clientes)
+    resumen = gestor.resumen_por_tipo()
+
+    print(f"{hilos} escritores x {altas} intentos, {len(lectores)} lectores, almacen={almacen}: {duracion:.2f}s")
+    print(f"altas={exitos['altas']} bajas={exitos['bajas']} quedan={len(clientes)} lecturas={lecturas['ok']}")
+
+    fallas = list(errores_inesperados[:5])
+    if len(ids) != len(set(ids)):
+        fallas.append("IDs duplicados")
+    if len(emails) != len(set(emails)):
+        fallas.append("emails duplicados")
+    if exitos["altas"] - exitos["bajas"] != len(clientes):
+        fallas.append("altas - bajas no coincide con los clientes que quedaron")
+    if any(resumen.get(t, 0) != recuento[t] for t in TIPOS):
+        fallas.append(f"contadores desfasados: {resumen} vs {dict(recuento)}")
+
+    gestor.cerrar()
+    if fallas:
+        print("FALLA:", *fallas, sep="\n  ")
+        sys.exit(1)
+    print("OK: sin duplicados y con contadores consistentes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Generador de CSVs sintéticos con la forma de datos/clientes_entradas.csv.
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/generar_datos.py [cantidad ...] [--semilla N] [--carpeta RUTA]
+
+Sin cantidades genera 10k, 100k y 1M filas en benchmarks/datos/
+(clientes_10000.csv, ...). La salida depende solo de la cantidad y la
+semilla, así que dos máquinas obtienen el mismo archivo byte a byte.
+
+Mezcla aproximada: 60% regular, 25% premium (silver/gold/platinum) y 15%
+corporativo. Nombres, teléfonos y direcciones varían de largo como en datos
+reales; algunas empresas llevan coma y salen entre comillas. IDs y emails
+son únicos, así que todas las filas se pueden importar.
+"""
+import argparse
+import csv
+import os
+import random
+
+CARPETA_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos")
+CANTIDADES = (10_000, 100_000, 1_000_000)
+SEMILLA = 42
+
+FIELDNAMES = ["tipo", "id", "nombre", "email", "telefono", "direccion", "nivel", "empresa", "contacto"]
+
+_NOMBRES = (
+    "Ana", "Carlos", "Laura", "Jorge", "Camila", "Pedro", "Valentina", "Diego", "Francisca", "Matías",
+    "Sofía", "Benjamín", "Isidora", "Tomás", "Antonia", "Vicente", "Martina", "Joaquín", "Catalina", "Felipe",
+    "María José", "Juan Pablo", "Ignacia", "Cristóbal", "Josefa", "Agustín", "Florencia", "Sebastián",
+)
+_APELLIDOS = (
+    "Perez", "Ruiz", "Gomez", "Soto", "Muñoz", "Rojas", "Díaz", "Contreras", "Silva", "Martínez",
+    "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya", "Flores",
+    "Espinoza", "Valenzuela", "Castillo", "Tapia", "Reyes", "Gutiérrez", "Castro", "Pizarro", "Álvarez",
+)
+_CALLES = (
+    "Av Siempre Viva", "Calle Los Aromos", "Pasaje Las Rosas", "Av Providencia", "Camino Real",
+    "Los Carrera", "Av Libertador Bernardo O'Higgins", "Calle Merced", "Av Grecia", "Oficina",
+)
+_DOMINIOS = ("mail.com", "correo.cl", "empresa.cl", "gmail.com", "outlook.com")
+_RUBROS = ("Solutions", "Corp", "Logística", "Servicios", "Consultores", "Ingeniería", "Retail", "Tech")
+_NIVELES = ("silver", "gold", "platinum")
+
+
+def _email(nombre: str, apellido: str, id_: int, dominio: str) -> str:
+    # sin tildes ni espacios: el id al final lo hace único
+    base = f"{nombre}.{apellido}".lower().replace(" ", "")
+    base = base.translate(str.maketrans("áéíóúñü", "aeiounu"))
+    return f"{base}{id_}@{dominio}"
+
+
+def _fila(rnd: random.Random, id_: int) -> list:
+    nombre = rnd.choice(_NOMBRES)
+    apellido = rnd.choice(_APELLIDOS)
+    fila = [
+        "",
+        str(id_),
+        f"{nombre} {apellido}" if rnd.random() < 0.7 else f"{nombre} {apellido} {rnd.choice(_APELLIDOS)}",
+        _email(nombre, apellido, id_, rnd.choice(_DOMINIOS)),
+        f"+569{rnd.randrange(10**8):08d}" if rnd.random() < 0.9 else f"9{rnd.randrange(10**8):08d}",
+        f"{rnd.choice(_CALLES)} {rnd.randrange(1, 9999)}" + (f", depto {rnd.randrange(1, 2000)}" if rnd.random() < 0.3 else ""),
+        "",
+        "",
+        "",
+    ]
+
+    sorteo = rnd.random()
+    if sorteo < 0.60:
+        fila[0] = "regular"
+    elif sorteo < 0.85:
+        fila[0] = "premium"
+        fila[6] = rnd.choice(_NIVELES)
+    else:
+        fila[0] = "corporativo"
+        empresa = f"{rnd.choice(_APELLIDOS)} {rnd.choice(_RUBROS)}"
+        fila[7] = f"{empresa}, S.A." if rnd.random() < 0.2 else empresa
+        fila[8] = f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}"
+    return fila
+
+
+def generar_csv(ruta: str, cantidad: int, semilla: int = SEMILLA) -> str:
+    """
+    Escribe `cantidad` clientes válidos en `ruta` (IDs 1..cantidad en orden
+    aleatorio, como llegan en un archivo de entradas real) y devuelve la ruta.
+    """
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+
+    rnd = random.Random(semilla)
+    ids = list(range(1, cantidad + 1))
+    rnd.shuffle(ids)
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        for i in range(0, cantidad, 10_000):
+            writer.writerows(_fila(rnd, id_) for id_ in ids[i:i + 10_000])
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def ruta_datos(cantidad: int, semilla: int = SEMILLA, carpeta: str = CARPETA_DATOS) -> str:
+    sufijo = "" if semilla == SEMILLA else f"_s{semilla}"
+    return os.path.join(carpeta, f"clientes_{cantidad}{sufijo}.csv")
+
+
+def asegurar_csv(cantidad: int, semilla: int = SEMILLA, carpeta: str = CARPETA_DATOS) -> str:
+    """Devuelve la ruta del CSV de `cantidad` filas, generándolo si no existe."""
+    ruta = ruta_datos(cantidad, semilla, carpeta)
+    if not os.path.exists(ruta):
+        generar_csv(ruta, cantidad, semilla)
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera CSVs sintéticos de clientes.")
+    parser.add_argument("cantidades", nargs="*", type=int, default=list(CANTIDADES))
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--carpeta", default=CARPETA_DATOS)
+    args = parser.parse_args()
+
+    for cantidad in args.cantidades:
+        ruta = generar_csv(ruta_datos(cantidad, args.semilla, args.carpeta), cantidad, args.semilla)
+        print(f"{ruta}: {cantidad} filas, {os.path.getsize(ruta) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Suite de benchmarks de los caminos calientes de GestorClientes y archivos.
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/suite.py [--tamanos 10000,100000,1000000] [--almacen memoria]
+                               [--particiones N] [--repeticiones 3] [--salida RUTA.json]
+                               [--comparar ANTERIOR.json] [--umbral 0.10]
+
+Para cada tamaño se usa (o se genera) el CSV sintético de
+benchmarks/generar_datos.py y se mide:
+
+    importar_csv         parseo y validación del CSV completo a una lista
+    agregar              alta uno por uno en un gestor vacío
+    buscar_por_id        búsquedas por ID al azar
+    actualizar           cambios de dirección al azar
+    resumen_por_tipo     llamadas repetidas (sale de los contadores)
+    exportar_csv         exportación con DictWriter (y exportar_csv_rapido)
+    generar_reporte_txt  reporte completo
+    generar_reportes     reporte en TXT, CSV, JSON y HTML en los mismos recorridos
+
+Con --particiones N los casos del gestor corren sobre un GestorParticionado
+de N procesos (cada uno con el almacenamiento elegido); el pico de memoria
+es entonces solo el del proceso principal.
+
+Cada caso se corre `repeticiones` veces (se informa el mínimo y la mediana;
+el rendimiento sale del mínimo) y una vez más con tracemalloc para medir el
+pico de memoria que asigna Python durante la operación.
+
+El resultado se guarda como JSON en benchmarks/resultados/ junto con el
+commit, la versión de Python y la máquina. Con --comparar se contrasta con
+un resultado anterior y el proceso sale con código 1 si algún caso es más
+lento que el umbral (10% por defecto).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROYECTO)
+
+from modulos.gestor_clientes import GestorClientes  # noqa: E402
+from modulos.gestor_particionado import GestorParticionado  # noqa: E402
+from modulos.almacen_sqlite import AlmacenSQLite  # noqa: E402
+from modulos.almacen_bitacora import AlmacenBitacora  # noqa: E402
+from modulos.almacen_mapeado import AlmacenMapeado  # noqa: E402
+from modulos.archivos import importar_csv, exportar_csv, generar_reporte_txt  # noqa: E402
+from modulos.logger_config import configurar_logging, detener_logging  # noqa: E402
+from modulos.reportes import generar_reportes, rutas_por_formato, RENDERIZADORES  # noqa: E402
+from generar_datos import CANTIDADES, SEMILLA, asegurar_csv  # noqa: E402
+
+CARPETA_RESULTADOS = os.path.join(PROYECTO, "benchmarks", "resultados")
+CONSULTAS = 100_000          # tope de búsquedas / actualizaciones por caso
+LLAMADAS_RESUMEN = 100_000
+
+
+def _nuevo_almacen(nombre: str, carpeta: str):
+    """Almacenamiento vacío; los persistentes van a una carpeta temporal nueva."""
+    destino = tempfile.mkdtemp(dir=carpeta)
+    if nombre == "sqlite":
+        return AlmacenSQLite(os.path.join(destino, "clientes.db"))
+    if nombre == "bitacora":
+        return AlmacenBitacora(carpeta=destino)
+    if nombre == "mapeado":
+        return AlmacenMapeado(os.path.join(destino, "clientes.gicb"))
+    return nombre
+
+
+def _nuevo_gestor(almacen: str, carpeta: str, particiones: int):
+    if particiones > 1:
+        return GestorParticionado(particiones, almacen, tempfile.mkdtemp(dir=carpeta))
+    return GestorClientes(_nuevo_almacen(almacen, carpeta))
+
+
+def _vaciar_log(ruta_log: str) -> None:
+    """
+    Espera a que el hilo de logging escriba lo encolado. Sin esto una
+    corrida hereda la cola de la anterior (memoria y tiempo de CPU ajenos).
+    """
+    detener_logging()
+    configurar_logging(ruta=ruta_log)
+
+
+def _medir(preparar, repeticiones: int, ruta_log: str) -> dict:
+    """
+    `preparar()` deja todo listo (fuera del tiempo medido) y devuelve
+    (operaciones, correr); solo se cronometra correr().
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        operaciones, correr = preparar()
+        gc.collect()
+        t0 = time.perf_counter()
+        correr()
+        tiempos.append(time.perf_counter() - t0)
+        _vaciar_log(ruta_log)
+
+    operaciones, correr = preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        correr()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    _vaciar_log(ruta_log)
+
+    minimo = min(tiempos)
+    return {
+        "operaciones": operaciones,
+        "segundos": round(minimo, 6),
+        "mediana_segundos": round(statistics.median(tiempos), 6),
+        "por_segundo": round(operaciones / minimo, 1) if minimo > 0 else None,
+        "pico_memoria_bytes": pico,
+    }
+
+
+def _casos(ruta_csv: str, almacen: str, carpeta: str, particiones: int = 0):
+    """(cerrar, [(nombre, preparar)] en el orden en que se miden); cerrar() libera los gestores."""
+    clientes = importar_csv(ruta_csv)
+    n = len(clientes)
+    rnd = random.Random(SEMILLA)
+    ids = [c.id for c in clientes]
+    consultas = [rnd.choice(ids) for _ in range(min(n, CONSULTAS))]
+
+    # objetos propios para el gestor cargado: las altas repetidas del caso
+    # "agregar" vinculan `clientes` a otros gestores
+    cargado = _nuevo_gestor(almacen, carpeta, particiones)
+    cargado.agregar_muchos(importar_csv(ruta_csv))
+
+    def importar():
+        return n, lambda: importar_csv(ruta_csv)
+
+    vacios = []  # gestores del caso "agregar"; se cierran al armar el siguiente
+
+    def agregar():
+        while vacios:
+            vacios.pop().cerrar()
+        gestor = _nuevo_gestor(almacen, carpeta, particiones)
+        vacios.append(gestor)
+
+        def correr():
+            for c in clientes:
+                gestor.agregar(c)
+        return n, correr
+
+    def buscar_por_id():
+        def correr():
+            for id_ in consultas:
+                cargado.buscar_por_id(id_)
+        return len(consultas), correr
+
+    def actualizar():
+        # alterna entre dos direcciones para que cada llamada cambie algo
+        cambios = [(id_, f"Calle Benchmark {i % 2} #100") for i, id_ in enumerate(consultas)]
+
+        def correr():
+            for id_, direccion in cambios:
+                cargado.actualizar(id_, direccion=direccion)
+        return len(cambios), correr
+
+    def resumen_por_tipo():
+        def correr():
+            for _ in range(LLAMADAS_RESUMEN):
+                cargado.resumen_por_tipo()
+        return LLAMADAS_RESUMEN, correr
+
+    def exportar(rapido: bool):
+        ruta = os.path.join(carpeta, "exportado.csv")
+        return lambda: (n, lambda: exportar_csv(ruta, cargado.iterar(), rapido=rapido))
+
+    def reporte():
+        ruta = os.path.join(carpeta, "resumen.txt")
+        return n, lambda: generar_reporte_txt(ruta, cargado)
+
+    def reportes():
+        destinos = rutas_por_formato(os.path.join(carpeta, "resumen"), RENDERIZADORES)
+        return n, lambda: generar_reportes(cargado, destinos)
+
+    def cerrar():
+        for gestor in [cargado, *vacios]:
+            gestor.cerrar()
+
+    return cerrar, [
+        ("importar_csv", importar),
+        ("agregar", agregar),
+        ("buscar_por_id", buscar_por_id),
+        ("resumen_por_tipo", resumen_por_tipo),
+        ("exportar_csv", exportar(False)),
+        ("exportar_csv_rapido", exportar(True)),
+        ("generar_reporte_txt", reporte),
+        ("generar_reportes", reportes),
+        ("actualizar", actualizar),  # al final: cambia los datos del gestor cargado
+    ]
+
+
+def _git(*args) -> str:
+    try:
+        r = subprocess.run(["git", *args], cwd=PROYECTO, capture_output=True, text=True, timeout=10)
+        return r.stdout.strip() if r.returncode == 0 else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _entorno(args) -> dict:
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "cambios_sin_commit": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "almacen": args.almacen,
+        "particiones": args.particiones,
+        "repeticiones": args.repeticiones,
+        "semilla": SEMILLA,
+    }
+
+
+def _comparar(actual: dict, ruta_anterior: str, umbral: float) -> list:
+    """Imprime la variación de tiempo por caso y devuelve los que empeoraron más que el umbral."""
+    with open(ruta_anterior, "r", encoding="utf-8") as f:
+        anterior = json.load(f)
+
+    print(f"\nComparación con {ruta_anterior} (commit {anterior['entorno'].get('commit')})")
+    regresiones = []
+    for tamano, casos in actual["resultados"].items():
+        previos = anterior["resultados"].get(tamano, {})
+        for nombre, r in casos.items():
+            if nombre not in previos:
+                continue
+            antes, ahora = previos[nombre]["segundos"], r["segundos"]
+            variacion = (ahora - antes) / antes if antes else 0.0
+            marca = "  <-- más lento" if variacion > umbral else ""
+            print(f"  {tamano:>9} {nombre:<22} {antes:9.4f}s -> {ahora:9.4f}s ({variacion:+.1%}){marca}")
+            if variacion > umbral:
+                regresiones.append((tamano, nombre, variacion))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de GestorClientes y archivos.")
+    parser.add_argument("--tamanos", default=",".join(str(c) for c in CANTIDADES),
+                        help="cantidades de clientes separadas por coma")
+    parser.add_argument("--almacen", default="memoria",
+                        choices=["memoria", "columnar", "sqlite", "bitacora", "mapeado"])
+    parser.add_argument("--particiones", type=int, default=0,
+                        help="usa un GestorParticionado de N procesos (0 o 1: GestorClientes)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", help="JSON de resultados (por defecto en benchmarks/resultados/)")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--umbral", type=float, default=0.10, help="variación que cuenta como regresión")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",") if t]
+    entorno = _entorno(args)
+    resultado = {"entorno": entorno, "resultados": {}}
+
+    carpeta = tempfile.mkdtemp(prefix="gic_bench_")
+    ruta_log = os.path.join(carpeta, "bench.log")
+    try:
+        _vaciar_log(ruta_log)
+        for tamano in tamanos:
+            ruta_csv = asegurar_csv(tamano)
+            print(f"\n== {tamano} clientes ({os.path.getsize(ruta_csv) / 1e6:.1f} MB, almacen={args.almacen})")
+            cerrar, casos = _casos(ruta_csv, args.almacen, carpeta, args.particiones)
+            resultado["resultados"][str(tamano)] = medidos = {}
+            for nombre, preparar in casos:
+                r = medidos[nombre] = _medir(preparar, args.repeticiones, ruta_log)
+                print(
+                    f"  {nombre:<22} {r['segundos']:9.4f}s  {r['por_segundo']:>14,.0f} op/s  "
+                    f"pico {r['pico_memoria_bytes'] / 1e6:8.1f} MB"
+                )
+            cerrar()
+            gc.collect()
+    finally:
+        detener_logging()
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    salida = args.salida or os.path.join(
+        CARPETA_RESULTADOS, f"{datetime.now():%Y%m%d_%H%M%S}_{entorno['commit'] or 'sin_git'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados en {salida}")
+
+    if args.comparar:
+        regresiones = _comparar(resultado, args.comparar, args.umbral)
+        if regresiones:
+            print(f"FALLA: {len(regresiones)} casos más lentos que el umbral ({args.umbral:.0%})")
+            sys.exit(1)
+        print("OK: sin regresiones por encima del umbral")
+
+
+if __name__ == "__main__":
+    main()
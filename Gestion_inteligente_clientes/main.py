@@ -1,13 +1,41 @@
-from modulos.gestor_clientes import GestorClientes
+import os
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Modo por lotes (python main.py import ... + report): sin menú y sin
+    # cargar lo que solo usa el menú; ver modulos/cli.py
+    from modulos.cli import main as cli
+    sys.exit(cli())
+
+from modulos.gestor_clientes import GestorClientes, ALMACENES_PERSISTENTES
 from modulos.cliente_regular import ClienteRegular
 from modulos.cliente_premium import ClientePremium
 from modulos.cliente_corporativo import ClienteCorporativo
-from modulos.archivos import exportar_csv, importar_csv, generar_reporte_txt
+from modulos.archivos import exportar_csv, importar_csv_incremental, generar_reporte_txt
 from modulos.excepciones import GICError
+from modulos.logger_config import configurar_logging
+from modulos import metricas
 
 RUTA_ENTRADA = "datos/clientes_entradas.csv"
 RUTA_SALIDA = "datos/clientes.csv"
 RUTA_REPORTE = "reportes/resumen.txt"
+RUTA_METRICAS = "reportes/metricas.prom"
+
+# Backend de almacenamiento: memoria (por defecto), columnar, sqlite (persistente)
+# o bitacora (memoria + bitácora de cambios y fotos en datos/bitacora/)
+# o mapeado (abre datos/clientes.gicb con mmap; ver opción 9)
+ALMACEN = os.environ.get("GIC_ALMACEN", "memoria")
+# Con GIC_PARTICIONES=N (N > 1) los clientes se reparten por id en N procesos,
+# cada uno con su almacenamiento (ver modulos/gestor_particionado.py)
+PARTICIONES = int(os.environ.get("GIC_PARTICIONES", "0"))
+# Hasta dónde se importó clientes_entradas.csv, por almacenamiento
+RUTA_ESTADO_IMPORTACION = (
+    f"{RUTA_ENTRADA}.{ALMACEN}.estado" if PARTICIONES <= 1
+    else f"{RUTA_ENTRADA}.{ALMACEN}.p{PARTICIONES}.estado"
+)
+
+# Formato del log: texto (por defecto) o json
+FORMATO_LOG = os.environ.get("GIC_LOG_FORMATO", "texto")
 
 
 def pedir_int(msg: str) -> int:
@@ -64,6 +92,59 @@ def mostrar_beneficios(cliente):
         print(f"🎫 Beneficio Regular: {cliente.beneficio_regular()}")
 
 
+def mostrar_metricas():
+    estado = "activas" if metricas.activas() else "inactivas"
+    perfil = metricas.perfil_activo()
+    print(f"📈 Métricas {estado} | Perfil: {perfil or 'ninguno'}")
+
+    datos = metricas.instantanea()
+    if not datos:
+        print("   (sin operaciones registradas)")
+        return
+    print("   Operación | Llamadas | Errores | Prom (ms) | p99 (ms) | Filas/s")
+    for op, m in datos.items():
+        filas_s = f"{m['filas_por_segundo']:,.0f}" if m["filas_por_segundo"] else "-"
+        print(
+            f"   {op} | {m['llamadas']} | {m['errores']} | {m['segundos_promedio'] * 1000:.3f} | "
+            f"{m['p99'] * 1000:.3f} | {filas_s}"
+        )
+
+
+def opciones_metricas():
+    mostrar_metricas()
+    accion = pedir_texto(
+        "m) activar/desactivar métricas | p) iniciar/detener perfil | "
+        "e) exportar (Prometheus) | r) reiniciar | Enter) volver: ",
+        permitir_vacio=True,
+    )
+    accion = (accion or "").lower()
+
+    if accion == "m":
+        if metricas.activas():
+            metricas.desactivar()
+            print("✅ Métricas desactivadas.")
+        else:
+            metricas.activar()
+            print("✅ Métricas activadas.")
+    elif accion == "p":
+        if metricas.perfil_activo():
+            print(f"✅ Perfil guardado en {metricas.detener_perfil()}")
+        else:
+            modo = pedir_texto("Modo (cpu/memoria): ").lower()
+            metricas.iniciar_perfil(modo)
+            print(f"✅ Perfil de {modo} en curso: repite esta opción para detenerlo.")
+    elif accion == "e":
+        carpeta = os.path.dirname(RUTA_METRICAS)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        with open(RUTA_METRICAS, "w", encoding="utf-8") as f:
+            f.write(metricas.a_prometheus())
+        print(f"✅ Métricas exportadas a {RUTA_METRICAS}")
+    elif accion == "r":
+        metricas.reiniciar()
+        print("✅ Métricas reiniciadas.")
+
+
 def menu():
     print("\n=== Gestor Inteligente de Clientes (GIC) ===")
     print("1) Agregar cliente")
@@ -71,14 +152,28 @@ def menu():
     print("3) Buscar cliente por ID")
     print("4) Actualizar cliente")
     print("5) Eliminar cliente")
-    print("6) Importar desde CSV (clientes_entradas.csv)")
+    print("6) Importar novedades desde CSV (clientes_entradas.csv)")
     print("7) Exportar a CSV (clientes.csv)")
     print("8) Generar reporte TXT (resumen.txt)")
+    print("9) Guardar foto binaria (clientes.gicb)")
+    print("10) Métricas y perfilado")
     print("0) Salir")
 
 
 def main():
-    gestor = GestorClientes()
+    configurar_logging(formato_json=FORMATO_LOG == "json")
+    # GIC_METRICAS=1 / GIC_PERFIL=cpu|memoria (también desde la opción 10)
+    metricas.configurar_desde_entorno()
+    if PARTICIONES > 1:
+        from modulos.gestor_particionado import GestorParticionado
+        gestor = GestorParticionado(PARTICIONES, ALMACEN)
+    else:
+        gestor = GestorClientes(ALMACEN)
+
+    # El estado de la importación incremental describe lo ya aplicado a los
+    # datos: si estos no persisten, arrancan vacíos y hay que leer todo otra vez
+    if ALMACEN not in ALMACENES_PERSISTENTES and os.path.exists(RUTA_ESTADO_IMPORTACION):
+        os.remove(RUTA_ESTADO_IMPORTACION)
 
     while True:
         menu()
@@ -144,26 +239,39 @@ def main():
                 print("✅ Cliente eliminado.")
 
             elif op == "6":
-                nuevos = importar_csv(RUTA_ENTRADA)
-                agregados = 0
-                for c in nuevos:
-                    try:
-                        gestor.agregar(c)
-                        agregados += 1
-                    except GICError:
-                        pass
-                print(f"✅ Importación lista. Agregados: {agregados}")
+                errores = []
+                r = importar_csv_incremental(RUTA_ENTRADA, gestor, RUTA_ESTADO_IMPORTACION, errores=errores)
+                print(
+                    f"✅ Importación lista{' (archivo completo)' if r['completo'] else ''}. "
+                    f"Insertados: {r['insertados']} | Actualizados: {r['actualizados']} | "
+                    f"Sin cambios: {r['omitidos']} | Fallidos: {r['fallidos']}"
+                )
+                for e in errores[:10]:
+                    print(f"   ⚠️ Línea {e['linea']}: {e['error']}")
+                if len(errores) > 10:
+                    print(f"   ... y {len(errores) - 10} errores más")
 
             elif op == "7":
-                exportar_csv(RUTA_SALIDA, gestor.listar())
+                exportar_csv(RUTA_SALIDA, gestor.iterar(), rapido=True, atomico=True, firmar=True)
                 print(f"✅ Exportado a {RUTA_SALIDA}")
 
             elif op == "8":
                 generar_reporte_txt(RUTA_REPORTE, gestor)
                 print(f"✅ Reporte generado en {RUTA_REPORTE}")
 
+            elif op == "9":
+                # mmap/struct solo se cargan si se usa esta opción
+                from modulos.almacen_mapeado import escribir_foto_binaria, RUTA_FOTO_BINARIA
+
+                escribir_foto_binaria(RUTA_FOTO_BINARIA, gestor.iterar())
+                print(f"✅ Foto binaria guardada en {RUTA_FOTO_BINARIA}")
+
+            elif op == "10":
+                opciones_metricas()
+
             elif op == "0":
                 print("👋 Saliendo...")
+                gestor.cerrar()
                 break
             else:
                 print("❌ Opción inválida.")
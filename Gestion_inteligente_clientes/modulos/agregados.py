@@ -0,0 +1,75 @@
+from .cliente_premium import BENEFICIOS_POR_NIVEL, BENEFICIO_POR_DEFECTO
+from .cliente_corporativo import DESCUENTO_VOLUMEN, FACTURACION_DIAS
+
+
+TIPOS = ("regular", "premium", "corporativo")
+NIVELES = ("silver", "gold", "platinum")
+
+
+def descuento_premium(nivel: str) -> int:
+    return BENEFICIOS_POR_NIVEL.get(nivel, BENEFICIO_POR_DEFECTO)["descuento"]
+
+
+def armar_agregados(por_tipo: dict, premium_por_nivel: dict, suma_descuento: int = None) -> dict:
+    """
+    Arma el resumen que usan resumen_por_tipo() y los reportes a partir de
+    dos conteos: clientes por tipo y premium por nivel (tal como esté guardado).
+    Los niveles fuera de NIVELES se agrupan en "otro".
+    """
+    niveles = {n: 0 for n in NIVELES}
+    niveles["otro"] = 0
+    for nivel, cantidad in premium_por_nivel.items():
+        niveles[nivel if nivel in BENEFICIOS_POR_NIVEL else "otro"] += cantidad
+
+    if suma_descuento is None:
+        suma_descuento = sum(n * descuento_premium(nivel) for nivel, n in premium_por_nivel.items())
+
+    n_premium = por_tipo.get("premium", 0)
+    n_corp = por_tipo.get("corporativo", 0)
+
+    agregados = {t: por_tipo.get(t, 0) for t in TIPOS}
+    agregados["total"] = sum(agregados.values())
+    agregados["premium_por_nivel"] = niveles
+    agregados["descuento_premium_promedio"] = (suma_descuento / n_premium) if n_premium else 0
+    # Beneficios corporativos fijos: el promedio solo existe si hay corporativos
+    agregados["descuento_volumen_promedio"] = DESCUENTO_VOLUMEN if n_corp else None
+    agregados["facturacion_promedio"] = FACTURACION_DIAS if n_corp else None
+    return agregados
+
+
+class ContadoresClientes:
+    """
+    Agregados mantenidos en forma incremental por GestorClientes: se ajustan
+    en cada alta, baja o cambio de nivel, así los resúmenes cuestan O(1).
+    """
+
+    def __init__(self, por_tipo: dict = None, por_nivel: dict = None):
+        self.por_tipo = {t: 0 for t in TIPOS}
+        self.por_tipo.update(por_tipo or {})
+        self.por_nivel = dict(por_nivel or {})
+        self.suma_descuento = sum(n * descuento_premium(nivel) for nivel, n in self.por_nivel.items())
+
+    def sumar(self, cliente) -> None:
+        self.por_tipo[cliente.TIPO] += 1
+        if cliente.TIPO == "premium":
+            self._sumar_nivel(cliente.nivel, 1)
+
+    def restar(self, cliente) -> None:
+        self.por_tipo[cliente.TIPO] -= 1
+        if cliente.TIPO == "premium":
+            self._sumar_nivel(cliente.nivel, -1)
+
+    def cambiar_nivel(self, anterior: str, nuevo: str) -> None:
+        self._sumar_nivel(anterior, -1)
+        self._sumar_nivel(nuevo, 1)
+
+    def _sumar_nivel(self, nivel: str, delta: int) -> None:
+        cantidad = self.por_nivel.get(nivel, 0) + delta
+        if cantidad:
+            self.por_nivel[nivel] = cantidad
+        else:
+            self.por_nivel.pop(nivel, None)
+        self.suma_descuento += delta * descuento_premium(nivel)
+
+    def agregados(self) -> dict:
+        return armar_agregados(self.por_tipo, self.por_nivel, self.suma_descuento)
@@ -0,0 +1,331 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from .excepciones import ArchivoError
+from .almacen_memoria import AlmacenMemoria
+from .fabrica_clientes import crear_cliente, cliente_a_fila
+from .archivos import exportar_csv, iterar_csv
+
+
+CARPETA_BITACORA = "datos/bitacora"
+COMPACTAR_CADA = 100_000  # registros de bitácora entre fotos
+LOTE_RECUPERACION = 10_000
+
+_PREFIJO_FOTO = "foto_"
+_PREFIJO_DIARIO = "diario_"
+
+
+def _nombre(prefijo: str, secuencia: int, extension: str) -> str:
+    return f"{prefijo}{secuencia:012d}{extension}"
+
+
+def _secuencia_de(nombre: str, prefijo: str, extension: str):
+    if nombre.startswith(prefijo) and nombre.endswith(extension):
+        numero = nombre[len(prefijo):-len(extension)]
+        if numero.isdigit():
+            return int(numero)
+    return None
+
+
+def _sincronizar_carpeta(carpeta: str) -> None:
+    """fsync de la carpeta: deja en disco las altas, renombres y borrados de archivos."""
+    try:
+        fd = os.open(carpeta, os.O_RDONLY)
+    except OSError:  # pragma: no cover - p. ej. Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+class AlmacenBitacora:
+    """
+    Envoltorio con bitácora de escritura anticipada (write-ahead log) sobre
+    otro almacenamiento (por defecto AlmacenMemoria).
+
+    Cada alta, cambio o baja agrega un registro JSON de una línea con número
+    de secuencia al diario y hace fsync antes de volver, así que guardar
+    cuesta O(cambio) y no O(cartera). Los fsync se agrupan (group commit):
+    si varios hilos escriben a la vez, un solo fsync confirma a todos, y
+    transaccion() confirma varias operaciones con un único fsync.
+
+    Cada COMPACTAR_CADA registros se escribe una foto completa en el formato
+    CSV de exportar_csv (firmada, con la secuencia en el nombre del archivo)
+    y se descartan los diarios que ya cubre. Al iniciar se carga la última
+    foto y se reaplican los registros posteriores.
+
+    Archivos en `carpeta`:
+        foto_<secuencia>.csv    estado completo hasta esa secuencia (+ .firma)
+        diario_<inicio>.log     registros desde la secuencia <inicio>
+    Registros: [n, "a", fila] alta, [n, "c", id, campo, valor] cambio,
+    [n, "b", id] baja (fila en el orden de FIELDNAMES).
+    """
+
+    def __init__(self, interno=None, carpeta: str = CARPETA_BITACORA, compactar_cada: int = COMPACTAR_CADA):
+        self._interno = interno if interno is not None else AlmacenMemoria()
+        self.carpeta = carpeta
+        self.compactar_cada = compactar_cada
+
+        self._cond = threading.Condition()
+        self._secuencia = 0       # último registro escrito
+        self._confirmada = 0      # último registro con fsync
+        self._sincronizando = False
+        self._local = threading.local()  # transacciones anidadas, por hilo
+        self._foto = 0            # secuencia de la última foto
+        self._archivo = None
+
+        try:
+            os.makedirs(carpeta, exist_ok=True)
+            self._recuperar()
+        except ArchivoError:
+            raise
+        except (OSError, ValueError) as e:
+            raise ArchivoError(f"Error recuperando bitácora ({carpeta}): {e}") from e
+
+    # ------------------------------------------------------------------
+    # Recuperación
+    # ------------------------------------------------------------------
+
+    def _listar(self, prefijo: str, extension: str) -> list:
+        """[(secuencia, ruta)] de los archivos de un tipo, ordenados."""
+        encontrados = []
+        for nombre in os.listdir(self.carpeta):
+            n = _secuencia_de(nombre, prefijo, extension)
+            if n is not None:
+                encontrados.append((n, os.path.join(self.carpeta, nombre)))
+        return sorted(encontrados)
+
+    def _recuperar(self) -> None:
+        fotos = self._listar(_PREFIJO_FOTO, ".csv")
+        if fotos:
+            self._foto, ruta = fotos[-1]
+            self._cargar_foto(ruta)
+        self._secuencia = self._foto
+
+        diarios = self._listar(_PREFIJO_DIARIO, ".log")
+        for i, (_, ruta) in enumerate(diarios):
+            self._reaplicar(ruta, ultimo=i == len(diarios) - 1)
+        self._confirmada = self._secuencia
+
+        if diarios:
+            self._archivo = open(diarios[-1][1], "a", encoding="utf-8")
+        else:
+            self._abrir_diario()
+
+    def _cargar_foto(self, ruta: str) -> None:
+        errores = []
+        lote = []
+        # la foto la escribió este almacenamiento: con firma válida no se revalida
+        for c in iterar_csv(ruta, errores, confiable=True):
+            lote.append(c)
+            if len(lote) >= LOTE_RECUPERACION:
+                self._interno.agregar_lote(lote)
+                lote = []
+        self._interno.agregar_lote(lote)
+        if errores:
+            raise ArchivoError(f"Foto de bitácora dañada ({ruta}), línea {errores[0]['linea']}: {errores[0]['error']}")
+
+    def _reaplicar(self, ruta: str, ultimo: bool) -> None:
+        with open(ruta, "rb") as f:
+            valido = 0  # bytes hasta el último registro completo
+            for num, linea in enumerate(f, start=1):
+                if not linea.endswith(b"\n") and ultimo:
+                    break  # última escritura cortada por una caída: se descarta
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    raise ArchivoError(f"Bitácora dañada ({ruta}), línea {num}")
+
+                n = registro[0]
+                if n > self._secuencia + 1:
+                    raise ArchivoError(f"Faltan registros en la bitácora antes del {n} ({ruta})")
+                if n == self._secuencia + 1:  # los anteriores ya están en la foto
+                    self._aplicar(registro)
+                    self._secuencia = n
+                valido += len(linea)
+
+        if ultimo and valido < os.path.getsize(ruta):
+            with open(ruta, "r+b") as f:
+                f.truncate(valido)
+
+    def _aplicar(self, registro: list) -> None:
+        op = registro[1]
+        if op == "a":
+            self._interno.agregar(crear_cliente(*registro[2], validar=False))
+        elif op == "c":
+            _, _, id_, campo, valor = registro
+            c = self._interno.obtener(id_)
+            self._interno.actualizar_campo(c, campo, valor)
+            setattr(c, campo, valor)
+        elif op == "b":
+            self._interno.eliminar(registro[2])
+        else:
+            raise ValueError(f"operación desconocida en la bitácora: {op!r}")
+
+    # ------------------------------------------------------------------
+    # Escritura y confirmación (group commit)
+    # ------------------------------------------------------------------
+
+    def _abrir_diario(self) -> None:
+        ruta = os.path.join(self.carpeta, _nombre(_PREFIJO_DIARIO, self._secuencia + 1, ".log"))
+        self._archivo = open(ruta, "a", encoding="utf-8")
+        _sincronizar_carpeta(self.carpeta)
+
+    def _escribir(self, registros: list) -> None:
+        """Agrega los registros al diario y, fuera de una transacción, espera su fsync."""
+        try:
+            with self._cond:
+                lineas = []
+                for r in registros:
+                    self._secuencia += 1
+                    lineas.append(json.dumps([self._secuencia, *r], ensure_ascii=False, separators=(",", ":")))
+                self._archivo.write("\n".join(lineas) + "\n")
+                objetivo = self._secuencia
+
+            if not getattr(self._local, "profundidad", 0):
+                self._confirmar(objetivo)
+        except OSError as e:
+            raise ArchivoError(f"Error escribiendo bitácora ({self.carpeta}): {e}") from e
+
+    def _compactar_si_corresponde(self) -> None:
+        # se llama con el cambio ya aplicado: la foto lo incluye
+        if not getattr(self._local, "profundidad", 0) and self._secuencia - self._foto >= self.compactar_cada:
+            self.compactar()
+
+    def _confirmar(self, objetivo: int) -> None:
+        """
+        Vuelve cuando el registro `objetivo` ya tiene fsync. Si otro hilo
+        está haciendo fsync se espera a que termine; el que lo hace confirma
+        todo lo escrito hasta ese momento, no solo lo suyo.
+        """
+        with self._cond:
+            while self._confirmada < objetivo:
+                if self._sincronizando:
+                    self._cond.wait()
+                    continue
+
+                self._sincronizando = True
+                hasta = self._secuencia
+                self._archivo.flush()
+                fd = self._archivo.fileno()
+                self._cond.release()  # mientras tanto otros pueden seguir escribiendo
+                try:
+                    os.fsync(fd)
+                finally:
+                    self._cond.acquire()
+                    self._sincronizando = False
+                    self._cond.notify_all()
+                self._confirmada = max(self._confirmada, hasta)
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varias escrituras en un solo fsync al salir (admite anidamiento).
+        A diferencia de SQLite no deshace nada: solo agrupa la confirmación.
+        """
+        self._local.profundidad = getattr(self._local, "profundidad", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.profundidad -= 1
+            if self._local.profundidad == 0:
+                self._confirmar(self._secuencia)
+                self._compactar_si_corresponde()
+
+    def compactar(self) -> None:
+        """
+        Escribe una foto completa y borra los diarios y fotos que ya cubre.
+        Orden pensado para caídas a mitad de camino: primero se confirma y
+        se abre un diario nuevo, después se escribe la foto (en forma
+        atómica) y recién al final se borra lo viejo.
+        """
+        with self._cond:
+            while self._sincronizando:
+                self._cond.wait()
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._confirmada = self._secuencia
+            self._archivo.close()
+            secuencia = self._secuencia
+            self._abrir_diario()
+
+        ruta = os.path.join(self.carpeta, _nombre(_PREFIJO_FOTO, secuencia, ".csv"))
+        exportar_csv(ruta, self._interno.iterar_ordenado(), rapido=True, atomico=True, firmar=True)
+        _sincronizar_carpeta(self.carpeta)
+        self._foto = secuencia
+
+        for n, vieja in self._listar(_PREFIJO_FOTO, ".csv"):
+            if n < secuencia:
+                os.remove(vieja)
+                if os.path.exists(vieja + ".firma"):
+                    os.remove(vieja + ".firma")
+        for n, viejo in self._listar(_PREFIJO_DIARIO, ".log"):
+            if n <= secuencia:
+                os.remove(viejo)
+        _sincronizar_carpeta(self.carpeta)
+
+    # ------------------------------------------------------------------
+    # Interfaz de almacenamiento
+    # ------------------------------------------------------------------
+
+    def vincular(self, gestor) -> None:
+        self._interno.vincular(gestor)
+
+    def cerrar(self) -> None:
+        if self._archivo is not None and not self._archivo.closed:
+            self._confirmar(self._secuencia)
+            self._archivo.close()
+        self._interno.cerrar()
+
+    def __len__(self) -> int:
+        return len(self._interno)
+
+    def __iter__(self):
+        return iter(self._interno)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._interno
+
+    def obtener(self, id: int):
+        return self._interno.obtener(id)
+
+    def id_por_email(self, email: str):
+        return self._interno.id_por_email(email)
+
+    def iterar_ordenado(self, tipo: str = None):
+        return self._interno.iterar_ordenado(tipo)
+
+    def conteos(self) -> tuple:
+        return self._interno.conteos()
+
+    # Escritura anticipada: primero el diario, después el almacenamiento.
+    # Si el diario falla (ArchivoError), el cambio no se aplica.
+
+    def agregar(self, cliente) -> None:
+        self._escribir([("a", cliente_a_fila(cliente))])
+        self._interno.agregar(cliente)
+        self._compactar_si_corresponde()
+
+    def agregar_lote(self, clientes: list) -> None:
+        if not clientes:
+            return
+        self._escribir([("a", cliente_a_fila(c)) for c in clientes])
+        self._interno.agregar_lote(clientes)
+        self._compactar_si_corresponde()
+
+    def eliminar(self, id: int) -> None:
+        self._escribir([("b", id)])
+        self._interno.eliminar(id)
+        self._compactar_si_corresponde()
+
+    def actualizar_campo(self, cliente, campo: str, valor) -> None:
+        # el gestor lo llama antes de asignar: la foto de una compactación
+        # disparada acá todavía no tendría el valor nuevo, así que se espera
+        # al próximo cambio para compactar
+        self._escribir([("c", cliente.id, campo, valor)])
+        self._interno.actualizar_campo(cliente, campo, valor)
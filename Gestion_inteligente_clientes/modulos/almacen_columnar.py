@@ -0,0 +1,185 @@
+from array import array
+
+from .agregados import TIPOS
+from .fabrica_clientes import crear_cliente
+
+_CODIGO_TIPO = {t: i for i, t in enumerate(TIPOS)}
+_SIN_CODIGO = -1
+
+
+class _TablaStrings:
+    """Tabla de strings internados: cada valor distinto se guarda una sola vez."""
+
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+
+    def codigo(self, valor: str) -> int:
+        cod = self._codigos.get(valor)
+        if cod is None:
+            cod = len(self.valores)
+            self._codigos[valor] = cod
+            self.valores.append(valor)
+        return cod
+
+
+class AlmacenColumnar:
+    """
+    Almacenamiento columnar para GestorClientes.
+
+    Cada campo es una columna: id, código de tipo, nivel premium y empresa van
+    en arrays compactos (los dos últimos como códigos de tablas de strings
+    internados); el resto de los textos en listas. Los objetos Cliente se
+    construyen al vuelo cuando se piden, y los cambios que se les hagan
+    vuelven a la columna a través del gestor.
+
+    Nota: eliminar mueve la última fila al hueco, así que listar() no conserva
+    el orden de alta después de una baja.
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._tipos = array("b")
+        self._niveles = array("i")   # código en _tabla_niveles o _SIN_CODIGO
+        self._empresas = array("i")  # código en _tabla_empresas o _SIN_CODIGO
+        self._nombres = []
+        self._emails = []
+        self._telefonos = []
+        self._direcciones = []
+        self._contactos = []
+
+        self._tabla_niveles = _TablaStrings()
+        self._tabla_empresas = _TablaStrings()
+
+        self._filas = {}      # id -> número de fila
+        self._por_email = {}  # email normalizado -> id
+        self._orden = None    # filas ordenadas por id (se arma al pedirlo)
+        self._gestor = None
+
+    def vincular(self, gestor) -> None:
+        self._gestor = gestor
+
+    def cerrar(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self):
+        for fila in range(len(self._ids)):
+            yield self._materializar(fila)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._filas
+
+    def iterar_ordenado(self, tipo: str = None):
+        """Clientes en orden de ID (opcionalmente solo los de un tipo)."""
+        if self._orden is None:
+            self._orden = sorted(range(len(self._ids)), key=self._ids.__getitem__)
+        codigo = None if tipo is None else _CODIGO_TIPO[tipo]
+        tipos = self._tipos
+        for fila in self._orden:
+            if codigo is None or tipos[fila] == codigo:
+                yield self._materializar(fila)
+
+    def obtener(self, id: int):
+        fila = self._filas.get(id)
+        return None if fila is None else self._materializar(fila)
+
+    def id_por_email(self, email: str):
+        return self._por_email.get(email)
+
+    def agregar(self, cliente) -> None:
+        self._orden = None
+        self._filas[cliente.id] = len(self._ids)
+        self._por_email[cliente.email] = cliente.id
+
+        self._ids.append(cliente.id)
+        self._tipos.append(_CODIGO_TIPO[cliente.TIPO])
+        self._nombres.append(cliente.nombre)
+        self._emails.append(cliente.email)
+        self._telefonos.append(cliente.telefono)
+        self._direcciones.append(cliente.direccion)
+
+        if cliente.TIPO == "premium":
+            self._niveles.append(self._tabla_niveles.codigo(cliente.nivel))
+        else:
+            self._niveles.append(_SIN_CODIGO)
+
+        if cliente.TIPO == "corporativo":
+            self._empresas.append(self._tabla_empresas.codigo(cliente.empresa))
+            self._contactos.append(cliente.contacto)
+        else:
+            self._empresas.append(_SIN_CODIGO)
+            self._contactos.append(None)
+
+    def agregar_lote(self, clientes: list) -> None:
+        for c in clientes:
+            self.agregar(c)
+
+    def eliminar(self, id: int) -> None:
+        self._orden = None
+        fila = self._filas.pop(id)
+        self._por_email.pop(self._emails[fila], None)
+
+        ultima = len(self._ids) - 1
+        columnas = (
+            self._ids, self._tipos, self._niveles, self._empresas, self._nombres,
+            self._emails, self._telefonos, self._direcciones, self._contactos,
+        )
+        if fila != ultima:
+            for col in columnas:
+                col[fila] = col[ultima]
+            self._filas[self._ids[fila]] = fila
+        for col in columnas:
+            col.pop()
+
+    def actualizar_campo(self, cliente, campo: str, valor) -> None:
+        fila = self._filas[cliente.id]
+
+        if campo == "email":
+            self._por_email.pop(self._emails[fila], None)
+            self._por_email[valor] = cliente.id
+            self._emails[fila] = valor
+        elif campo == "nivel":
+            self._niveles[fila] = self._tabla_niveles.codigo(valor)
+        elif campo == "empresa":
+            self._empresas[fila] = self._tabla_empresas.codigo(valor)
+        elif campo == "nombre":
+            self._nombres[fila] = valor
+        elif campo == "telefono":
+            self._telefonos[fila] = valor
+        elif campo == "direccion":
+            self._direcciones[fila] = valor
+        elif campo == "contacto":
+            self._contactos[fila] = valor
+
+    def _materializar(self, fila: int):
+        tipo = TIPOS[self._tipos[fila]]
+        nivel = self._niveles[fila]
+        empresa = self._empresas[fila]
+        c = crear_cliente(
+            tipo, self._ids[fila], self._nombres[fila], self._emails[fila],
+            self._telefonos[fila], self._direcciones[fila],
+            nivel=self._tabla_niveles.valores[nivel] if nivel != _SIN_CODIGO else None,
+            empresa=self._tabla_empresas.valores[empresa] if empresa != _SIN_CODIGO else None,
+            contacto=self._contactos[fila],
+            validar=False,  # se validó al darse de alta
+        )
+        c._gestor = self._gestor
+        return c
+
+    def _conteos(self, columna: array, tamano: int) -> list:
+        """Cuenta cuántas veces aparece cada código 0..tamano-1 en la columna."""
+        cuenta = [0] * tamano
+        for cod in columna:
+            if cod != _SIN_CODIGO:
+                cuenta[cod] += 1
+        return cuenta
+
+    def conteos(self) -> tuple:
+        """(clientes por tipo, premium por nivel), recorriendo las columnas."""
+        por_tipo = dict(zip(TIPOS, self._conteos(self._tipos, len(TIPOS))))
+        niveles = self._tabla_niveles.valores
+        por_nivel = dict(zip(niveles, self._conteos(self._niveles, len(niveles))))
+        return por_tipo, {n: c for n, c in por_nivel.items() if c}
@@ -0,0 +1,340 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+
+from .agregados import TIPOS
+from .excepciones import ArchivoError
+from .fabrica_clientes import crear_cliente, cliente_a_fila
+from .archivos import abrir_salida_atomica
+
+
+RUTA_FOTO_BINARIA = "datos/clientes.gicb"
+
+_MAGICO = b"GICB"
+_VERSION = 1
+# mágico, versión, reservado, clientes, cadenas, ranuras de emails y
+# desplazamientos de: ids, registros, offsets de cadenas, datos de cadenas,
+# ranuras de emails, metadatos (más el largo de los metadatos)
+_CABECERA = struct.Struct("<4sHH10Q")
+# tipo + 7 referencias a la tabla de cadenas:
+# nombre, email, telefono, direccion, nivel, empresa, contacto
+_REGISTRO = struct.Struct("<B3x7I")
+_NULO = 0xFFFFFFFF  # referencia a cadena ausente (None)
+_CODIGO_TIPO = {t: i for i, t in enumerate(TIPOS)}
+
+
+def _alinear(f, multiplo: int = 8) -> int:
+    relleno = -f.tell() % multiplo
+    f.write(b"\0" * relleno)
+    return f.tell()
+
+
+def _hash_email(email: str) -> int:
+    # estable entre ejecuciones (hash() de str cambia en cada proceso)
+    return zlib.crc32(email.encode("utf-8"))
+
+
+def escribir_foto_binaria(ruta: str, clientes) -> None:
+    """
+    Escribe una foto binaria de los clientes (cualquier iterable), en forma
+    atómica. Formato (little-endian, secciones alineadas a 8 bytes):
+
+        cabecera     _CABECERA
+        ids          int64 por cliente, ordenados (búsqueda binaria)
+        registros    _REGISTRO de ancho fijo, en el mismo orden que los ids
+        cadenas      offsets uint64 + bytes UTF-8; cada texto distinto se
+                     guarda una vez (niveles, empresas, ... repetidos)
+        emails       tabla hash (crc32, sondeo lineal) -> fila + 1
+        metadatos    JSON con los conteos por tipo y nivel
+    """
+    filas = sorted(map(cliente_a_fila, clientes), key=lambda f: f[1])
+
+    codigos = {}
+    cadenas = []
+
+    def ref(valor) -> int:
+        if valor is None:
+            return _NULO
+        cod = codigos.get(valor)
+        if cod is None:
+            cod = codigos[valor] = len(cadenas)
+            cadenas.append(valor.encode("utf-8"))
+        return cod
+
+    ids = array("q")
+    registros = bytearray()
+    por_tipo, por_nivel = {}, {}
+    for tipo, id_, *textos in filas:
+        ids.append(id_)
+        registros += _REGISTRO.pack(_CODIGO_TIPO[tipo], *map(ref, textos))
+        por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+        if tipo == "premium":
+            nivel = textos[4] or "otro"
+            por_nivel[nivel] = por_nivel.get(nivel, 0) + 1
+
+    offsets = array("Q", [0])
+    for c in cadenas:
+        offsets.append(offsets[-1] + len(c))
+
+    n_ranuras = 8
+    while n_ranuras < 2 * len(filas):
+        n_ranuras *= 2
+    ranuras = array("I", bytes(4 * n_ranuras))
+    for fila, f in enumerate(filas):
+        i = _hash_email(f[3]) & (n_ranuras - 1)
+        while ranuras[i]:
+            i = (i + 1) & (n_ranuras - 1)
+        ranuras[i] = fila + 1
+
+    if sys.byteorder != "little":  # pragma: no cover - el formato es little-endian
+        for col in (ids, offsets, ranuras):
+            col.byteswap()
+
+    meta = json.dumps({"por_tipo": por_tipo, "por_nivel": por_nivel}).encode("utf-8")
+
+    try:
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+
+        with abrir_salida_atomica(ruta, "wb") as f:
+            f.write(b"\0" * _CABECERA.size)
+            off_ids = _alinear(f)
+            f.write(ids.tobytes())
+            off_registros = _alinear(f)
+            f.write(registros)
+            off_offsets = _alinear(f)
+            f.write(offsets.tobytes())
+            off_datos = f.tell()
+            f.write(b"".join(cadenas))
+            off_ranuras = _alinear(f)
+            f.write(ranuras.tobytes())
+            off_meta = f.tell()
+            f.write(meta)
+
+            f.seek(0)
+            f.write(_CABECERA.pack(
+                _MAGICO, _VERSION, 0, len(filas), len(cadenas), n_ranuras,
+                off_ids, off_registros, off_offsets, off_datos, off_ranuras, off_meta, len(meta),
+            ))
+    except Exception as e:
+        raise ArchivoError(f"Error escribiendo foto binaria ({ruta}): {e}") from e
+
+
+class AlmacenMapeado:
+    """
+    Almacenamiento sobre una foto binaria (escribir_foto_binaria) abierta con
+    mmap: abrir cuesta lo mismo con mil o con un millón de clientes, porque
+    no se lee ni se construye nada hasta que se pide. Los objetos Cliente se
+    materializan al vuelo (por id con búsqueda binaria, por email con la
+    tabla hash del archivo).
+
+    El archivo no se modifica: altas, cambios y bajas van a una capa en
+    memoria que tiene prioridad sobre la foto. Para conservarlos hay que
+    escribir una foto nueva (p. ej. escribir_foto_binaria(ruta, gestor.iterar())).
+    Si el archivo no existe se empieza vacío.
+    """
+
+    def __init__(self, ruta: str = RUTA_FOTO_BINARIA):
+        self.ruta = ruta
+        self._gestor = None
+
+        # capa en memoria
+        self._cambios = {}     # id -> cliente (nuevo o modificado)
+        self._emails = {}      # email -> id, de los clientes en _cambios
+        self._borrados = set() # ids de la foto dados de baja
+
+        self._mapa = None
+        self._vistas = []
+        self._ids = ()         # sin foto: ningún id
+        self._n = 0
+        self._meta = {"por_tipo": {}, "por_nivel": {}}
+        if os.path.exists(ruta):
+            self._abrir(ruta)
+
+    def _abrir(self, ruta: str) -> None:
+        try:
+            with open(ruta, "rb") as f:
+                self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            (magico, version, _, self._n, n_cadenas, self._n_ranuras, off_ids, self._off_registros,
+             off_offsets, self._off_datos, off_ranuras, off_meta, largo_meta) = _CABECERA.unpack_from(self._mapa)
+        except (OSError, ValueError, struct.error) as e:
+            raise ArchivoError(f"Error abriendo foto binaria ({ruta}): {e}") from e
+
+        if magico != _MAGICO or version != _VERSION:
+            self._mapa.close()
+            raise ArchivoError(f"No es una foto binaria de GIC (versión {_VERSION}): {ruta}")
+        if sys.byteorder != "little":  # pragma: no cover
+            self._mapa.close()
+            raise ArchivoError("La foto binaria solo se puede abrir en equipos little-endian.")
+
+        vista = memoryview(self._mapa)
+        # memoryview.cast: las columnas se indexan sin copiar ni desempaquetar
+        self._ids = vista[off_ids:off_ids + 8 * self._n].cast("q")
+        self._offsets = vista[off_offsets:off_offsets + 8 * (n_cadenas + 1)].cast("Q")
+        self._ranuras = vista[off_ranuras:off_ranuras + 4 * self._n_ranuras].cast("I")
+        self._vistas = [self._ids, self._offsets, self._ranuras, vista]
+        self._meta = json.loads(self._mapa[off_meta:off_meta + largo_meta])
+
+    # ------------------------------------------------------------------
+    # Lectura de la foto
+    # ------------------------------------------------------------------
+
+    def _fila(self, id: int):
+        """Fila de la foto con ese id, o None."""
+        i = bisect_left(self._ids, id)
+        return i if i < self._n and self._ids[i] == id else None
+
+    def _cadena(self, ref: int):
+        if ref == _NULO:
+            return None
+        inicio = self._off_datos + self._offsets[ref]
+        return self._mapa[inicio:self._off_datos + self._offsets[ref + 1]].decode("utf-8")
+
+    def _registro(self, fila: int) -> tuple:
+        return _REGISTRO.unpack_from(self._mapa, self._off_registros + fila * _REGISTRO.size)
+
+    def _materializar(self, fila: int):
+        tipo, *refs = self._registro(fila)
+        c = crear_cliente(TIPOS[tipo], self._ids[fila], *map(self._cadena, refs), validar=False)
+        c._gestor = self._gestor
+        return c
+
+    def _fila_por_email(self, email: str):
+        if not self._n:
+            return None
+        mascara = self._n_ranuras - 1
+        i = _hash_email(email) & mascara
+        while self._ranuras[i]:
+            fila = self._ranuras[i] - 1
+            if self._cadena(self._registro(fila)[2]) == email:
+                return fila
+            i = (i + 1) & mascara
+        return None
+
+    def _en_foto(self, id: int) -> bool:
+        return id not in self._borrados and id not in self._cambios and self._fila(id) is not None
+
+    # ------------------------------------------------------------------
+    # Interfaz de almacenamiento
+    # ------------------------------------------------------------------
+
+    def vincular(self, gestor) -> None:
+        self._gestor = gestor
+        for c in self._cambios.values():
+            c._gestor = gestor
+
+    def cerrar(self) -> None:
+        # las vistas exportadas impiden cerrar el mmap: se liberan antes
+        for v in self._vistas:
+            v.release()
+        self._vistas = []
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+            self._ids = ()
+            self._n = 0
+
+    def __len__(self) -> int:
+        ocultos = sum(1 for id_ in self._borrados | self._cambios.keys() if self._fila(id_) is not None)
+        return self._n - ocultos + len(self._cambios)
+
+    def __iter__(self):
+        return self.iterar_ordenado()
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._cambios or self._en_foto(id)
+
+    def obtener(self, id: int):
+        c = self._cambios.get(id)
+        if c is not None or id in self._borrados:
+            return c
+        fila = self._fila(id)
+        return None if fila is None else self._materializar(fila)
+
+    def id_por_email(self, email: str):
+        id_ = self._emails.get(email)
+        if id_ is not None:
+            return id_
+        fila = self._fila_por_email(email)
+        if fila is None:
+            return None
+        id_ = self._ids[fila]
+        # si el cliente cambió o se dio de baja, el email de la foto ya no vale
+        return id_ if id_ not in self._cambios and id_ not in self._borrados else None
+
+    def iterar_ordenado(self, tipo: str = None):
+        """Clientes en orden de ID (opcionalmente solo los de un tipo)."""
+        codigo = None if tipo is None else _CODIGO_TIPO[tipo]
+        nuevos = sorted(
+            (c for id_, c in self._cambios.items() if self._fila(id_) is None and (tipo is None or c.TIPO == tipo)),
+            key=lambda c: c.id,
+        )
+        return heapq.merge(self._iterar_foto(codigo, tipo), nuevos, key=lambda c: c.id)
+
+    def _iterar_foto(self, codigo, tipo):
+        for fila in range(self._n):
+            id_ = self._ids[fila]
+            if id_ in self._borrados:
+                continue
+            c = self._cambios.get(id_)
+            if c is not None:
+                if tipo is None or c.TIPO == tipo:
+                    yield c
+            elif codigo is None or self._registro(fila)[0] == codigo:
+                yield self._materializar(fila)
+
+    def agregar(self, cliente) -> None:
+        self._borrados.discard(cliente.id)
+        self._cambios[cliente.id] = cliente
+        self._emails[cliente.email] = cliente.id
+
+    def agregar_lote(self, clientes: list) -> None:
+        for c in clientes:
+            self.agregar(c)
+
+    def eliminar(self, id: int) -> None:
+        c = self._cambios.pop(id, None)
+        if c is not None:
+            self._emails.pop(c.email, None)
+        if self._fila(id) is not None:
+            self._borrados.add(id)
+
+    def actualizar_campo(self, cliente, campo: str, valor) -> None:
+        # el primer cambio pasa el cliente de la foto a la capa en memoria;
+        # el gestor asigna el valor sobre este mismo objeto
+        if cliente.id not in self._cambios:
+            self._cambios[cliente.id] = cliente
+            self._emails[cliente.email] = cliente.id
+        if campo == "email":
+            self._emails.pop(cliente.email, None)
+            self._emails[valor] = cliente.id
+
+    def conteos(self) -> tuple:
+        """
+        (clientes por tipo, premium por nivel): los de la foto salen de sus
+        metadatos; solo se ajustan los clientes de la capa en memoria.
+        """
+        por_tipo = dict(self._meta["por_tipo"])
+        por_nivel = dict(self._meta["por_nivel"])
+
+        def sumar(tipo, nivel, delta):
+            por_tipo[tipo] = por_tipo.get(tipo, 0) + delta
+            if tipo == "premium":
+                nivel = nivel or "otro"
+                por_nivel[nivel] = por_nivel.get(nivel, 0) + delta
+
+        for id_ in self._borrados | self._cambios.keys():
+            fila = self._fila(id_)
+            if fila is not None:
+                tipo, *refs = self._registro(fila)
+                sumar(TIPOS[tipo], self._cadena(refs[4]), -1)
+        for c in self._cambios.values():
+            sumar(c.TIPO, getattr(c, "nivel", None), +1)
+        return por_tipo, por_nivel
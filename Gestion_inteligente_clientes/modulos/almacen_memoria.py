@@ -0,0 +1,76 @@
+class AlmacenMemoria:
+    """
+    Almacenamiento por defecto de GestorClientes: los objetos viven en memoria,
+    indexados por id (en orden de alta) y por email normalizado.
+    """
+
+    def __init__(self):
+        self._clientes = {}   # id -> cliente
+        self._por_email = {}  # email normalizado -> id
+        self._ids_ordenados = None  # índice ordenado por id (se arma al pedirlo)
+
+    def vincular(self, gestor) -> None:
+        # Las altas del gestor ya vinculan cada objeto; esto cubre los que
+        # se cargaron antes (p. ej. al recuperar una bitácora)
+        for c in self._clientes.values():
+            c._gestor = gestor
+
+    def cerrar(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self._clientes)
+
+    def __iter__(self):
+        return iter(self._clientes.values())
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._clientes
+
+    def obtener(self, id: int):
+        return self._clientes.get(id)
+
+    def id_por_email(self, email: str):
+        return self._por_email.get(email)
+
+    def iterar_ordenado(self, tipo: str = None):
+        """Clientes en orden de ID (opcionalmente solo los de un tipo)."""
+        if self._ids_ordenados is None:
+            self._ids_ordenados = sorted(self._clientes)
+        for id_ in self._ids_ordenados:
+            c = self._clientes[id_]
+            if tipo is None or c.TIPO == tipo:
+                yield c
+
+    def agregar(self, cliente) -> None:
+        self._clientes[cliente.id] = cliente
+        self._por_email[cliente.email] = cliente.id
+        self._ids_ordenados = None
+
+    def agregar_lote(self, clientes: list) -> None:
+        for c in clientes:
+            self._clientes[c.id] = c
+            self._por_email[c.email] = c.id
+        self._ids_ordenados = None
+
+    def eliminar(self, id: int) -> None:
+        cliente = self._clientes.pop(id)
+        self._por_email.pop(cliente.email, None)
+        self._ids_ordenados = None
+
+    def actualizar_campo(self, cliente, campo: str, valor) -> None:
+        # El objeto guarda el valor; solo hay que mantener el índice de emails
+        if campo == "email":
+            self._por_email.pop(cliente.email, None)
+            self._por_email[valor] = cliente.id
+
+    def conteos(self) -> tuple:
+        """(clientes por tipo, premium por nivel), recorriendo los objetos."""
+        por_tipo = {}
+        por_nivel = {}
+        for c in self._clientes.values():
+            por_tipo[c.TIPO] = por_tipo.get(c.TIPO, 0) + 1
+            if c.TIPO == "premium":
+                nivel = c.nivel or "otro"
+                por_nivel[nivel] = por_nivel.get(nivel, 0) + 1
+        return por_tipo, por_nivel
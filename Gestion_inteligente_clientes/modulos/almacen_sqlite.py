@@ -0,0 +1,138 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from .excepciones import ArchivoError
+from .fabrica_clientes import crear_cliente, cliente_a_fila
+
+
+RUTA_DB = "datos/clientes.db"
+
+_COLUMNAS = ("tipo", "id", "nombre", "email", "telefono", "direccion", "nivel", "empresa", "contacto")
+_SELECT = f"SELECT {', '.join(_COLUMNAS)} FROM clientes"
+_INSERT = f"INSERT INTO clientes ({', '.join(_COLUMNAS)}) VALUES ({', '.join('?' * len(_COLUMNAS))})"
+_CAMPOS_EDITABLES = {"nombre", "email", "telefono", "direccion", "nivel", "empresa", "contacto"}
+
+
+class AlmacenSQLite:
+    """
+    Almacenamiento persistente en SQLite (módulo estándar sqlite3).
+
+    Cada alta, cambio o baja se guarda al momento, así que al reiniciar no
+    hace falta volver a importar un CSV. La tabla tiene id como clave primaria
+    y un índice único por email; la base trabaja en modo WAL. Las altas
+    masivas (agregar_lote) van en una sola transacción, y transaccion()
+    permite agrupar varias operaciones más.
+    """
+
+    def __init__(self, ruta: str = RUTA_DB):
+        try:
+            carpeta = os.path.dirname(ruta)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+
+            # isolation_level=None: autocommit salvo dentro de transaccion()
+            self._con = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("PRAGMA synchronous=NORMAL")
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS clientes ("
+                " id INTEGER PRIMARY KEY,"
+                " tipo TEXT NOT NULL,"
+                " nombre TEXT NOT NULL,"
+                " email TEXT NOT NULL,"
+                " telefono TEXT NOT NULL,"
+                " direccion TEXT NOT NULL,"
+                " nivel TEXT,"
+                " empresa TEXT,"
+                " contacto TEXT)"
+            )
+            self._con.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_clientes_email ON clientes(email)")
+            self._con.execute("CREATE INDEX IF NOT EXISTS idx_clientes_tipo ON clientes(tipo, id)")
+        except sqlite3.Error as e:
+            raise ArchivoError(f"Error abriendo base SQLite ({ruta}): {e}") from e
+
+        self.ruta = ruta
+        self._gestor = None
+        self._profundidad = 0  # transacciones anidadas
+
+    def vincular(self, gestor) -> None:
+        self._gestor = gestor
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+    @contextmanager
+    def transaccion(self):
+        """Agrupa las escrituras en una transacción (admite anidamiento)."""
+        if self._profundidad == 0:
+            self._con.execute("BEGIN")
+        self._profundidad += 1
+        try:
+            yield
+        except BaseException:
+            self._profundidad -= 1
+            if self._profundidad == 0:
+                self._con.execute("ROLLBACK")
+            raise
+        self._profundidad -= 1
+        if self._profundidad == 0:
+            self._con.execute("COMMIT")
+
+    def __len__(self) -> int:
+        return self._con.execute("SELECT COUNT(*) FROM clientes").fetchone()[0]
+
+    def __iter__(self):
+        return self.iterar_ordenado()
+
+    def iterar_ordenado(self, tipo: str = None):
+        """Clientes en orden de ID (opcionalmente solo los de un tipo)."""
+        if tipo is None:
+            cur = self._con.execute(f"{_SELECT} ORDER BY id")
+        else:
+            cur = self._con.execute(f"{_SELECT} WHERE tipo = ? ORDER BY id", (tipo,))
+        while True:
+            filas = cur.fetchmany(1000)
+            if not filas:
+                break
+            for fila in filas:
+                yield self._materializar(fila)
+
+    def __contains__(self, id: int) -> bool:
+        return self._con.execute("SELECT 1 FROM clientes WHERE id = ?", (id,)).fetchone() is not None
+
+    def obtener(self, id: int):
+        fila = self._con.execute(f"{_SELECT} WHERE id = ?", (id,)).fetchone()
+        return None if fila is None else self._materializar(fila)
+
+    def id_por_email(self, email: str):
+        fila = self._con.execute("SELECT id FROM clientes WHERE email = ?", (email,)).fetchone()
+        return None if fila is None else fila[0]
+
+    def agregar(self, cliente) -> None:
+        self._con.execute(_INSERT, cliente_a_fila(cliente))
+
+    def agregar_lote(self, clientes: list) -> None:
+        with self.transaccion():
+            self._con.executemany(_INSERT, (cliente_a_fila(c) for c in clientes))
+
+    def eliminar(self, id: int) -> None:
+        self._con.execute("DELETE FROM clientes WHERE id = ?", (id,))
+
+    def actualizar_campo(self, cliente, campo: str, valor) -> None:
+        if campo not in _CAMPOS_EDITABLES:
+            return
+        self._con.execute(f"UPDATE clientes SET {campo} = ? WHERE id = ?", (valor, cliente.id))
+
+    def conteos(self) -> tuple:
+        """(clientes por tipo, premium por nivel), agregados por SQLite."""
+        por_tipo = dict(self._con.execute("SELECT tipo, COUNT(*) FROM clientes GROUP BY tipo"))
+        por_nivel = dict(self._con.execute(
+            "SELECT nivel, COUNT(*) FROM clientes WHERE tipo = 'premium' GROUP BY nivel"
+        ))
+        return por_tipo, por_nivel
+
+    def _materializar(self, fila: tuple):
+        c = crear_cliente(*fila, validar=False)  # se validó al darse de alta
+        c._gestor = self._gestor
+        return c
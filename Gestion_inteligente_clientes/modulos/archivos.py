@@ -1,14 +1,29 @@
 import csv
+import hashlib
+import io
+import json
 import os
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
 
-from .excepciones import ArchivoError
-from .cliente_regular import ClienteRegular
-from .cliente_premium import ClientePremium
-from .cliente_corporativo import ClienteCorporativo
+from .excepciones import ArchivoError, ClienteExistenteError, ClienteNoEncontradoError
+from .fabrica_clientes import crear_cliente, cliente_a_fila
+from .metricas import medir, contar
+from .reportes import generar_reportes
+from .validaciones import validar_lote, MENSAJES_ERROR
 
 
 FIELDNAMES = ["tipo", "id", "nombre", "email", "telefono", "direccion", "nivel", "empresa", "contacto"]
 
+BUFFER_ESCRITURA = 1024 * 1024  # bytes
+LOTE_EXPORTACION = 10_000        # filas por writerows
+LOTE_VALIDACION = 1_000          # filas por validar_lote al importar
+
+FORMATO_FIRMA = "gic-csv-1"
+EXTENSION_FIRMA = ".firma"
+
 
 def _safe_str(value) -> str:
     """Convierte None a '', y limpia espacios."""
@@ -17,42 +32,191 @@ def _safe_str(value) -> str:
     return str(value).strip()
 
 
-def exportar_csv(ruta: str, clientes: list) -> None:
+@contextmanager
+def abrir_salida_atomica(ruta: str, modo: str = "w", atomico: bool = True, **kwargs):
+    """
+    Abre `ruta` para escritura ("w" o "wb"). Con atomico=True (por defecto)
+    se escribe en un temporal de la misma carpeta y se renombra al final: si
+    el proceso cae a mitad de camino, el archivo anterior queda intacto
+    (nunca uno truncado). Con atomico=False es un open() común.
+    """
+    if not atomico:
+        with open(ruta, modo, **kwargs) as f:
+            yield f
+        return
+
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", prefix=f".{os.path.basename(ruta)}.", suffix=".tmp")
+    try:
+        with open(fd, modo, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, ruta)
+    except BaseException:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+
+
+@medir("archivos.exportar_csv", int)
+def exportar_csv(ruta: str, clientes: list, rapido: bool = False, atomico: bool = False,
+                 firmar: bool = False) -> int:
     """
-    Exporta lista de clientes a CSV con columnas fijas.
+    Exporta lista de clientes a CSV con columnas fijas y devuelve cuántos escribió.
     Siempre escribe: tipo,id,nombre,email,telefono,direccion,nivel,empresa,contacto
+
+    - rapido: escribe tuplas tomadas directo de los atributos (sin to_dict ni
+      DictWriter) en lotes con writerows y un buffer de escritura grande.
+      Acepta cualquier iterable, p. ej. gestor.iterar().
+    - atomico: escribe en un temporal y lo renombra al terminar.
+    - firmar: deja al lado `<ruta>.firma` (formato, tamaño y sha256) para que
+      una recarga con confiable=True pueda saltear la validación.
     """
     try:
         carpeta = os.path.dirname(ruta)
         if carpeta:
             os.makedirs(carpeta, exist_ok=True)
 
-        with open(ruta, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-            writer.writeheader()
-
-            for c in clientes:
-                d = c.to_dict()
-
-                # Asegurar columnas fijas y valores por defecto
-                row = {
-                    "tipo": _safe_str(d.get("tipo", "")),
-                    "id": _safe_str(d.get("id", "")),
-                    "nombre": _safe_str(d.get("nombre", "")),
-                    "email": _safe_str(d.get("email", "")),
-                    "telefono": _safe_str(d.get("telefono", "")),
-                    "direccion": _safe_str(d.get("direccion", "")),
-                    "nivel": _safe_str(d.get("nivel", "")),
-                    "empresa": _safe_str(d.get("empresa", "")),
-                    "contacto": _safe_str(d.get("contacto", "")),
-                }
+        with abrir_salida_atomica(ruta, atomico=atomico, newline="", encoding="utf-8", buffering=BUFFER_ESCRITURA) as f:
+            if rapido:
+                escritos = _escribir_filas(f, clientes)
+            else:
+                escritos = _escribir_dicts(f, clientes)
 
-                writer.writerow(row)
+        if firmar:
+            escribir_firma(ruta)
+        return escritos
 
     except Exception as e:
         raise ArchivoError(f"Error exportando CSV ({ruta}): {e}") from e
 
 
+def _escribir_dicts(f, clientes) -> int:
+    writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+    writer.writeheader()
+
+    escritos = 0
+    for c in clientes:
+        d = c.to_dict()
+
+        # Asegurar columnas fijas y valores por defecto
+        row = {
+            "tipo": _safe_str(d.get("tipo", "")),
+            "id": _safe_str(d.get("id", "")),
+            "nombre": _safe_str(d.get("nombre", "")),
+            "email": _safe_str(d.get("email", "")),
+            "telefono": _safe_str(d.get("telefono", "")),
+            "direccion": _safe_str(d.get("direccion", "")),
+            "nivel": _safe_str(d.get("nivel", "")),
+            "empresa": _safe_str(d.get("empresa", "")),
+            "contacto": _safe_str(d.get("contacto", "")),
+        }
+
+        writer.writerow(row)
+        escritos += 1
+    return escritos
+
+
+def _escribir_filas(f, clientes) -> int:
+    # csv.writer escribe None como '' y los atributos ya vienen sin espacios
+    writer = csv.writer(f)
+    writer.writerow(FIELDNAMES)
+
+    escritos = 0
+    filas = map(cliente_a_fila, clientes)
+    while True:
+        lote = list(islice(filas, LOTE_EXPORTACION))
+        if not lote:
+            break
+        writer.writerows(lote)
+        escritos += len(lote)
+    return escritos
+
+
+# ---------------------------------------------------------------------------
+# Firma de exportación (recarga de confianza)
+# ---------------------------------------------------------------------------
+
+def _ruta_firma(ruta: str) -> str:
+    return ruta + EXTENSION_FIRMA
+
+
+def _sha256(ruta: str) -> str:
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(BUFFER_ESCRITURA), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def escribir_firma(ruta: str) -> None:
+    """
+    Escribe `<ruta>.firma` con el formato, el tamaño y el sha256 del CSV.
+    Si el CSV se reemplaza o se edita después, la firma deja de coincidir.
+    """
+    firma = {"formato": FORMATO_FIRMA, "bytes": os.path.getsize(ruta), "sha256": _sha256(ruta)}
+    with abrir_salida_atomica(_ruta_firma(ruta), encoding="utf-8") as f:
+        json.dump(firma, f)
+
+
+def firma_valida(ruta: str) -> bool:
+    """True si `ruta` lo exportó este sistema y no cambió desde entonces."""
+    try:
+        with open(_ruta_firma(ruta), "r", encoding="utf-8") as f:
+            firma = json.load(f)
+        return (
+            firma.get("formato") == FORMATO_FIRMA
+            and firma.get("bytes") == os.path.getsize(ruta)  # descarte barato antes del hash
+            and firma.get("sha256") == _sha256(ruta)
+        )
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def _fila_vacia(row: dict) -> bool:
+    return not row or all((_safe_str(v) == "" for v in row.values()))
+
+
+def _normalizar_fila(row: dict) -> dict:
+    """Valores de la fila como texto sin espacios, con los defaults de importación."""
+    return {
+        "tipo": _safe_str(row.get("tipo", "regular")).lower(),
+        "id": _safe_str(row.get("id", "0")),
+        "nombre": _safe_str(row.get("nombre", "")),
+        "email": _safe_str(row.get("email", "")),
+        "telefono": _safe_str(row.get("telefono", "")),
+        "direccion": _safe_str(row.get("direccion", "")),
+        "nivel": _safe_str(row.get("nivel", "gold")) or "gold",
+        "empresa": _safe_str(row.get("empresa", "")),
+        "contacto": _safe_str(row.get("contacto", "")),
+    }
+
+
+def _crear_desde_fila(fila: dict, validar: bool = True):
+    return crear_cliente(
+        fila["tipo"], int(fila["id"]), fila["nombre"], fila["email"], fila["telefono"], fila["direccion"],
+        nivel=fila["nivel"], empresa=fila["empresa"], contacto=fila["contacto"], validar=validar,
+    )
+
+
+def _crear_validada(fila: dict):
+    """
+    Cliente de una fila que validar_lote ya aceptó (y _normalizar_fila dejó
+    sin espacios): falta solo la normalización que aplican los setters.
+    """
+    fila = dict(fila, email=fila["email"].lower(), nivel=fila["nivel"].lower())
+    return _crear_desde_fila(fila, validar=False)
+
+
+def _fila_a_cliente(row: dict):
+    """Construye el cliente (validado) que corresponde a una fila del CSV."""
+    return _crear_desde_fila(_normalizar_fila(row))
+
+
+@medir("archivos.importar_csv", len)
 def importar_csv(ruta: str) -> list:
     """
     Importa clientes desde CSV.
@@ -72,28 +236,9 @@ def importar_csv(ruta: str) -> list:
 
             for row in reader:
                 # Saltar filas totalmente vacías
-                if not row or all((_safe_str(v) == "" for v in row.values())):
+                if _fila_vacia(row):
                     continue
-
-                tipo = _safe_str(row.get("tipo", "regular")).lower()
-                id_ = int(_safe_str(row.get("id", "0")))
-                nombre = _safe_str(row.get("nombre", ""))
-                email = _safe_str(row.get("email", ""))
-                telefono = _safe_str(row.get("telefono", ""))
-                direccion = _safe_str(row.get("direccion", ""))
-
-                if tipo == "premium":
-                    nivel = _safe_str(row.get("nivel", "gold")) or "gold"
-                    clientes.append(ClientePremium(id_, nombre, email, telefono, direccion, nivel=nivel))
-
-                elif tipo == "corporativo":
-                    empresa = _safe_str(row.get("empresa", ""))
-                    contacto = _safe_str(row.get("contacto", ""))
-                    clientes.append(ClienteCorporativo(id_, nombre, email, telefono, direccion, empresa=empresa, contacto=contacto))
-
-                else:
-                    # default: regular
-                    clientes.append(ClienteRegular(id_, nombre, email, telefono, direccion))
+                clientes.append(_fila_a_cliente(row))
 
         return clientes
 
@@ -104,175 +249,434 @@ def importar_csv(ruta: str) -> list:
         raise ArchivoError(f"Error importando CSV ({ruta}): {e}") from e
 
 
-def generar_reporte_txt(ruta: str, gestor) -> None:
+def iterar_csv(ruta: str, errores: list = None, confiable: bool = False):
     """
-    Reporte TXT:
-    - Totales por tipo (requisito)
-    - Extra:
-      * Premium: distribución por nivel, promedio descuento, tabla de clientes
-      * Corporativo: promedio desc/facturación, tabla con empresa y ejecutivo
-      * Regular: listado simple + beneficio estándar
+    Versión en streaming de importar_csv: entrega los clientes de a uno,
+    sin cargar el archivo completo en memoria.
+    Una fila inválida no aborta la lectura: se omite y, si se entrega la
+    lista `errores`, se agrega {"linea": n, "error": "..."}.
+    Con confiable=True y una firma válida (ver exportar_csv(firmar=True)) los
+    clientes se construyen sin volver a validar; sin firma o si no coincide,
+    se valida como siempre.
     """
-    import os
+    if not os.path.exists(ruta):
+        raise ArchivoError(f"No existe el archivo: {ruta}")
+    return _iterar_filas(ruta, errores, confiable and firma_valida(ruta))
 
-    from .excepciones import ArchivoError
 
+def _iterar_filas(ruta: str, errores: list, confiable: bool = False):
     try:
-        carpeta = os.path.dirname(ruta)
-        if carpeta:
-            os.makedirs(carpeta, exist_ok=True)
+        with open(ruta, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+
+            if reader.fieldnames is None:
+                raise ArchivoError("El CSV no tiene encabezados (header).")
+
+            yield from _clientes_de_reader(reader, errores, confiable=confiable)
+
+    except ArchivoError:
+        raise
+    except Exception as e:
+        raise ArchivoError(f"Error importando CSV ({ruta}): {e}") from e
+
+
+def _clientes_de_reader(reader, errores: list, lineas_previas: int = 0, confiable: bool = False):
+    """
+    Convierte las filas de un DictReader, registrando las inválidas en `errores`.
+    Las filas se validan de a lotes con validar_lote (por columnas y sin
+    excepciones), así una fila sucia no cuesta un raise/except.
+    Con confiable=True (archivo firmado) no se valida nada.
+    """
+    if confiable:
+        for row in reader:
+            if not _fila_vacia(row):
+                yield _crear_desde_fila(_normalizar_fila(row), validar=False)
+        return
+
+    while True:
+        lote = []
+        lineas = []
+        for row in reader:
+            if _fila_vacia(row):
+                continue
+            lote.append(_normalizar_fila(row))
+            lineas.append(reader.line_num)
+            if len(lote) >= LOTE_VALIDACION:
+                break
+        if not lote:
+            return
+
+        for fila, linea, codigo in zip(lote, lineas, validar_lote(lote)):
+            if codigo is not None:
+                if errores is not None:
+                    errores.append({"linea": lineas_previas + linea, "codigo": codigo, "error": MENSAJES_ERROR[codigo]})
+                continue
+            yield _crear_validada(fila)
+
+
+# ---------------------------------------------------------------------------
+# Importación paralela (opcional)
+# ---------------------------------------------------------------------------
+
+BLOQUE_PARALELO = 8 * 1024 * 1024  # bytes por bloque enviado a cada proceso
+
+
+def _rangos_por_linea(ruta: str, bloque_bytes: int):
+    """
+    Lee el header y divide el resto del archivo en rangos de bytes
+    [inicio, fin) que siempre terminan en un salto de línea.
+    Devuelve (fieldnames, rangos).
+    """
+    with open(ruta, "rb") as f:
+        header = f.readline()
+        fieldnames = next(csv.reader([header.decode("utf-8")]), None)
+
+        inicio = f.tell()
+        tam = os.fstat(f.fileno()).st_size
+        rangos = []
+        while inicio < tam:
+            f.seek(min(inicio + bloque_bytes, tam))
+            f.readline()  # avanzar hasta el final de la línea en curso
+            fin = min(f.tell(), tam)
+            rangos.append((inicio, fin))
+            inicio = fin
 
-        clientes = gestor.listar()
-        resumen = gestor.resumen_por_tipo()
-
-        # Listas para "tablas"
-        premium_rows = []
-        corp_rows = []
-        regular_rows = []
-
-        # Métricas
-        premium_por_nivel = {"silver": 0, "gold": 0, "platinum": 0, "otro": 0}
-        premium_descuentos = []
-        corp_descuentos = []
-        corp_fact = []
-
-        # Helpers
-        def avg(nums):
-            return (sum(nums) / len(nums)) if nums else 0
-
-        for c in clientes:
-            cls = c.__class__.__name__.lower()
-
-            if "premium" in cls:
-                nivel = getattr(c, "nivel", "otro") or "otro"
-                nivel = str(nivel).strip().lower()
-                if nivel in premium_por_nivel:
-                    premium_por_nivel[nivel] += 1
-                else:
-                    premium_por_nivel["otro"] += 1
-
-                desc = sla = None
-                envio = None
-                if hasattr(c, "beneficio_exclusivo"):
-                    b = c.beneficio_exclusivo()
-                    if isinstance(b, dict):
-                        desc = b.get("descuento")
-                        sla = b.get("sla_horas")
-                        envio = b.get("envio_gratis")
-                        if isinstance(desc, (int, float)):
-                            premium_descuentos.append(desc)
-
-                premium_rows.append({
-                    "id": c.id,
-                    "nombre": c.nombre,
-                    "nivel": getattr(c, "nivel", ""),
-                    "descuento": desc,
-                    "sla": sla,
-                    "envio": envio,
-                    "email": c.email
-                })
-
-            elif "corporativo" in cls:
-                desc_vol = fact_dias = None
-                ejecutivo = getattr(c, "contacto", "")
-                empresa = getattr(c, "empresa", "")
-
-                if hasattr(c, "beneficio_corporativo"):
-                    b = c.beneficio_corporativo()
-                    if isinstance(b, dict):
-                        desc_vol = b.get("descuento_volumen")
-                        fact_dias = b.get("facturacion_dias")
-                        ejecutivo = b.get("ejecutivo", ejecutivo)
-                        if isinstance(desc_vol, (int, float)):
-                            corp_descuentos.append(desc_vol)
-                        if isinstance(fact_dias, (int, float)):
-                            corp_fact.append(fact_dias)
-
-                corp_rows.append({
-                    "id": c.id,
-                    "nombre": c.nombre,
-                    "empresa": empresa,
-                    "ejecutivo": ejecutivo,
-                    "descuento_vol": desc_vol,
-                    "facturacion": fact_dias,
-                    "email": c.email
-                })
+    return fieldnames, rangos
 
+
+def _parsear_rango(ruta: str, fieldnames: list, inicio: int, fin: int, confiable: bool = False):
+    """
+    Tarea de cada proceso: parsea y valida las filas del rango.
+    Devuelve (clientes, errores con línea relativa al rango, líneas del rango).
+    """
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+
+    errores = []
+    reader = csv.DictReader(io.StringIO(datos.decode("utf-8"), newline=""), fieldnames=fieldnames)
+    clientes = list(_clientes_de_reader(reader, errores, confiable=confiable))
+    return clientes, errores, datos.count(b"\n")
+
+
+def iterar_csv_paralelo(ruta: str, procesos: int = None, errores: list = None, bloque_bytes: int = BLOQUE_PARALELO,
+                        confiable: bool = False):
+    """
+    Igual que iterar_csv, pero el parseo y la validación de cada bloque del
+    archivo se hacen en un pool de procesos. Los bloques se entregan en el
+    orden del archivo, así que el resultado es idéntico al del modo serial.
+
+    Nota: los bloques se cortan en saltos de línea, por lo que no se admiten
+    campos entre comillas que contengan saltos de línea.
+    """
+    if not os.path.exists(ruta):
+        raise ArchivoError(f"No existe el archivo: {ruta}")
+    confiable = confiable and firma_valida(ruta)
+    return _iterar_paralelo(ruta, procesos or os.cpu_count() or 1, errores, bloque_bytes, confiable)
+
+
+def _iterar_paralelo(ruta: str, procesos: int, errores: list, bloque_bytes: int, confiable: bool = False):
+    # multiprocessing solo se carga si se pide parseo en paralelo
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        fieldnames, rangos = _rangos_por_linea(ruta, bloque_bytes)
+        if not fieldnames:
+            raise ArchivoError("El CSV no tiene encabezados (header).")
+
+        lineas_previas = 1  # header
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            # Ventana acotada de bloques en vuelo: la memoria no crece con el archivo
+            pendientes = deque()
+            siguientes = iter(rangos)
+            for ini, fin in islice(siguientes, procesos * 2):
+                pendientes.append(pool.submit(_parsear_rango, ruta, fieldnames, ini, fin, confiable))
+
+            while pendientes:
+                clientes, errores_bloque, lineas = pendientes.popleft().result()
+                rango = next(siguientes, None)
+                if rango is not None:
+                    pendientes.append(pool.submit(_parsear_rango, ruta, fieldnames, *rango, confiable))
+
+                if errores is not None:
+                    for e in errores_bloque:
+                        e["linea"] += lineas_previas
+                        errores.append(e)
+                lineas_previas += lineas
+                yield from clientes
+
+    except ArchivoError:
+        raise
+    except Exception as e:
+        raise ArchivoError(f"Error importando CSV ({ruta}): {e}") from e
+
+
+@medir("archivos.importar_csv_en_lotes", contar("agregados", "rechazados", "invalidos"))
+def importar_csv_en_lotes(ruta: str, gestor, tam_lote: int = 1000, errores: list = None, procesos: int = None,
+                          confiable: bool = False) -> dict:
+    """
+    Importa el CSV al gestor en lotes de `tam_lote` clientes, de modo que la
+    memoria usada no depende del tamaño del archivo.
+    Con `procesos` > 1 el parseo y la validación se reparten en un pool de procesos.
+    Con confiable=True un CSV firmado por exportar_csv se carga sin revalidar.
+    Devuelve un resumen con agregados, rechazados (duplicados) e inválidos.
+    """
+    if errores is None:
+        errores = []
+
+    resumen = {"agregados": 0, "rechazados": 0, "invalidos": 0}
+    errores_previos = len(errores)
+    if procesos is not None and procesos > 1:
+        clientes = iterar_csv_paralelo(ruta, procesos, errores, confiable=confiable)
+    else:
+        clientes = iterar_csv(ruta, errores, confiable=confiable)
+
+    while True:
+        lote = list(islice(clientes, tam_lote))
+        if not lote:
+            break
+        r = gestor.agregar_muchos(lote)
+        resumen["agregados"] += len(r["aceptados"])
+        resumen["rechazados"] += len(r["rechazados"])
+
+    resumen["invalidos"] = len(errores) - errores_previos
+    return resumen
+
+
+# ---------------------------------------------------------------------------
+# Importación incremental
+# ---------------------------------------------------------------------------
+
+EXTENSION_ESTADO = ".estado"
+HUELLA_BYTES = 64 * 1024  # bytes previos al offset que entran en la huella
+
+
+def _huella(f, offset: int) -> str:
+    """
+    sha256 del header y de los últimos HUELLA_BYTES antes de `offset`: si el
+    archivo se reescribió (en vez de solo crecer al final), deja de coincidir.
+    """
+    h = hashlib.sha256()
+    f.seek(0)
+    h.update(f.readline())
+    inicio = max(f.tell(), offset - HUELLA_BYTES)
+    f.seek(inicio)
+    h.update(f.read(max(0, offset - inicio)))
+    return h.hexdigest()
+
+
+def _leer_estado(ruta_estado: str):
+    try:
+        with open(ruta_estado, "r", encoding="utf-8") as f:
+            estado = json.load(f)
+        return estado if isinstance(estado, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _es_entero(valor) -> bool:
+    return type(valor) is int  # bool es subclase de int y no vale como offset
+
+
+def _estado_vigente(estado, f, largo_header: int, info: os.stat_result) -> bool:
+    """
+    True si el estado guardado es de este archivo y se puede seguir desde
+    su offset. Un estado con otro esquema (campos faltantes o de otro tipo)
+    no vale: se revisa el archivo entero.
+    """
+    if not estado or not all(_es_entero(estado.get(k)) for k in ("offset", "lineas", "tamano", "mtime_ns")):
+        return False
+    if not isinstance(estado.get("huella"), str):
+        return False
+    offset = estado["offset"]
+    if not largo_header <= offset <= info.st_size or estado["lineas"] < 1:
+        return False
+    # se achicó, o cambió sin crecer: se editó en el lugar
+    if info.st_size < estado["tamano"]:
+        return False
+    if info.st_size == estado["tamano"] and info.st_mtime_ns != estado["mtime_ns"]:
+        return False
+    return estado["huella"] == _huella(f, offset)
+
+
+def _lineas_completas(f, avance: list):
+    """Líneas terminadas en salto de línea; una última línea a medio escribir queda para la próxima."""
+    for linea in f:
+        if not linea.endswith(b"\n"):
+            break
+        avance[0] += len(linea)
+        yield linea.decode("utf-8")
+
+
+@medir("archivos.importar_csv_incremental", contar("insertados", "actualizados", "omitidos", "fallidos"))
+def importar_csv_incremental(ruta: str, gestor, ruta_estado: str = None, errores: list = None) -> dict:
+    """
+    Importa solo lo que se agregó al CSV desde la última vez.
+
+    El estado (`<ruta>.estado`) guarda el offset en bytes hasta donde se
+    procesó, la cantidad de líneas, el tamaño y la fecha de modificación del
+    archivo y una huella (header + HUELLA_BYTES antes del offset). Si el
+    archivo solo creció, se lee desde ese offset; si se achicó, cambió sin
+    crecer, cambió la huella o el estado falta o no tiene el formato
+    esperado, se revisa entero.
+    Alcance de la detección: una edición anterior a los últimos HUELLA_BYTES
+    ya importados, hecha junto con un agregado al final, no se detecta; en
+    ese caso hay que borrar el estado para forzar una revisión completa.
+    Cada fila válida se aplica como upsert: si el ID no
+    existe se da de alta, si existe y cambió se actualiza (si cambió el tipo,
+    se reemplaza) y si es idéntica se omite.
+    Las filas inválidas o que chocan con el email de otro cliente cuentan
+    como fallidas y se registran en `errores` ({"linea", "codigo", "error"}).
+
+    Nota: igual que la importación paralela, no admite campos entre comillas
+    con saltos de línea.
+
+    Devuelve {"insertados", "actualizados", "omitidos", "fallidos", "completo"}
+    (completo=True si se revisó el archivo desde el principio).
+    """
+    if not os.path.exists(ruta):
+        raise ArchivoError(f"No existe el archivo: {ruta}")
+    ruta_estado = ruta_estado or ruta + EXTENSION_ESTADO
+    if errores is None:
+        errores = []
+
+    resumen = {"insertados": 0, "actualizados": 0, "omitidos": 0, "fallidos": 0, "completo": False}
+    try:
+        with open(ruta, "rb") as f:
+            header = f.readline()
+            fieldnames = next(csv.reader([header.decode("utf-8")]), None)
+            if not fieldnames:
+                raise ArchivoError("El CSV no tiene encabezados (header).")
+            info = os.fstat(f.fileno())
+
+            estado = _leer_estado(ruta_estado)
+            if _estado_vigente(estado, f, len(header), info):
+                offset, lineas = estado["offset"], estado["lineas"]
             else:
-                # Regular (default)
-                regular_rows.append({
-                    "id": c.id,
-                    "nombre": c.nombre,
-                    "email": c.email
-                })
-
-        # Ordenar por ID para que se vea ordenado
-        premium_rows.sort(key=lambda x: x["id"])
-        corp_rows.sort(key=lambda x: x["id"])
-        regular_rows.sort(key=lambda x: x["id"])
-
-        with open(ruta, "w", encoding="utf-8") as f:
-            # ===== Sección requerida =====
-            f.write("Reporte resumen - GIC\n")
-            f.write("=====================\n\n")
-            f.write(f"Total clientes: {resumen.get('total', 0)}\n")
-            f.write(f"Regular: {resumen.get('regular', 0)}\n")
-            f.write(f"Premium: {resumen.get('premium', 0)}\n")
-            f.write(f"Corporativo: {resumen.get('corporativo', 0)}\n")
-
-            # ===== Extra =====
-            f.write("\n--- Detalle y Beneficios (extra) ---\n")
-
-            # -------- PREMIUM --------
-            f.write("\n[Premium]\n")
-            f.write("Distribución por nivel:\n")
-            f.write(f"  - Silver: {premium_por_nivel['silver']}\n")
-            f.write(f"  - Gold: {premium_por_nivel['gold']}\n")
-            f.write(f"  - Platinum: {premium_por_nivel['platinum']}\n")
-            if premium_por_nivel["otro"] > 0:
-                f.write(f"  - Otro: {premium_por_nivel['otro']}\n")
-            f.write(f"Descuento promedio premium: {avg(premium_descuentos):.2f}%\n\n")
-
-            if premium_rows:
-                f.write("ID | Nombre | Nivel | Desc% | SLA(h) | Envío Gratis | Email\n")
-                f.write("-" * 78 + "\n")
-                for r in premium_rows:
-                    desc = r["descuento"] if r["descuento"] is not None else "N/A"
-                    sla = r["sla"] if r["sla"] is not None else "N/A"
-                    envio = "Sí" if r["envio"] is True else ("No" if r["envio"] is False else "N/A")
-                    f.write(f"{r['id']} | {r['nombre']} | {r['nivel']} | {desc} | {sla} | {envio} | {r['email']}\n")
+                offset, lineas = len(header), 1
+                resumen["completo"] = True
+
+            f.seek(offset)
+            avance = [0]
+            reader = csv.DictReader(_lineas_completas(f, avance), fieldnames=fieldnames)
+            _aplicar_incremental(reader, gestor, errores, lineas, resumen)
+
+            offset += avance[0]
+            lineas += reader.line_num
+            estado = {
+                "offset": offset, "lineas": lineas, "huella": _huella(f, offset),
+                "tamano": info.st_size, "mtime_ns": info.st_mtime_ns,
+            }
+
+        with abrir_salida_atomica(ruta_estado, encoding="utf-8") as f:
+            json.dump(estado, f)
+        return resumen
+
+    except ArchivoError:
+        raise
+    except Exception as e:
+        raise ArchivoError(f"Error en importación incremental ({ruta}): {e}") from e
+
+
+def _aplicar_incremental(reader, gestor, errores: list, lineas_previas: int, resumen: dict) -> None:
+    while True:
+        lote = []
+        lineas = []
+        for row in reader:
+            if _fila_vacia(row):
+                continue
+            lote.append(_normalizar_fila(row))
+            lineas.append(lineas_previas + reader.line_num)
+            if len(lote) >= LOTE_VALIDACION:
+                break
+        if not lote:
+            return
+
+        validos = []
+        for fila, linea, codigo in zip(lote, lineas, validar_lote(lote)):
+            if codigo is None:
+                validos.append((linea, _crear_validada(fila)))
             else:
-                f.write("No hay clientes premium.\n")
-
-            # -------- CORPORATIVO --------
-            f.write("\n\n[Corporativo]\n")
-            f.write(f"Descuento volumen promedio: {avg(corp_descuentos):.2f}%\n" if corp_descuentos else "Descuento volumen promedio: N/A\n")
-            f.write(f"Facturación promedio: {avg(corp_fact):.2f} días\n\n" if corp_fact else "Facturación promedio: N/A\n\n")
-
-            if corp_rows:
-                f.write("ID | Nombre | Empresa | Ejecutivo | DescVol% | Fact(d) | Email\n")
-                f.write("-" * 82 + "\n")
-                for r in corp_rows:
-                    descv = r["descuento_vol"] if r["descuento_vol"] is not None else "N/A"
-                    fact = r["facturacion"] if r["facturacion"] is not None else "N/A"
-                    f.write(f"{r['id']} | {r['nombre']} | {r['empresa']} | {r['ejecutivo']} | {descv} | {fact} | {r['email']}\n")
+                resumen["fallidos"] += 1
+                errores.append({"linea": linea, "codigo": codigo, "error": MENSAJES_ERROR[codigo]})
+        _upsert(gestor, validos, errores, resumen)
+
+
+def _upsert(gestor, clientes: list, errores: list, resumen: dict) -> None:
+    """
+    Aplica (linea, cliente) en orden. Las altas se juntan y van en una
+    sola llamada a agregar_muchos; si un ID se repite dentro del lote, las
+    altas pendientes se confirman antes de tratarlo como actualización.
+    """
+    altas = []
+    ids_altas = set()
+
+    def fallo(linea: int, motivo: str) -> None:
+        resumen["fallidos"] += 1
+        errores.append({"linea": linea, "codigo": "DUPLICADO", "error": motivo})
+
+    def confirmar_altas() -> None:
+        if not altas:
+            return
+        r = gestor.agregar_muchos([c for _, c in altas])
+        rechazados = {id(x["cliente"]): x["motivo"] for x in r["rechazados"]}
+        for linea, c in altas:
+            motivo = rechazados.get(id(c))
+            if motivo is None:
+                resumen["insertados"] += 1
             else:
-                f.write("No hay clientes corporativos.\n")
-
-            # -------- REGULAR --------
-            f.write("\n\n[Regular]\n")
-            f.write("Beneficio: acceso a promociones estándar (sin descuento fijo).\n\n")
-            if regular_rows:
-                f.write("ID | Nombre | Email\n")
-                f.write("-" * 50 + "\n")
-                for r in regular_rows:
-                    f.write(f"{r['id']} | {r['nombre']} | {r['email']}\n")
+                fallo(linea, motivo)
+        altas.clear()
+        ids_altas.clear()
+
+    for linea, nuevo in clientes:
+        if nuevo.id in ids_altas:
+            confirmar_altas()
+        try:
+            actual = gestor.buscar_por_id(nuevo.id)
+        except ClienteNoEncontradoError:
+            altas.append((linea, nuevo))
+            ids_altas.add(nuevo.id)
+            continue
+
+        fila_nueva = cliente_a_fila(nuevo)
+        fila_actual = cliente_a_fila(actual)
+        if fila_nueva == fila_actual:
+            resumen["omitidos"] += 1
+            continue
+
+        try:
+            if nuevo.TIPO == actual.TIPO:
+                campos = {
+                    campo: valor
+                    for campo, valor, previo in zip(FIELDNAMES[2:], fila_nueva[2:], fila_actual[2:])
+                    if valor != previo
+                }
+                gestor.actualizar(nuevo.id, **campos)
             else:
-                f.write("No hay clientes regulares.\n")
+                # cambio de tipo: se reemplaza el cliente, verificando antes el email
+                if gestor.existe_email(nuevo.email, excluir_id=nuevo.id):
+                    raise ClienteExistenteError(f"Ya existe un cliente con email {nuevo.email}")
+                gestor.eliminar(nuevo.id)
+                gestor.agregar(nuevo)
+            resumen["actualizados"] += 1
+        except ClienteExistenteError as e:
+            fallo(linea, str(e))
 
-            f.write("\n\nFin del reporte.\n")
+    confirmar_altas()
 
-    except Exception as e:
-        raise ArchivoError(f"Error generando reporte TXT ({ruta}): {e}") from e
 
+@medir("archivos.generar_reporte_txt", int)
+def generar_reporte_txt(ruta: str, gestor) -> int:
+    """
+    Reporte TXT (devuelve la cantidad de clientes incluidos):
+    - Totales por tipo (requisito)
+    - Extra:
+      * Premium: distribución por nivel, promedio descuento, tabla de clientes
+      * Corporativo: promedio desc/facturación, tabla con empresa y ejecutivo
+      * Regular: listado simple + beneficio estándar
 
+    El modelo y el formato están en reportes.py; para sacar varios formatos
+    (CSV, JSON, HTML) en la misma pasada, usar reportes.generar_reportes().
+    """
+    return generar_reportes(gestor, {"txt": ruta})
@@ -0,0 +1,281 @@
+"""
+Interfaz por lotes (sin menú) para scripts y tareas programadas.
+
+Uso (desde la carpeta del proyecto):
+    python -m modulos.cli [--almacen NOMBRE] [--particiones N] [--log RUTA] ETAPA [args] [+ ETAPA [args] ...]
+    python main.py ETAPA ...            (igual; sin argumentos abre el menú)
+
+Etapas (entre paréntesis, el alias en castellano):
+    import (importar)   [ruta] [--incremental [--estado RUTA]] [--procesos N] [--confiable] [--estricto]
+    export (exportar)   [ruta] [--sin-firma]
+    report (reporte)    [ruta] [--formatos txt,csv,json,html]
+    stats (resumen)     [--json]
+    dedupe (duplicados) [--umbral 0.85] [--salida RUTA.json]
+
+Las etapas separadas por "+" corren en orden en el mismo proceso y sobre
+el mismo gestor, sin recargar los datos entre una y otra:
+
+    python -m modulos.cli --almacen sqlite import datos/nuevos.csv + report + stats --json
+
+Los datos (stats, dedupe) salen por stdout; el estado de cada etapa y los
+errores, por stderr. Con un almacenamiento persistente (sqlite, bitacora)
+los datos quedan entre corridas; con los demás, import --incremental vuelve
+a leer el archivo completo en cada corrida.
+
+Códigos de salida: 0 si todo anduvo, 1 si una etapa falló (las siguientes
+no corren; con --estricto también si hubo filas inválidas o duplicadas) y
+2 si los argumentos son incorrectos.
+
+Con --particiones N (N > 1) las etapas corren sobre un GestorParticionado:
+los clientes se reparten por id en N procesos (modulos/gestor_particionado.py).
+
+Los módulos pesados (archivos, deduplicación, multiprocessing y los
+backends de almacenamiento) se importan recién cuando una etapa los
+necesita.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from .excepciones import GICError
+from .gestor_clientes import ALMACENES, ALMACENES_PERSISTENTES, GestorClientes
+
+
+RUTA_ENTRADA = "datos/clientes_entradas.csv"
+RUTA_SALIDA = "datos/clientes.csv"
+RUTA_REPORTE = "reportes/resumen.txt"
+RUTA_LOG = "logs/app.log"
+MAX_ERRORES = 10             # filas inválidas que se muestran por importación
+
+SEPARADOR = "+"
+
+
+class ErrorEtapa(GICError):
+    """La etapa terminó, pero con --estricto lo que encontró cuenta como falla."""
+
+
+# ---------------------------------------------------------------------------
+# Etapas: reciben el gestor y sus argumentos, escriben sus datos en stdout
+# y devuelven la línea de estado (que va a stderr, junto con los errores)
+# ---------------------------------------------------------------------------
+
+def _ruta_estado(args) -> str:
+    """Estado de import --incremental: por archivo, almacenamiento y particiones."""
+    destino = args.almacen if args.particiones <= 1 else f"{args.almacen}.p{args.particiones}"
+    return args.estado or f"{args.ruta}.{destino}.estado"
+
+
+def _importar(gestor, args) -> str:
+    from .archivos import importar_csv_en_lotes, importar_csv_incremental
+
+    errores = []
+    if args.incremental:
+        r = importar_csv_incremental(args.ruta, gestor, _ruta_estado(args), errores=errores)
+        linea = (
+            f"{r['insertados']} insertados, {r['actualizados']} actualizados, "
+            f"{r['omitidos']} sin cambios, {r['fallidos']} fallidos"
+        )
+    else:
+        r = importar_csv_en_lotes(args.ruta, gestor, errores=errores, procesos=args.procesos,
+                                  confiable=args.confiable)
+        linea = f"{r['agregados']} agregados, {r['rechazados']} duplicados, {r['invalidos']} inválidos"
+
+    for e in errores[:MAX_ERRORES]:
+        print(f"  línea {e['linea']}: {e['error']}", file=sys.stderr)
+    if len(errores) > MAX_ERRORES:
+        print(f"  ... y {len(errores) - MAX_ERRORES} errores más", file=sys.stderr)
+
+    rechazos = r["rechazados"] if not args.incremental else 0
+    if args.estricto and (errores or rechazos):
+        raise ErrorEtapa(f"{linea} (--estricto)")
+    return linea
+
+
+def _exportar(gestor, args) -> str:
+    from .archivos import exportar_csv
+
+    n = exportar_csv(args.ruta, gestor.iterar(), rapido=True, atomico=True, firmar=not args.sin_firma)
+    return f"{n} clientes en {args.ruta}"
+
+
+def _reporte(gestor, args) -> str:
+    from .reportes import generar_reportes, rutas_por_formato
+
+    destinos = rutas_por_formato(args.ruta, args.formatos)
+    n = generar_reportes(gestor, destinos)
+    return f"{n} clientes en {', '.join(destinos.values())}"
+
+
+def _resumen(gestor, args) -> str:
+    agregados = gestor.agregados()
+    if args.json:
+        print(json.dumps(agregados, ensure_ascii=False))
+    else:
+        niveles = agregados["premium_por_nivel"]
+        print(
+            f"Total: {agregados['total']} | Regular: {agregados['regular']} | "
+            f"Premium: {agregados['premium']} (silver {niveles['silver']}, gold {niveles['gold']}, "
+            f"platinum {niveles['platinum']}) | Corporativo: {agregados['corporativo']}"
+        )
+    return f"{agregados['total']} clientes"
+
+
+def _duplicados(gestor, args) -> str:
+    from .deduplicacion import detectar_duplicados
+
+    grupos = detectar_duplicados(gestor.iterar(), umbral=args.umbral)
+    if args.salida:
+        carpeta = os.path.dirname(args.salida)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(grupos, f, ensure_ascii=False, indent=2)
+    else:
+        for g in grupos:
+            print(f"{g['ids']} puntaje {g['puntaje']:.2f} ({', '.join(g['motivos'])})")
+    destino = f" en {args.salida}" if args.salida else ""
+    return f"{len(grupos)} grupos de posibles duplicados{destino}"
+
+
+# ---------------------------------------------------------------------------
+# Argumentos
+# ---------------------------------------------------------------------------
+
+def _lista(texto: str) -> list:
+    valores = [v.strip() for v in texto.split(",") if v.strip()]
+    if not valores:
+        raise argparse.ArgumentTypeError("se espera al menos un valor (separados por coma)")
+    return valores
+
+
+def _agregar_etapas(parser: argparse.ArgumentParser) -> None:
+    etapas = parser.add_subparsers(dest="etapa", metavar="ETAPA", required=True)
+
+    p = etapas.add_parser("import", aliases=["importar"], help="importa clientes desde un CSV")
+    p.add_argument("ruta", nargs="?", default=RUTA_ENTRADA)
+    p.add_argument("--incremental", action="store_true",
+                   help="solo las líneas nuevas desde la última corrida (inserta o actualiza)")
+    p.add_argument("--estado", help="archivo de estado de --incremental (por defecto <ruta>.<almacen>.estado)")
+    p.add_argument("--procesos", type=int, help="parsea y valida en N procesos")
+    p.add_argument("--confiable", action="store_true", help="no revalida un CSV firmado por export")
+    p.add_argument("--estricto", action="store_true", help="falla si hubo filas inválidas o duplicadas")
+    p.set_defaults(funcion=_importar)
+
+    p = etapas.add_parser("export", aliases=["exportar"], help="exporta los clientes a CSV")
+    p.add_argument("ruta", nargs="?", default=RUTA_SALIDA)
+    p.add_argument("--sin-firma", action="store_true", help="no escribe <ruta>.firma")
+    p.set_defaults(funcion=_exportar)
+
+    p = etapas.add_parser("report", aliases=["reporte"], help="genera el reporte (TXT, CSV, JSON, HTML)")
+    p.add_argument("ruta", nargs="?", default=RUTA_REPORTE,
+                   help="cada formato usa esta ruta con su extensión (en CSV, <ruta>_<seccion>.csv)")
+    p.add_argument("--formatos", type=_lista, default=["txt"],
+                   help="formatos separados por coma; comparten el recorrido de la cartera (por defecto txt)")
+    p.set_defaults(funcion=_reporte)
+
+    p = etapas.add_parser("stats", aliases=["resumen"], help="totales por tipo y nivel")
+    p.add_argument("--json", action="store_true", help="agregados completos en JSON por stdout")
+    p.set_defaults(funcion=_resumen)
+
+    p = etapas.add_parser("dedupe", aliases=["duplicados"], help="busca posibles clientes duplicados")
+    p.add_argument("--umbral", type=float, default=0.85)
+    p.add_argument("--salida", help="guarda los grupos en JSON en vez de listarlos")
+    p.set_defaults(funcion=_duplicados)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gic",
+        description=f"Etapas por lotes del Gestor Inteligente de Clientes; se encadenan con '{SEPARADOR}'.",
+    )
+    parser.add_argument("--almacen", choices=list(ALMACENES), default=os.environ.get("GIC_ALMACEN", "memoria"),
+                        help="backend de almacenamiento (por defecto GIC_ALMACEN o memoria)")
+    parser.add_argument("--particiones", type=int, default=int(os.environ.get("GIC_PARTICIONES", "0")),
+                        help="reparte los clientes por id en N procesos (por defecto GIC_PARTICIONES; 0 o 1: uno solo)")
+    parser.add_argument("--log", default=RUTA_LOG, help=f"archivo de log (por defecto {RUTA_LOG})")
+    parser.add_argument("--log-formato", choices=("texto", "json"),
+                        default=os.environ.get("GIC_LOG_FORMATO", "texto"))
+    _agregar_etapas(parser)
+    return parser
+
+
+def _parser_etapa() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=f"gic ... {SEPARADOR}")
+    _agregar_etapas(parser)
+    return parser
+
+
+def _separar(argv: list) -> list:
+    tramos = [[]]
+    for arg in argv:
+        if arg == SEPARADOR:
+            tramos.append([])
+        else:
+            tramos[-1].append(arg)
+    return tramos
+
+
+def parsear(argv: list) -> list:
+    """
+    Lista de Namespace, uno por etapa. Las opciones globales van antes de
+    la primera etapa y se copian a las demás.
+    """
+    primero, *resto = _separar(argv)
+    etapas = [_parser().parse_args(primero)]
+    globales = {k: getattr(etapas[0], k) for k in ("almacen", "particiones", "log", "log_formato")}
+    for tramo in resto:
+        args = _parser_etapa().parse_args(tramo)
+        for k, v in globales.items():
+            setattr(args, k, v)
+        etapas.append(args)
+    return etapas
+
+
+def main(argv: list = None) -> int:
+    etapas = parsear(sys.argv[1:] if argv is None else argv)
+    globales = etapas[0]
+
+    from .logger_config import configurar_logging
+
+    configurar_logging(ruta=globales.log, formato_json=globales.log_formato == "json")
+    if os.environ.get("GIC_METRICAS") or os.environ.get("GIC_PERFIL"):
+        from . import metricas
+        metricas.configurar_desde_entorno()
+
+    try:
+        if globales.particiones > 1:
+            from .gestor_particionado import GestorParticionado
+            gestor = GestorParticionado(globales.particiones, globales.almacen)
+        else:
+            gestor = GestorClientes(globales.almacen)
+    except (GICError, OSError) as e:
+        print(f"error: no se pudo abrir el almacenamiento {globales.almacen}: {e}", file=sys.stderr)
+        return 1
+
+    # El estado de la importación incremental describe lo ya aplicado a los
+    # datos: si estos no persisten, el gestor arrancó vacío y hay que leer
+    # todo otra vez. Se descarta solo al empezar, así una segunda importación
+    # del mismo archivo en esta corrida sí lo aprovecha.
+    if globales.almacen not in ALMACENES_PERSISTENTES:
+        for args in etapas:
+            if getattr(args, "incremental", False) and os.path.exists(_ruta_estado(args)):
+                os.remove(_ruta_estado(args))
+
+    try:
+        for args in etapas:
+            t0 = time.perf_counter()
+            try:
+                linea = args.funcion(gestor, args)
+            except (GICError, OSError) as e:
+                print(f"{args.etapa}: error: {e}", file=sys.stderr)
+                return 1
+            print(f"{args.etapa}: {linea} ({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+        return 0
+    finally:
+        gestor.cerrar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
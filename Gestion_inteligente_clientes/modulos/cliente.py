@@ -2,13 +2,37 @@ from .validaciones import validar_no_vacio, validar_email, validar_telefono, val
 
 
 class Cliente:
+    # Sin __dict__ por instancia: con millones de clientes es el costo dominante
+    __slots__ = ("_gestor", "_id", "_nombre", "_email", "_telefono", "_direccion")
+
+    TIPO = "regular"
+    # campos que se pueden modificar (propiedades públicas con setter)
+    CAMPOS_EDITABLES = ("nombre", "email", "telefono", "direccion")
+
     def __init__(self, id: int, nombre: str, email: str, telefono: str, direccion: str):
+        self._gestor = None  # gestor dueño; se asigna al darse de alta
         self._id = int(id)
         self.nombre = nombre
         self.email = email
         self.telefono = telefono
         self.direccion = direccion
 
+    @classmethod
+    def crear_sin_validar(cls, id: int, nombre: str, email: str, telefono: str, direccion: str):
+        """
+        Constructor de confianza: asigna los campos sin pasar por los setters.
+        Solo para datos ya validados y normalizados (p. ej. un CSV exportado
+        por el propio sistema o lo guardado en un almacenamiento).
+        """
+        c = cls.__new__(cls)
+        c._gestor = None
+        c._id = int(id)
+        c._nombre = nombre
+        c._email = email
+        c._telefono = telefono
+        c._direccion = direccion
+        return c
+
     @property
     def id(self) -> int:
         return self._id
@@ -19,8 +43,8 @@ class Cliente:
 
     @nombre.setter
     def nombre(self, valor: str) -> None:
-        validar_no_vacio(valor, "nombre")
-        self._nombre = valor.strip()
+        nuevo = validar_no_vacio(valor, "nombre")
+        self._asignar("nombre", nuevo)
 
     @property
     def email(self) -> str:
@@ -28,8 +52,8 @@ class Cliente:
 
     @email.setter
     def email(self, valor: str) -> None:
-        validar_email(valor)
-        self._email = valor.strip().lower()
+        nuevo = validar_email(valor).lower()
+        self._asignar("email", nuevo)
 
     @property
     def telefono(self) -> str:
@@ -37,8 +61,8 @@ class Cliente:
 
     @telefono.setter
     def telefono(self, valor: str) -> None:
-        validar_telefono(valor)
-        self._telefono = valor.strip()
+        nuevo = validar_telefono(valor)
+        self._asignar("telefono", nuevo)
 
     @property
     def direccion(self) -> str:
@@ -46,8 +70,17 @@ class Cliente:
 
     @direccion.setter
     def direccion(self, valor: str) -> None:
-        validar_direccion(valor)
-        self._direccion = valor.strip()
+        nuevo = validar_direccion(valor)
+        self._asignar("direccion", nuevo)
+
+    def _asignar(self, campo: str, valor) -> None:
+        # Dado de alta, el cambio lo aplica el gestor: mantiene sus índices (y
+        # puede rechazarlo, p. ej. por email duplicado) y asigna el atributo
+        # en la misma operación, bajo su cerrojo si es concurrente.
+        if self._gestor is None:
+            setattr(self, "_" + campo, valor)
+        else:
+            self._gestor._al_cambiar(self, campo, valor)
 
     def mostrar_info(self) -> str:
         return f"[Cliente] ID: {self.id} | {self.nombre} | {self.email} | {self.telefono} | {self.direccion}"
@@ -64,3 +97,17 @@ class Cliente:
 
     def __str__(self) -> str:
         return self.mostrar_info()
+
+    def __getstate__(self) -> dict:
+        # Al copiar/serializar (p. ej. hacia otro proceso) no viaja el gestor dueño
+        estado = {}
+        for cls in type(self).__mro__:
+            for attr in getattr(cls, "__slots__", ()):
+                if attr != "_gestor" and hasattr(self, attr):
+                    estado[attr] = getattr(self, attr)
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        self._gestor = None
+        for attr, valor in estado.items():
+            object.__setattr__(self, attr, valor)
@@ -2,7 +2,16 @@ from .cliente import Cliente
 from .validaciones import validar_no_vacio
 
 
+DESCUENTO_VOLUMEN = 12
+FACTURACION_DIAS = 30
+
+
 class ClienteCorporativo(Cliente):
+    __slots__ = ("_empresa", "_contacto")
+
+    TIPO = "corporativo"
+    CAMPOS_EDITABLES = Cliente.CAMPOS_EDITABLES + ("empresa", "contacto")
+
     def __init__(
         self,
         id: int,
@@ -17,14 +26,22 @@ class ClienteCorporativo(Cliente):
         self.empresa = empresa
         self.contacto = contacto
 
+    @classmethod
+    def crear_sin_validar(cls, id: int, nombre: str, email: str, telefono: str, direccion: str,
+                          empresa: str = None, contacto: str = None):
+        c = super().crear_sin_validar(id, nombre, email, telefono, direccion)
+        c._empresa = empresa
+        c._contacto = contacto
+        return c
+
     @property
     def empresa(self) -> str:
         return self._empresa
 
     @empresa.setter
     def empresa(self, valor: str) -> None:
-        validar_no_vacio(valor, "empresa")
-        self._empresa = valor.strip()
+        nuevo = validar_no_vacio(valor, "empresa")
+        self._asignar("empresa", nuevo)
 
     @property
     def contacto(self) -> str:
@@ -32,11 +49,11 @@ class ClienteCorporativo(Cliente):
 
     @contacto.setter
     def contacto(self, valor: str) -> None:
-        validar_no_vacio(valor, "contacto")
-        self._contacto = valor.strip()
+        nuevo = validar_no_vacio(valor, "contacto")
+        self._asignar("contacto", nuevo)
 
     def beneficio_corporativo(self) -> dict:
-        return {"descuento_volumen": 12, "facturacion_dias": 30, "ejecutivo": self.contacto}
+        return {"descuento_volumen": DESCUENTO_VOLUMEN, "facturacion_dias": FACTURACION_DIAS, "ejecutivo": self.contacto}
 
     def mostrar_info(self) -> str:
         b = self.beneficio_corporativo()
@@ -2,28 +2,42 @@ from .cliente import Cliente
 from .validaciones import validar_no_vacio
 
 
+BENEFICIOS_POR_NIVEL = {
+    "silver": {"descuento": 5, "sla_horas": 24, "envio_gratis": False},
+    "gold": {"descuento": 10, "sla_horas": 8, "envio_gratis": True},
+    "platinum": {"descuento": 15, "sla_horas": 2, "envio_gratis": True},
+}
+BENEFICIO_POR_DEFECTO = {"descuento": 5, "sla_horas": 24, "envio_gratis": False}
+
+
 class ClientePremium(Cliente):
+    __slots__ = ("_nivel",)
+
+    TIPO = "premium"
+    CAMPOS_EDITABLES = Cliente.CAMPOS_EDITABLES + ("nivel",)
+
     def __init__(self, id: int, nombre: str, email: str, telefono: str, direccion: str, nivel: str = "gold"):
         super().__init__(id, nombre, email, telefono, direccion)
         self.nivel = nivel
 
+    @classmethod
+    def crear_sin_validar(cls, id: int, nombre: str, email: str, telefono: str, direccion: str, nivel: str = "gold"):
+        c = super().crear_sin_validar(id, nombre, email, telefono, direccion)
+        c._nivel = nivel
+        return c
+
     @property
     def nivel(self) -> str:
         return self._nivel
 
     @nivel.setter
     def nivel(self, valor: str) -> None:
-        validar_no_vacio(valor, "nivel")
-        self._nivel = valor.strip().lower()
+        nuevo = validar_no_vacio(valor, "nivel").lower()
+        self._asignar("nivel", nuevo)
 
     def beneficio_exclusivo(self) -> dict:
-        tabla = {
-            "silver": {"descuento": 5, "sla_horas": 24, "envio_gratis": False},
-            "gold": {"descuento": 10, "sla_horas": 8, "envio_gratis": True},
-            "platinum": {"descuento": 15, "sla_horas": 2, "envio_gratis": True},
-        }
-        nivel = self.nivel.lower()
-        return tabla.get(nivel, {"descuento": 5, "sla_horas": 24, "envio_gratis": False})
+        # el setter ya guarda el nivel en minúsculas
+        return dict(BENEFICIOS_POR_NIVEL.get(self._nivel, BENEFICIO_POR_DEFECTO))
 
     def mostrar_info(self) -> str:
         b = self.beneficio_exclusivo()
@@ -2,6 +2,8 @@ from .cliente import Cliente
 
 
 class ClienteRegular(Cliente):
+    __slots__ = ()
+
     def mostrar_info(self) -> str:
         return f"[Regular] ID: {self.id} | {self.nombre} | {self.email} | {self.telefono} | {self.direccion}"
 
@@ -0,0 +1,93 @@
+import threading
+from contextlib import contextmanager
+
+
+class CerrojoLectoresEscritores:
+    """
+    Cerrojo de lectores/escritores: varios lectores a la vez o un único
+    escritor.
+
+    - El escritor es reentrante: un método que escribe puede llamar a otros
+      que leen o escriben (p. ej. agregar -> existe_email).
+    - La lectura también es reentrante por hilo.
+    - Un escritor en espera tiene prioridad sobre los lectores nuevos, así
+      una lectura constante no lo deja esperando para siempre.
+    - No se puede pasar de lectura a escritura (sería un interbloqueo).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritor = None          # ident del hilo que escribe
+        self._profundidad = 0          # reentradas del escritor
+        self._escritores_esperando = 0
+        self._local = threading.local()
+
+    def _lecturas_propias(self) -> int:
+        return getattr(self._local, "lecturas", 0)
+
+    def adquirir_lectura(self) -> None:
+        yo = threading.get_ident()
+        with self._cond:
+            if self._escritor == yo:
+                self._profundidad += 1
+                return
+            propias = self._lecturas_propias()
+            if propias == 0:
+                while self._escritor is not None or self._escritores_esperando:
+                    self._cond.wait()
+                self._lectores += 1
+            self._local.lecturas = propias + 1
+
+    def liberar_lectura(self) -> None:
+        yo = threading.get_ident()
+        with self._cond:
+            if self._escritor == yo:
+                self._profundidad -= 1
+                return
+            self._local.lecturas -= 1
+            if self._local.lecturas == 0:
+                self._lectores -= 1
+                if self._lectores == 0:
+                    self._cond.notify_all()
+
+    def adquirir_escritura(self) -> None:
+        yo = threading.get_ident()
+        with self._cond:
+            if self._escritor == yo:
+                self._profundidad += 1
+                return
+            if self._lecturas_propias():
+                raise RuntimeError("No se puede escribir mientras el mismo hilo tiene una lectura abierta.")
+
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._lectores:
+                    self._cond.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = yo
+            self._profundidad = 1
+
+    def liberar_escritura(self) -> None:
+        with self._cond:
+            self._profundidad -= 1
+            if self._profundidad == 0:
+                self._escritor = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def lectura(self):
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+
+    @contextmanager
+    def escritura(self):
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
@@ -0,0 +1,204 @@
+import unicodedata
+from itertools import combinations
+
+from .logger_config import get_logger
+
+
+DOMINIOS_GMAIL = {"gmail.com", "googlemail.com"}
+UMBRAL = 0.85       # puntaje mínimo para proponer una fusión
+MAX_BLOQUE = 100    # bloques más grandes se parten por prefijo del nombre
+LARGO_SUBBLOQUE = 2      # prefijo del nombre con que se empieza a partir un bloque grande
+MAX_LARGO_SUBBLOQUE = 16 # más allá, lo que no se pudo partir no se compara
+DIGITOS_TELEFONO = 8
+
+
+def normalizar_email(email: str) -> str:
+    """
+    Email canónico para comparar: minúsculas y, en Gmail, sin puntos ni
+    sufijo "+etiqueta" en la parte local (ana.perez+promo@gmail.com ->
+    anaperez@gmail.com).
+    """
+    email = email.strip().lower()
+    local, _, dominio = email.partition("@")
+    if dominio in DOMINIOS_GMAIL:
+        local = local.split("+", 1)[0].replace(".", "")
+        dominio = "gmail.com"
+    return f"{local}@{dominio}"
+
+
+def normalizar_telefono(telefono: str) -> str:
+    """Solo dígitos: sin espacios (igual que validar_telefono) y sin '+'."""
+    return telefono.strip().replace(" ", "").lstrip("+")
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """Sin tildes, en minúsculas y con las palabras ordenadas ("Pérez Ana" == "ana perez")."""
+    sin_tildes = nombre
+    if not nombre.isascii():
+        sin_tildes = unicodedata.normalize("NFKD", nombre)
+        sin_tildes = "".join(ch for ch in sin_tildes if not unicodedata.combining(ch))
+    return " ".join(sorted(sin_tildes.casefold().split()))
+
+
+def bigramas(nombre: str) -> frozenset:
+    """Pares de letras consecutivas de un nombre ya normalizado."""
+    return frozenset(nombre[i:i + 2] for i in range(len(nombre) - 1))
+
+
+def similitud_nombre(a: frozenset, b: frozenset) -> float:
+    """
+    Similitud 0..1 (coeficiente de Dice) entre los bigramas de dos nombres.
+    Son operaciones de conjuntos en C: barato aun con millones de pares.
+    """
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _claves_bloqueo(registro: tuple):
+    """
+    Claves de bloqueo de un registro (id, nombre, email, telefono, bigramas): solo se
+    comparan pares que comparten alguna, así los candidatos crecen casi en
+    forma lineal en vez de N².
+    """
+    _, nombre, email, telefono, _ = registro
+    yield ("email", email)
+    if len(telefono) >= DIGITOS_TELEFONO:
+        # últimos dígitos: iguala números con y sin código de país
+        yield ("telefono", telefono[-DIGITOS_TELEFONO:])
+    palabras = nombre.split()
+    if palabras:
+        yield ("nombre", palabras[0][:4], palabras[-1][:1], len(palabras))
+
+
+def _partir_bloque(registros: list, max_bloque: int, omitidos: list):
+    """
+    Reparte un bloque en sub-bloques de hasta `max_bloque` registros por un
+    prefijo del nombre normalizado cada vez más largo (p. ej. un bloque de
+    teléfono compartido por toda una empresa, o un apellido muy común). Lo
+    que no se puede partir (nombres iguales en el prefijo más largo) se
+    agrega a `omitidos` en vez de compararse par a par.
+    """
+    pendientes = [(registros, LARGO_SUBBLOQUE)]
+    while pendientes:
+        regs, largo = pendientes.pop()
+        if len(regs) <= max_bloque:
+            yield regs
+            continue
+        if largo > MAX_LARGO_SUBBLOQUE:
+            omitidos.append(regs)
+            continue
+        sub = {}
+        for r in regs:
+            sub.setdefault(r[1][:largo], []).append(r)
+        pendientes.extend((s, largo + 2) for s in sub.values() if len(s) >= 2)
+
+
+def _puntaje(a: tuple, b: tuple) -> tuple:
+    """(puntaje, motivo) de que a y b sean la misma persona."""
+    if a[2] == b[2]:
+        return 1.0, "email"
+
+    sim = 1.0 if a[1] == b[1] else similitud_nombre(a[4], b[4])
+    ta, tb = a[3], b[3]
+    if ta and tb and (ta.endswith(tb) or tb.endswith(ta)) and min(len(ta), len(tb)) >= DIGITOS_TELEFONO:
+        return 0.5 + 0.5 * sim, "telefono+nombre"
+    return 0.9 * sim, "nombre"
+
+
+class _Grupos:
+    """Union-find sobre ids."""
+
+    def __init__(self):
+        self.padre = {}
+
+    def raiz(self, x):
+        padre = self.padre
+        padre.setdefault(x, x)
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    def unir(self, a, b) -> None:
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra != rb:
+            self.padre[max(ra, rb)] = min(ra, rb)
+
+
+def detectar_duplicados(clientes, umbral: float = UMBRAL, max_bloque: int = MAX_BLOQUE) -> list:
+    """
+    Busca posibles clientes duplicados (misma persona cargada más de una vez).
+
+    1. Normaliza email (variantes de Gmail), teléfono y nombre.
+    2. Agrupa los registros por claves de bloqueo (email, últimos dígitos del
+       teléfono, prefijo del nombre) y solo compara pares dentro de un bloque.
+       Un email canónico repetido alcanza para unir sin comparar; los bloques
+       de más de `max_bloque` registros se parten por prefijo del nombre, y
+       si aun así no entran se omiten con una advertencia en el log (el
+       resultado puede quedar incompleto).
+    3. Une los pares con puntaje >= umbral en grupos.
+
+    Devuelve una lista de grupos candidatos a fusión, ordenada por el menor ID:
+    [{"ids": [...], "puntaje": float, "motivos": [...]}]
+    """
+    bloques = {}
+    for c in clientes:
+        nombre = normalizar_nombre(c.nombre)
+        registro = (
+            c.id,
+            nombre,
+            normalizar_email(c.email),
+            normalizar_telefono(c.telefono),
+            bigramas(nombre),
+        )
+        for clave in _claves_bloqueo(registro):
+            bloques.setdefault(clave, []).append(registro)
+
+    grupos = _Grupos()
+    puntajes = {}
+    motivos = {}
+
+    def registrar(a, b, puntaje, motivo):
+        grupos.unir(a, b)
+        for id_ in (a, b):
+            puntajes[id_] = max(puntajes.get(id_, 0.0), puntaje)
+            motivos.setdefault(id_, set()).add(motivo)
+
+    omitidos = []
+    for clave, registros in bloques.items():
+        if len(registros) < 2:
+            continue
+
+        if clave[0] == "email":
+            primero = registros[0][0]
+            for r in registros[1:]:
+                registrar(primero, r[0], 1.0, "email")
+            continue
+
+        for bloque in _partir_bloque(registros, max_bloque, omitidos):
+            for a, b in combinations(bloque, 2):
+                puntaje, motivo = _puntaje(a, b)
+                if puntaje >= umbral:
+                    registrar(a[0], b[0], puntaje, motivo)
+
+    if omitidos:
+        get_logger().warning(
+            f"Detección de duplicados incompleta: {len(omitidos)} bloques de más de {max_bloque} "
+            f"registros sin comparar ({sum(map(len, omitidos))} registros)"
+        )
+
+    por_raiz = {}
+    for id_ in puntajes:
+        por_raiz.setdefault(grupos.raiz(id_), []).append(id_)
+
+    resultado = []
+    for ids in por_raiz.values():
+        ids.sort()
+        resultado.append({
+            "ids": ids,
+            "puntaje": round(min(puntajes[i] for i in ids), 3),
+            "motivos": sorted(set().union(*(motivos[i] for i in ids))),
+        })
+    resultado.sort(key=lambda g: g["ids"][0])
+    return resultado
@@ -22,5 +22,9 @@ class ClienteNoEncontradoError(GICError):
     pass
 
 
+class CampoInvalidoError(GICError):
+    pass
+
+
 class ArchivoError(GICError):
     pass
@@ -0,0 +1,37 @@
+from .cliente_regular import ClienteRegular
+from .cliente_premium import ClientePremium
+from .cliente_corporativo import ClienteCorporativo
+
+
+def crear_cliente(tipo: str, id: int, nombre: str, email: str, telefono: str, direccion: str,
+                  nivel: str = None, empresa: str = None, contacto: str = None, validar: bool = True):
+    """
+    Construye el cliente del tipo indicado; por defecto, regular.
+    Con validar=False usa el constructor de confianza (crear_sin_validar):
+    solo para datos que ya pasaron la validación.
+    """
+    if tipo == "premium":
+        cls, extra = ClientePremium, {"nivel": nivel or "gold"}
+    elif tipo == "corporativo":
+        cls, extra = ClienteCorporativo, {"empresa": empresa, "contacto": contacto}
+    else:
+        cls, extra = ClienteRegular, {}
+
+    if validar:
+        return cls(id, nombre, email, telefono, direccion, **extra)
+    return cls.crear_sin_validar(id, nombre, email, telefono, direccion, **extra)
+
+
+def cliente_a_fila(c) -> tuple:
+    """
+    Valores del cliente en el orden de columnas del CSV:
+    tipo, id, nombre, email, telefono, direccion, nivel, empresa, contacto.
+    Los campos que no aplican al tipo van como None.
+    """
+    tipo = c.TIPO
+    return (
+        tipo, c.id, c.nombre, c.email, c.telefono, c.direccion,
+        c.nivel if tipo == "premium" else None,
+        c.empresa if tipo == "corporativo" else None,
+        c.contacto if tipo == "corporativo" else None,
+    )
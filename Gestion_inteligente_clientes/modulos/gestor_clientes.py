@@ -1,24 +1,176 @@
-from .excepciones import ClienteExistenteError, ClienteNoEncontradoError
+import threading
+from contextlib import nullcontext
+from functools import wraps
+from importlib import import_module
+from itertools import islice
+
+from .excepciones import ClienteExistenteError, ClienteNoEncontradoError, CampoInvalidoError
 from .logger_config import get_logger
+from .agregados import ContadoresClientes
+from .indices import IndicesClientes, normalizar_clave
+from .validaciones import (
+    validar_lote, MENSAJES_ERROR, validar_no_vacio, validar_email, validar_telefono, validar_direccion,
+)
+from .concurrencia import CerrojoLectoresEscritores
+from .metricas import medir, contar
+
+
+# Backends de almacenamiento seleccionables por nombre: (módulo, clase).
+# Se importan recién al elegirlos, así arrancar con uno no carga sqlite3,
+# mmap ni el módulo de archivos de los demás.
+ALMACENES = {
+    "memoria": (".almacen_memoria", "AlmacenMemoria"),
+    "columnar": (".almacen_columnar", "AlmacenColumnar"),
+    "sqlite": (".almacen_sqlite", "AlmacenSQLite"),
+    "bitacora": (".almacen_bitacora", "AlmacenBitacora"),
+    "mapeado": (".almacen_mapeado", "AlmacenMapeado"),
+}
+# Con estos los clientes siguen ahí en la próxima ejecución
+ALMACENES_PERSISTENTES = {"sqlite", "bitacora"}
+
+
+def clase_almacen(nombre: str):
+    """Clase del backend `nombre` de ALMACENES (KeyError si no existe)."""
+    modulo, clase = ALMACENES[nombre]
+    return getattr(import_module(modulo, __package__), clase)
+
+
+# Validador de cada campo editable: el mismo que aplica su setter (y con la
+# misma excepción), para revisar una actualización antes de tocar nada.
+_VALIDADORES = {
+    "nombre": lambda v: validar_no_vacio(v, "nombre"),
+    "email": validar_email,
+    "telefono": validar_telefono,
+    "direccion": validar_direccion,
+    "nivel": lambda v: validar_no_vacio(v, "nivel"),
+    "empresa": lambda v: validar_no_vacio(v, "empresa"),
+    "contacto": lambda v: validar_no_vacio(v, "contacto"),
+}
+
+
+def campos_no_editables(cliente, campos) -> list:
+    """Nombres de `campos` con valor que el cliente no permite modificar (None = no tocar)."""
+    return [k for k, v in campos.items() if v is not None and k not in cliente.CAMPOS_EDITABLES]
+
+
+def _lectura(metodo):
+    """En modo concurrente, el método corre con el cerrojo de lectura."""
+    @wraps(metodo)
+    def envuelto(self, *args, **kwargs):
+        if self._cerrojo is None:
+            return metodo(self, *args, **kwargs)
+        with self._cerrojo.lectura():
+            return metodo(self, *args, **kwargs)
+    return envuelto
+
+
+def _escritura(metodo):
+    """
+    En modo concurrente, el método corre con el cerrojo de escritura (así
+    chequeo de unicidad y alta son atómicos) e invalida la instantánea.
+    """
+    @wraps(metodo)
+    def envuelto(self, *args, **kwargs):
+        if self._cerrojo is None:
+            return metodo(self, *args, **kwargs)
+        with self._cerrojo.escritura():
+            try:
+                return metodo(self, *args, **kwargs)
+            finally:
+                self._version += 1
+    return envuelto
 
 
 class GestorClientes:
-    def __init__(self):
-        self._clientes = []
+    def __init__(self, almacen=None, concurrente: bool = False):
+        """
+        `almacen` puede ser el nombre de un backend de ALMACENES ("memoria" por
+        defecto, "columnar", "sqlite", "bitacora", "mapeado") o una instancia
+        ya construida, p. ej. AlmacenSQLite("otra/ruta.db").
+        Todos los backends mantienen índices hash por id y email: búsquedas y
+        chequeos de duplicados en O(1).
+
+        Con concurrente=True el gestor se puede usar desde varios hilos:
+        las escrituras toman un cerrojo exclusivo y las lecturas (búsquedas
+        incluidas) uno compartido. listar() e iterar()
+        devuelven una instantánea inmutable que se rearma solo después de un
+        cambio, así recorrerla no bloquea a los escritores.
+        """
+        if almacen is None or isinstance(almacen, str):
+            almacen = clase_almacen(almacen or "memoria")()
+        self._almacen = almacen
+        self._almacen.vincular(self)
         self._log = get_logger()
 
+        # Agregados incrementales: se recorren los datos una sola vez al inicio
+        self._contadores = ContadoresClientes(*self._almacen.conteos())
+
+        # Índices secundarios (nombre, empresa, nivel): se arman en la primera
+        # búsqueda y desde ahí se mantienen en cada alta, cambio y baja
+        self._indices = None
+        self._mutex_indices = threading.Lock()  # armado perezoso entre lectores
+
+        self._cerrojo = CerrojoLectoresEscritores() if concurrente else None
+        self._version = 0    # cambia con cada escritura (modo concurrente)
+        self._revision = 0   # cambia con cada alta, baja o cambio de datos
+        self._foto = None    # (version, tupla de clientes) para listar/iterar
+
+    @_escritura
+    def cerrar(self) -> None:
+        self._almacen.cerrar()
+
+    @property
+    def revision(self) -> int:
+        """
+        Número que cambia con cada alta, baja o modificación de un cliente
+        (no con las búsquedas). Sirve para invalidar lo que se calcule a
+        partir de la cartera, como el modelo de los reportes.
+        """
+        return self._revision
+
+    @medir("gestor.listar", len)
     def listar(self):
-        return list(self._clientes)
+        if self._cerrojo is not None:
+            return list(self._instantanea())
+        return list(self._almacen)
+
+    def iterar(self, tipo: str = None):
+        """
+        Recorre los clientes en orden de ID sin copiar la lista completa
+        (opcionalmente solo los de un tipo: regular, premium o corporativo).
+        En modo concurrente recorre la instantánea vigente.
+        """
+        if self._cerrojo is not None:
+            foto = self._instantanea()
+            return iter(foto) if tipo is None else (c for c in foto if c.TIPO == tipo)
+        return self._almacen.iterar_ordenado(tipo)
+
+    def _transaccion(self):
+        """Agrupa varias escrituras si el almacenamiento lo permite (SQLite, bitácora)."""
+        transaccion = getattr(self._almacen, "transaccion", None)
+        return transaccion() if transaccion is not None else nullcontext()
 
+    def _instantanea(self) -> tuple:
+        """Copia (copy-on-write) de los clientes en orden de ID; se reutiliza mientras no haya cambios."""
+        foto = self._foto
+        if foto is not None and foto[0] == self._version:
+            return foto[1]
+        with self._cerrojo.lectura():
+            # con el cerrojo de lectura ningún escritor puede cambiar la versión
+            version = self._version
+            clientes = tuple(self._almacen.iterar_ordenado())
+        self._foto = (version, clientes)
+        return clientes
+
+    @_lectura
     def existe_email(self, email: str, excluir_id: int = None) -> bool:
-        e = email.strip().lower()
-        for c in self._clientes:
-            if c.email == e and (excluir_id is None or c.id != excluir_id):
-                return True
-        return False
+        id_ = self._almacen.id_por_email(email.strip().lower())
+        return id_ is not None and (excluir_id is None or id_ != excluir_id)
 
+    @medir("gestor.agregar")
+    @_escritura
     def agregar(self, cliente):
-        if any(c.id == cliente.id for c in self._clientes):
+        if cliente.id in self._almacen:
             self._log.warning(f"Intento de alta duplicada por ID: {cliente.id}")
             raise ClienteExistenteError(f"Ya existe un cliente con ID {cliente.id}")
 
@@ -26,50 +178,254 @@ class GestorClientes:
             self._log.warning(f"Intento de alta duplicada por email: {cliente.email}")
             raise ClienteExistenteError(f"Ya existe un cliente con email {cliente.email}")
 
-        self._clientes.append(cliente)
+        self._almacen.agregar(cliente)
+        self._contadores.sumar(cliente)
+        self._revision += 1
+        if self._indices is not None:
+            self._indices.agregar(cliente)
+        cliente._gestor = self
         self._log.info(f"Alta cliente: {cliente.id} ({cliente.__class__.__name__})")
 
+    @medir("gestor.agregar_muchos", contar("aceptados", "rechazados"))
+    @_escritura
+    def agregar_muchos(self, clientes) -> dict:
+        """
+        Alta masiva en una sola pasada (O(N)): descarta duplicados por ID o
+        email, tanto contra los datos existentes como dentro del mismo lote,
+        y deja un único registro de resumen en el log.
+        Devuelve {"aceptados": [clientes], "rechazados": [{"cliente", "motivo"}]}.
+        """
+        aceptados = []
+        rechazados = []
+        ids_lote = set()
+        emails_lote = set()
+        almacen = self._almacen
+
+        for c in clientes:
+            if c.id in ids_lote or c.id in almacen:
+                rechazados.append({"cliente": c, "motivo": f"ID duplicado: {c.id}"})
+                continue
+            if c.email in emails_lote or almacen.id_por_email(c.email) is not None:
+                rechazados.append({"cliente": c, "motivo": f"Email duplicado: {c.email}"})
+                continue
+
+            ids_lote.add(c.id)
+            emails_lote.add(c.email)
+            aceptados.append(c)
+
+        almacen.agregar_lote(aceptados)
+        if aceptados:
+            self._revision += 1
+        for c in aceptados:
+            self._contadores.sumar(c)
+            if self._indices is not None:
+                self._indices.agregar(c)
+            c._gestor = self
+
+        self._log.info(f"Alta masiva: {len(aceptados)} aceptados, {len(rechazados)} rechazados")
+        return {"aceptados": aceptados, "rechazados": rechazados}
+
+    @medir("gestor.buscar_por_id")
+    @_lectura
     def buscar_por_id(self, id: int):
-        for c in self._clientes:
-            if c.id == int(id):
-                return c
-        raise ClienteNoEncontradoError(f"No existe cliente con ID {id}")
+        cliente = self._almacen.obtener(int(id))
+        if cliente is None:
+            raise ClienteNoEncontradoError(f"No existe cliente con ID {id}")
+        return cliente
 
+    @medir("gestor.actualizar")
+    @_escritura
     def actualizar(self, id: int, **campos):
+        """
+        Cambia los campos indicados (None = no tocar). Solo se aceptan los
+        CAMPOS_EDITABLES del tipo de cliente: cualquier otro nombre lanza
+        CampoInvalidoError sin modificar nada. Los valores se validan todos
+        antes de asignar el primero, así un valor inválido tampoco deja el
+        cambio a medias.
+        """
         cliente = self.buscar_por_id(id)
 
+        invalidos = campos_no_editables(cliente, campos)
+        if invalidos:
+            raise CampoInvalidoError(
+                f"Campos no editables para un cliente {cliente.TIPO}: {', '.join(invalidos)}"
+            )
+
         # prevenir email duplicado si se cambia
         if "email" in campos and campos["email"] is not None:
             if self.existe_email(campos["email"], excluir_id=cliente.id):
                 self._log.warning(f"Intento de actualización con email duplicado: {campos['email']}")
                 raise ClienteExistenteError(f"Ya existe un cliente con email {campos['email']}")
 
+        # Si un setter fallara a mitad de camino, la transacción deshace las
+        # filas pero no los contadores ni los índices de los campos previos
         for k, v in campos.items():
-            if v is None:
-                continue
-            if hasattr(cliente, k):
-                setattr(cliente, k, v)
-            else:
-                # ignoramos campos que no apliquen (o podrías lanzar error)
-                pass
+            if v is not None:
+                _VALIDADORES[k](v)
+
+        with self._transaccion():
+            for k, v in campos.items():
+                if v is not None:
+                    setattr(cliente, k, v)
 
         self._log.info(f"Actualización cliente: {cliente.id}")
         return cliente
 
+    @medir("gestor.actualizar_muchos", contar("actualizados", "rechazados"))
+    @_escritura
+    def actualizar_muchos(self, cambios) -> dict:
+        """
+        Actualización masiva: `cambios` es un iterable de dicts con "id" y los
+        campos a modificar (None = no tocar). Los valores se validan todos
+        juntos con validar_lote, sin una excepción por cada fila inválida, y
+        se deja un único registro de resumen en el log. Una fila con campos
+        que no son CAMPOS_EDITABLES de su cliente se rechaza entera.
+        Devuelve {"actualizados": [clientes], "rechazados": [{"id", "motivo"}]}.
+        """
+        actualizados = []
+        rechazados = []
+        pendientes = []
+
+        for cambio in cambios:
+            cliente = self._almacen.obtener(int(cambio["id"]))
+            if cliente is None:
+                rechazados.append({"id": cambio["id"], "motivo": f"No existe cliente con ID {cambio['id']}"})
+                continue
+            campos = {k: v for k, v in cambio.items() if k != "id" and v is not None}
+            invalidos = campos_no_editables(cliente, campos)
+            if invalidos:
+                rechazados.append({"id": cliente.id, "motivo": f"Campos no editables: {', '.join(invalidos)}"})
+                continue
+            fila = {k: v.strip() if isinstance(v, str) else v for k, v in campos.items()}
+            fila["tipo"] = cliente.TIPO
+            pendientes.append((cliente, fila))
+
+        codigos = validar_lote([fila for _, fila in pendientes], parcial=True)
+        emails_lote = set()
+
+        with self._transaccion():
+            for (cliente, fila), codigo in zip(pendientes, codigos):
+                if codigo is not None:
+                    rechazados.append({"id": cliente.id, "motivo": MENSAJES_ERROR[codigo]})
+                    continue
+
+                email = fila.get("email")
+                if email is not None:
+                    email = email.lower()
+                    if email in emails_lote or self.existe_email(email, excluir_id=cliente.id):
+                        rechazados.append({"id": cliente.id, "motivo": f"Email duplicado: {email}"})
+                        continue
+                    emails_lote.add(email)
+
+                for k, v in fila.items():
+                    if k != "tipo":
+                        setattr(cliente, k, v)
+                actualizados.append(cliente)
+
+        self._log.info(f"Actualización masiva: {len(actualizados)} actualizados, {len(rechazados)} rechazados")
+        return {"actualizados": actualizados, "rechazados": rechazados}
+
+    @medir("gestor.eliminar")
+    @_escritura
     def eliminar(self, id: int):
         cliente = self.buscar_por_id(id)
-        self._clientes.remove(cliente)
+        self._almacen.eliminar(cliente.id)
+        self._contadores.restar(cliente)
+        self._revision += 1
+        if self._indices is not None:
+            self._indices.quitar(cliente)
+        cliente._gestor = None
         self._log.info(f"Baja cliente: {id}")
 
+    @_escritura
+    def _al_cambiar(self, cliente, campo: str, valor) -> None:
+        """
+        Lo invoca un cliente dado de alta al modificar un campo (incluso si
+        se asigna directamente, sin pasar por actualizar()). Valida la
+        unicidad del email, ajusta contadores e índices, propaga el cambio al
+        almacenamiento y recién entonces asigna el atributo del cliente: todo
+        con el cerrojo de escritura, así dos hilos que cambian el mismo
+        cliente no parten del mismo valor anterior.
+        """
+        if valor == getattr(cliente, campo):
+            return
+
+        if campo == "email" and self.existe_email(valor, excluir_id=cliente.id):
+            self._log.warning(f"Intento de cambio a email duplicado: {valor}")
+            raise ClienteExistenteError(f"Ya existe un cliente con email {valor}")
+
+        self._almacen.actualizar_campo(cliente, campo, valor)
+        self._revision += 1
+        if campo == "nivel":
+            self._contadores.cambiar_nivel(cliente.nivel, valor)
+        if self._indices is not None:
+            self._indices.cambiar(cliente, campo, valor)
+        setattr(cliente, "_" + campo, valor)
+
+    def _indices_listos(self) -> IndicesClientes:
+        # Las búsquedas corren con el cerrojo de lectura: dos pueden llegar
+        # juntas a la primera, y solo una debe armar los índices
+        if self._indices is None:
+            with self._mutex_indices:
+                if self._indices is None:
+                    self._indices = IndicesClientes(self._almacen)
+        return self._indices
+
+    @medir("gestor.buscar", len)
+    @_lectura
+    def buscar(self, nombre: str = None, empresa: str = None, nivel: str = None,
+               offset: int = 0, limite: int = None) -> list:
+        """
+        Búsqueda por varios campos usando los índices secundarios:
+        - nombre: prefijo del nombre (sin distinguir mayúsculas)
+        - empresa: empresa exacta (clientes corporativos)
+        - nivel: nivel premium exacto (silver/gold/platinum)
+        Los criterios se combinan (AND). Con nombre, los resultados salen en
+        orden alfabético; si no, en orden de ID. offset/limite paginan.
+        """
+        indices = self._indices_listos()
+
+        candidatos = None
+        if empresa is not None:
+            candidatos = indices.empresa.ids(normalizar_clave(empresa))
+        if nivel is not None:
+            ids_nivel = indices.nivel.ids(nivel.strip().lower())
+            candidatos = ids_nivel if candidatos is None else candidatos & ids_nivel
+
+        if nombre is not None:
+            ids = indices.nombre.prefijo(normalizar_clave(nombre))
+            if candidatos is not None:
+                ids = (i for i in ids if i in candidatos)
+        elif candidatos is not None:
+            ids = sorted(candidatos)
+        else:
+            ids = (c.id for c in self._almacen.iterar_ordenado())
+
+        return self._pagina(ids, offset, limite)
+
+    @medir("gestor.buscar_por_rango_nombre", len)
+    @_lectura
+    def buscar_por_rango_nombre(self, desde: str, hasta: str, offset: int = 0, limite: int = None) -> list:
+        """Clientes con desde <= nombre < hasta (sin distinguir mayúsculas), en orden alfabético."""
+        ids = self._indices_listos().nombre.rango(normalizar_clave(desde), normalizar_clave(hasta))
+        return self._pagina(ids, offset, limite)
+
+    def _pagina(self, ids, offset: int, limite: int) -> list:
+        fin = None if limite is None else offset + limite
+        return [self._almacen.obtener(i) for i in islice(ids, offset, fin)]
+
+    @medir("gestor.agregados")
+    @_lectura
+    def agregados(self) -> dict:
+        """
+        Totales por tipo, distribución de premium por nivel y promedios de
+        beneficios. Sale de los contadores incrementales: O(1).
+        """
+        return self._contadores.agregados()
+
+    @medir("gestor.resumen_por_tipo")
+    @_lectura
     def resumen_por_tipo(self) -> dict:
-        resumen = {"regular": 0, "premium": 0, "corporativo": 0}
-        for c in self._clientes:
-            nombre = c.__class__.__name__.lower()
-            if "premium" in nombre:
-                resumen["premium"] += 1
-            elif "corporativo" in nombre:
-                resumen["corporativo"] += 1
-            else:
-                resumen["regular"] += 1
-        resumen["total"] = len(self._clientes)
+        resumen = dict(self._contadores.por_tipo)
+        resumen["total"] = sum(resumen.values())
         return resumen
@@ -0,0 +1,665 @@
+"""
+GestorClientes repartido en varios procesos (particiones por id).
+
+Cada partición es un proceso con su propio GestorClientes; el cliente con
+id N vive en la partición N % particiones. El proceso principal guarda el
+índice de ruteo email -> id de toda la cartera, así la unicidad del email
+es global y se chequea sin consultar a las particiones.
+
+Las operaciones sobre un cliente van solo a su partición; listar, iterar,
+buscar, los resúmenes y los reportes se envían a todas a la vez y se
+combinan (mezcla ordenada por id, o por nombre en las búsquedas por nombre;
+suma de contadores en los agregados).
+
+Entre procesos viajan filas (cliente_a_fila), no objetos: es bastante más
+barato de serializar. Los clientes que devuelve el gestor son copias: un
+cambio (actualizar() o asignar un campo) se envía a su partición, pero otras
+copias del mismo cliente obtenidas antes no se refrescan.
+
+Los procesos se crean con "spawn" (no heredan hilos ni cerrojos del
+principal, p. ej. el del logging) y sus registros de log llegan por una
+cola al logger del proceso principal.
+
+Con almacenamientos persistentes (sqlite, bitacora, mapeado) cada partición
+guarda sus datos en <carpeta>/particion_<i>/; la cantidad de particiones
+queda anotada en <carpeta>/particiones y no se puede cambiar después.
+"""
+import heapq
+import logging
+import multiprocessing
+import os
+import threading
+from bisect import bisect_right
+from contextlib import ExitStack
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from operator import attrgetter
+
+from .agregados import armar_agregados
+from .excepciones import GICError, ClienteExistenteError, ClienteNoEncontradoError
+from .fabrica_clientes import crear_cliente, cliente_a_fila
+from .gestor_clientes import GestorClientes, clase_almacen
+from .indices import normalizar_clave
+from .logger_config import NOMBRE_LOGGER, get_logger
+from .metricas import medir, contar
+
+
+PARTICIONES = 4
+LOTE_PAGINA = 10_000              # clientes por mensaje al recorrer una partición
+CARPETA_PARTICIONES = "datos/particiones"
+ESPERA_CIERRE = 10                # segundos antes de terminar un proceso que no cierra
+
+# archivo de cada backend persistente dentro de la carpeta de su partición
+# (None: el backend recibe la carpeta)
+ARCHIVOS_PERSISTENTES = {"sqlite": "clientes.db", "bitacora": None, "mapeado": "clientes.gicb"}
+
+_por_id = attrgetter("id")
+
+
+def _fila_id(fila: tuple) -> int:
+    return fila[1]
+
+
+def _por_nombre(cliente) -> tuple:
+    # mismo orden que el índice de nombres de GestorClientes: (clave, id)
+    return (normalizar_clave(cliente.nombre), cliente.id)
+
+
+# ---------------------------------------------------------------------------
+# Lado de cada proceso
+# ---------------------------------------------------------------------------
+
+def _crear_almacen(nombre: str, carpeta: str, indice: int):
+    """Backend de la partición: los persistentes en su propia carpeta."""
+    if nombre not in ARCHIVOS_PERSISTENTES:
+        return nombre
+    destino = os.path.join(carpeta, f"particion_{indice}")
+    os.makedirs(destino, exist_ok=True)
+    archivo = ARCHIVOS_PERSISTENTES[nombre]
+    if archivo is None:
+        return clase_almacen(nombre)(carpeta=destino)
+    return clase_almacen(nombre)(os.path.join(destino, archivo))
+
+
+class _Trabajador:
+    """
+    Operaciones que atiende una partición. Reciben y devuelven filas
+    (tuplas con el orden de cliente_a_fila) en vez de clientes.
+    """
+
+    def __init__(self, gestor: GestorClientes):
+        self.gestor = gestor
+        self._foto = None  # (revision, tupla de clientes en orden de id) para paginar
+
+    def agregar(self, fila: tuple) -> None:
+        self.gestor.agregar(crear_cliente(*fila, validar=False))
+
+    def agregar_muchos(self, filas: list) -> list:
+        """Devuelve los rechazados como [(id, motivo)]."""
+        if not filas:
+            return []
+        r = self.gestor.agregar_muchos([crear_cliente(*f, validar=False) for f in filas])
+        return [(x["cliente"].id, x["motivo"]) for x in r["rechazados"]]
+
+    def obtener(self, id: int) -> tuple:
+        return cliente_a_fila(self.gestor.buscar_por_id(id))
+
+    def actualizar(self, id: int, campos: dict) -> tuple:
+        """
+        (fila, email anterior, error). El error se devuelve en vez de lanzarse
+        porque actualizar() puede haber aplicado algunos campos antes de
+        fallar, y el proceso principal necesita el email vigente igual.
+        """
+        anterior = self.gestor.buscar_por_id(id).email
+        # La fila sale del cliente que devuelve actualizar() o de una lectura
+        # nueva: con sqlite, columnar o mapeado buscar_por_id da una copia que
+        # no ve los cambios hechos a través de otra.
+        try:
+            cliente = self.gestor.actualizar(id, **campos)
+        except Exception as e:
+            return cliente_a_fila(self.gestor.buscar_por_id(id)), anterior, e
+        return cliente_a_fila(cliente), anterior, None
+
+    def actualizar_muchos(self, cambios: list) -> dict:
+        if not cambios:
+            return {"actualizados": [], "rechazados": []}
+        anteriores = {}
+        for cambio in cambios:
+            try:
+                cliente = self.gestor.buscar_por_id(cambio["id"])
+            except ClienteNoEncontradoError:
+                continue
+            anteriores[cliente.id] = cliente.email
+        r = self.gestor.actualizar_muchos(cambios)
+        return {
+            "actualizados": [(cliente_a_fila(c), anteriores[c.id]) for c in r["actualizados"]],
+            "rechazados": r["rechazados"],
+        }
+
+    def cambiar(self, id: int, campo: str, valor):
+        """Asigna un campo (como hace un cliente dado de alta) y devuelve el valor anterior."""
+        cliente = self.gestor.buscar_por_id(id)
+        anterior = getattr(cliente, campo)
+        setattr(cliente, campo, valor)
+        return anterior
+
+    def eliminar(self, id: int) -> str:
+        email = self.gestor.buscar_por_id(id).email
+        self.gestor.eliminar(id)
+        return email
+
+    def pagina(self, tipo: str, desde: int, cantidad: int) -> list:
+        """Hasta `cantidad` filas con id > desde (desde=None: desde el principio), en orden de id."""
+        if self._foto is None or self._foto[0] != self.gestor.revision:
+            self._foto = (self.gestor.revision, tuple(self.gestor.iterar()))
+        foto = self._foto[1]
+        inicio = 0 if desde is None else bisect_right(foto, desde, key=_por_id)
+        clientes = islice(foto, inicio, None)
+        if tipo is not None:
+            clientes = (c for c in clientes if c.TIPO == tipo)
+        return [cliente_a_fila(c) for c in islice(clientes, cantidad)]
+
+    def buscar(self, nombre: str, empresa: str, nivel: str, limite: int) -> list:
+        encontrados = self.gestor.buscar(nombre=nombre, empresa=empresa, nivel=nivel, limite=limite)
+        return [cliente_a_fila(c) for c in encontrados]
+
+    def buscar_por_rango_nombre(self, desde: str, hasta: str, limite: int) -> list:
+        encontrados = self.gestor.buscar_por_rango_nombre(desde, hasta, limite=limite)
+        return [cliente_a_fila(c) for c in encontrados]
+
+    def conteos(self) -> tuple:
+        """Contadores crudos (por tipo, por nivel, suma de descuentos) para combinarlos sin perder precisión."""
+        c = self.gestor._contadores
+        return dict(c.por_tipo), dict(c.por_nivel), c.suma_descuento
+
+    def emails(self) -> list:
+        return [(c.email, c.id) for c in self.gestor.iterar()]
+
+
+def _trabajar(conexion, almacen: str, carpeta: str, indice: int, cola_log) -> None:
+    """Bucle de un proceso de partición: recibe (operación, args) y responde ("ok"|"error", valor)."""
+    logger = logging.getLogger(NOMBRE_LOGGER)
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueHandler(cola_log))
+
+    try:
+        gestor = GestorClientes(_crear_almacen(almacen, carpeta, indice))
+    except Exception as e:
+        conexion.send(("error", e))
+        return
+    conexion.send(("ok", None))
+
+    trabajador = _Trabajador(gestor)
+    while True:
+        try:
+            operacion, args = conexion.recv()
+        except (EOFError, OSError):
+            break  # el proceso principal terminó
+        if operacion == "cerrar":
+            gestor.cerrar()
+            conexion.send(("ok", None))
+            break
+        try:
+            respuesta = ("ok", getattr(trabajador, operacion)(*args))
+        except Exception as e:
+            respuesta = ("error", e)
+        try:
+            conexion.send(respuesta)
+        except Exception as e:
+            # p. ej. una excepción que no se puede serializar
+            conexion.send(("error", GICError(f"{type(e).__name__}: {e}")))
+
+
+# ---------------------------------------------------------------------------
+# Lado del proceso principal
+# ---------------------------------------------------------------------------
+
+class _AlLogger(logging.Handler):
+    """Reenvía al logger de la aplicación los registros que llegan de las particiones."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        get_logger().handle(record)
+
+
+class _Particion:
+    """Extremo del proceso principal: un pedido a la vez por partición (cerrojo)."""
+
+    def __init__(self, contexto, indice: int, almacen: str, carpeta: str, cola_log):
+        self.indice = indice
+        self.cerrojo = threading.Lock()
+        self._conexion, extremo = contexto.Pipe()
+        self._proceso = contexto.Process(
+            target=_trabajar, args=(extremo, almacen, carpeta, indice, cola_log),
+            name=f"gic-particion-{indice}", daemon=True,
+        )
+        self._proceso.start()
+        extremo.close()
+
+    def enviar(self, operacion: str, *args) -> None:
+        self._conexion.send((operacion, args))
+
+    def recibir(self):
+        try:
+            estado, valor = self._conexion.recv()
+        except (EOFError, OSError) as e:
+            raise GICError(f"La partición {self.indice} dejó de responder") from e
+        if estado == "error":
+            raise valor
+        return valor
+
+    def llamar(self, operacion: str, *args):
+        with self.cerrojo:
+            self.enviar(operacion, *args)
+            return self.recibir()
+
+    def cerrar(self) -> None:
+        try:
+            self.llamar("cerrar")
+        except (GICError, OSError):
+            pass
+        self._proceso.join(ESPERA_CIERRE)
+        if self._proceso.is_alive():
+            self._proceso.terminate()
+        self._conexion.close()
+
+
+class GestorParticionado:
+    def __init__(self, particiones: int = PARTICIONES, almacen: str = "memoria",
+                 carpeta: str = CARPETA_PARTICIONES):
+        """
+        Reparte los clientes por id en `particiones` procesos, cada uno con
+        un GestorClientes sobre el backend `almacen` (nombre de ALMACENES).
+        Misma interfaz que GestorClientes; se puede usar desde varios hilos.
+        """
+        if particiones < 1:
+            raise ValueError("Se necesita al menos una partición.")
+        if almacen in ARCHIVOS_PERSISTENTES:
+            self._anotar_particiones(carpeta, particiones)
+
+        self._log = get_logger()
+        self._cerrojo = threading.Lock()   # índice de emails y revisión
+        self._emails = {}                  # índice de ruteo: email -> id
+        self._revision = 0
+
+        contexto = multiprocessing.get_context("spawn")
+        self._cola_log = contexto.Queue()
+        self._oyente_log = QueueListener(self._cola_log, _AlLogger())
+        self._oyente_log.start()
+
+        self._particiones = [
+            _Particion(contexto, i, almacen, carpeta, self._cola_log) for i in range(particiones)
+        ]
+        try:
+            self._juntar(self._particiones)  # esperan a que cada gestor esté listo
+            # con datos guardados, el índice de ruteo se arma a partir de las particiones
+            for emails in self._difundir("emails"):
+                self._emails.update(emails)
+        except BaseException:
+            self.cerrar()
+            raise
+
+    @staticmethod
+    def _anotar_particiones(carpeta: str, particiones: int) -> None:
+        ruta = os.path.join(carpeta, "particiones")
+        if os.path.exists(ruta):
+            with open(ruta, "r", encoding="utf-8") as f:
+                anotadas = int(f.read().strip() or 0)
+            if anotadas != particiones:
+                raise GICError(
+                    f"{carpeta} tiene los clientes repartidos en {anotadas} particiones; "
+                    f"no se puede abrir con {particiones}."
+                )
+            return
+        os.makedirs(carpeta, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(f"{particiones}\n")
+
+    # ----- comunicación -----
+
+    @property
+    def particiones(self) -> int:
+        return len(self._particiones)
+
+    def _particion(self, id: int) -> _Particion:
+        return self._particiones[int(id) % len(self._particiones)]
+
+    def _juntar(self, particiones: list) -> list:
+        """
+        Respuesta de cada partición (ya enviado el pedido). Se leen todas
+        aunque alguna falle, para no dejar respuestas pendientes en el canal.
+        """
+        resultados = []
+        error = None
+        for p in particiones:
+            try:
+                resultados.append(p.recibir())
+            except Exception as e:
+                resultados.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return resultados
+
+    def _difundir(self, operacion: str, *args, argumentos: list = None) -> list:
+        """
+        Envía la operación a todas las particiones (trabajan en paralelo) y
+        devuelve sus respuestas en orden. `argumentos`, si se pasa, tiene los
+        argumentos de cada partición. Los cerrojos se toman siempre en el
+        mismo orden, así dos difusiones simultáneas no se bloquean entre sí.
+        """
+        with ExitStack() as pila:
+            for p in self._particiones:
+                pila.enter_context(p.cerrojo)
+            for i, p in enumerate(self._particiones):
+                p.enviar(operacion, *(args if argumentos is None else argumentos[i]))
+            return self._juntar(self._particiones)
+
+    def _cliente(self, fila: tuple):
+        cliente = crear_cliente(*fila, validar=False)
+        cliente._gestor = self
+        return cliente
+
+    def _clientes(self, filas: list) -> list:
+        return [self._cliente(f) for f in filas]
+
+    def _cambio_registrado(self) -> None:
+        with self._cerrojo:
+            self._revision += 1
+
+    # ----- índice de ruteo -----
+
+    def _reservar_email(self, email: str, id: int) -> bool:
+        """
+        Anota email -> id si el email está libre. Devuelve True si lo anotó
+        (hay que liberarlo si la partición rechaza el cambio) y False si ya
+        era de ese cliente; si es de otro, ClienteExistenteError.
+        """
+        with self._cerrojo:
+            actual = self._emails.get(email)
+            if actual is not None and actual != id:
+                raise ClienteExistenteError(f"Ya existe un cliente con email {email}")
+            if actual is None:
+                self._emails[email] = id
+                return True
+            return False
+
+    def _liberar_email(self, email: str, id: int) -> None:
+        with self._cerrojo:
+            if self._emails.get(email) == id:
+                del self._emails[email]
+
+    def _mover_email(self, anterior: str, actual: str, id: int) -> None:
+        with self._cerrojo:
+            if anterior != actual and self._emails.get(anterior) == id:
+                del self._emails[anterior]
+            self._emails[actual] = id
+
+    # ----- interfaz de GestorClientes -----
+
+    def cerrar(self) -> None:
+        particiones, self._particiones = self._particiones, []
+        for p in particiones:
+            p.cerrar()
+        if self._oyente_log is not None:
+            self._oyente_log.stop()
+            self._oyente_log = None
+
+    @property
+    def revision(self) -> int:
+        """Cambia con cada alta, baja o modificación hecha a través de este gestor."""
+        return self._revision
+
+    @medir("gestor.listar", len)
+    def listar(self):
+        return list(self.iterar())
+
+    def iterar(self, tipo: str = None):
+        """
+        Recorre los clientes en orden de ID mezclando las particiones, que se
+        leen de a LOTE_PAGINA (opcionalmente solo los de un tipo).
+        """
+        return heapq.merge(*(self._recorrer(p, tipo) for p in self._particiones), key=_por_id)
+
+    def _recorrer(self, particion: _Particion, tipo: str):
+        desde = None
+        while True:
+            filas = particion.llamar("pagina", tipo, desde, LOTE_PAGINA)
+            yield from self._clientes(filas)
+            if len(filas) < LOTE_PAGINA:
+                return
+            desde = _fila_id(filas[-1])
+
+    def existe_email(self, email: str, excluir_id: int = None) -> bool:
+        id_ = self._emails.get(email.strip().lower())
+        return id_ is not None and (excluir_id is None or id_ != excluir_id)
+
+    @medir("gestor.agregar")
+    def agregar(self, cliente):
+        try:
+            reservado = self._reservar_email(cliente.email, cliente.id)
+        except ClienteExistenteError:
+            self._log.warning(f"Intento de alta duplicada por email: {cliente.email}")
+            raise
+
+        try:
+            self._particion(cliente.id).llamar("agregar", cliente_a_fila(cliente))
+        except Exception:
+            if reservado:
+                self._liberar_email(cliente.email, cliente.id)
+            raise
+        cliente._gestor = self
+        self._cambio_registrado()
+
+    @medir("gestor.agregar_muchos", contar("aceptados", "rechazados"))
+    def agregar_muchos(self, clientes) -> dict:
+        """
+        Alta masiva: los duplicados por email (contra la cartera y dentro del
+        lote) y por ID dentro del lote se descartan aquí; cada partición
+        descarta los IDs que ya tenía. Las particiones trabajan en paralelo.
+        Devuelve {"aceptados": [clientes], "rechazados": [{"cliente", "motivo"}]}.
+        """
+        rechazados = []
+        candidatos = []
+        ids_lote = set()
+        filas = [[] for _ in self._particiones]
+        n = len(self._particiones)
+
+        with self._cerrojo:
+            for c in clientes:
+                if c.id in ids_lote:
+                    rechazados.append({"cliente": c, "motivo": f"ID duplicado: {c.id}"})
+                    continue
+                if c.email in self._emails:
+                    rechazados.append({"cliente": c, "motivo": f"Email duplicado: {c.email}"})
+                    continue
+                ids_lote.add(c.id)
+                self._emails[c.email] = c.id
+                candidatos.append(c)
+                filas[c.id % n].append(cliente_a_fila(c))
+
+        try:
+            respuestas = self._difundir("agregar_muchos", argumentos=[(f,) for f in filas])
+        except Exception:
+            for c in candidatos:
+                self._liberar_email(c.email, c.id)
+            raise
+
+        motivos = {id_: motivo for rechazos in respuestas for id_, motivo in rechazos}
+        aceptados = []
+        for c in candidatos:
+            motivo = motivos.get(c.id)
+            if motivo is None:
+                c._gestor = self
+                aceptados.append(c)
+            else:
+                self._liberar_email(c.email, c.id)
+                rechazados.append({"cliente": c, "motivo": motivo})
+        if aceptados:
+            self._cambio_registrado()
+
+        self._log.info(f"Alta masiva: {len(aceptados)} aceptados, {len(rechazados)} rechazados")
+        return {"aceptados": aceptados, "rechazados": rechazados}
+
+    @medir("gestor.buscar_por_id")
+    def buscar_por_id(self, id: int):
+        return self._cliente(self._particion(id).llamar("obtener", int(id)))
+
+    @medir("gestor.actualizar")
+    def actualizar(self, id: int, **campos):
+        id = int(id)
+        email = campos.get("email")
+        reservado = False
+        if email is not None:
+            email = email.strip().lower()
+            try:
+                reservado = self._reservar_email(email, id)
+            except ClienteExistenteError:
+                self._log.warning(f"Intento de actualización con email duplicado: {email}")
+                raise
+
+        try:
+            fila, anterior, error = self._particion(id).llamar("actualizar", id, campos)
+        except Exception:
+            if reservado:
+                self._liberar_email(email, id)
+            raise
+
+        # aunque haya fallado, algunos campos pueden haber cambiado (email incluido)
+        actual = fila[3]
+        if actual != anterior:
+            self._mover_email(anterior, actual, id)
+        if reservado and actual != email:
+            self._liberar_email(email, id)
+        self._cambio_registrado()
+        if error is not None:
+            raise error
+        return self._cliente(fila)
+
+    @medir("gestor.actualizar_muchos", contar("actualizados", "rechazados"))
+    def actualizar_muchos(self, cambios) -> dict:
+        """
+        Actualización masiva repartida por partición (en paralelo). Los emails
+        nuevos se reservan antes en el índice de ruteo: un email que ya es de
+        otro cliente, o que se repite en el lote, se rechaza aquí.
+        Devuelve {"actualizados": [clientes], "rechazados": [{"id", "motivo"}]}.
+        """
+        rechazados = []
+        reservas = {}  # id -> email reservado
+        por_particion = [[] for _ in self._particiones]
+        n = len(self._particiones)
+
+        with self._cerrojo:
+            for cambio in cambios:
+                id_ = int(cambio["id"])
+                email = cambio.get("email")
+                if isinstance(email, str):
+                    email = email.strip().lower()
+                    actual = self._emails.get(email)
+                    if actual is not None and actual != id_:
+                        rechazados.append({"id": cambio["id"], "motivo": f"Email duplicado: {email}"})
+                        continue
+                    if actual is None:
+                        self._emails[email] = id_
+                        reservas[id_] = email
+                por_particion[id_ % n].append(cambio)
+
+        try:
+            respuestas = self._difundir("actualizar_muchos", argumentos=[(c,) for c in por_particion])
+        except Exception:
+            for id_, email in reservas.items():
+                self._liberar_email(email, id_)
+            raise
+
+        actualizados = []
+        for r in respuestas:
+            for fila, anterior in r["actualizados"]:
+                id_ = _fila_id(fila)
+                if fila[3] != anterior:
+                    self._mover_email(anterior, fila[3], id_)
+                reservas.pop(id_, None)
+                actualizados.append(self._cliente(fila))
+            rechazados.extend(r["rechazados"])
+        for id_, email in reservas.items():
+            self._liberar_email(email, id_)
+        if actualizados:
+            self._cambio_registrado()
+
+        self._log.info(f"Actualización masiva: {len(actualizados)} actualizados, {len(rechazados)} rechazados")
+        return {"actualizados": actualizados, "rechazados": rechazados}
+
+    @medir("gestor.eliminar")
+    def eliminar(self, id: int):
+        id = int(id)
+        email = self._particion(id).llamar("eliminar", id)
+        self._liberar_email(email, id)
+        self._cambio_registrado()
+
+    def _al_cambiar(self, cliente, campo: str, valor) -> None:
+        """
+        Lo invoca una copia de un cliente de este gestor al modificar un
+        campo: el cambio se aplica en su partición (con el email reservado
+        antes en el índice de ruteo) y después en la copia.
+        """
+        if valor == getattr(cliente, campo):
+            return
+
+        reservado = False
+        if campo == "email":
+            try:
+                reservado = self._reservar_email(valor, cliente.id)
+            except ClienteExistenteError:
+                self._log.warning(f"Intento de cambio a email duplicado: {valor}")
+                raise
+
+        try:
+            anterior = self._particion(cliente.id).llamar("cambiar", cliente.id, campo, valor)
+        except Exception:
+            if reservado:
+                self._liberar_email(valor, cliente.id)
+            raise
+        if campo == "email":
+            self._mover_email(anterior, valor, cliente.id)
+        setattr(cliente, "_" + campo, valor)
+        self._cambio_registrado()
+
+    @medir("gestor.buscar", len)
+    def buscar(self, nombre: str = None, empresa: str = None, nivel: str = None,
+               offset: int = 0, limite: int = None) -> list:
+        """
+        Igual que GestorClientes.buscar: cada partición devuelve sus primeros
+        offset + limite resultados y se mezclan en el mismo orden (alfabético
+        con nombre, si no por ID) antes de paginar.
+        """
+        fin = None if limite is None else offset + limite
+        respuestas = self._difundir("buscar", nombre, empresa, nivel, fin)
+        clave = _por_id if nombre is None else _por_nombre
+        mezcla = heapq.merge(*(self._clientes(filas) for filas in respuestas), key=clave)
+        return list(islice(mezcla, offset, fin))
+
+    @medir("gestor.buscar_por_rango_nombre", len)
+    def buscar_por_rango_nombre(self, desde: str, hasta: str, offset: int = 0, limite: int = None) -> list:
+        fin = None if limite is None else offset + limite
+        respuestas = self._difundir("buscar_por_rango_nombre", desde, hasta, fin)
+        mezcla = heapq.merge(*(self._clientes(filas) for filas in respuestas), key=_por_nombre)
+        return list(islice(mezcla, offset, fin))
+
+    def _conteos(self) -> tuple:
+        por_tipo, por_nivel, suma_descuento = {}, {}, 0
+        for tipos, niveles, suma in self._difundir("conteos"):
+            for t, n in tipos.items():
+                por_tipo[t] = por_tipo.get(t, 0) + n
+            for nivel, n in niveles.items():
+                por_nivel[nivel] = por_nivel.get(nivel, 0) + n
+            suma_descuento += suma
+        return por_tipo, por_nivel, suma_descuento
+
+    @medir("gestor.agregados")
+    def agregados(self) -> dict:
+        """Agregados de toda la cartera: se suman los contadores de cada partición."""
+        return armar_agregados(*self._conteos())
+
+    @medir("gestor.resumen_por_tipo")
+    def resumen_por_tipo(self) -> dict:
+        resumen = dict(self._conteos()[0])
+        resumen["total"] = sum(resumen.values())
+        return resumen
@@ -0,0 +1,127 @@
+import threading
+from bisect import bisect_left
+
+
+def normalizar_clave(valor: str) -> str:
+    """Clave de búsqueda: sin espacios extremos y sin distinguir mayúsculas."""
+    return valor.strip().casefold()
+
+
+class IndiceHash:
+    """Índice secundario por igualdad: clave -> conjunto de ids."""
+
+    def __init__(self):
+        self._ids = {}
+
+    def agregar(self, clave: str, id: int) -> None:
+        self._ids.setdefault(clave, set()).add(id)
+
+    def quitar(self, clave: str, id: int) -> None:
+        ids = self._ids.get(clave)
+        if ids is not None:
+            ids.discard(id)
+            if not ids:
+                del self._ids[clave]
+
+    def ids(self, clave: str) -> set:
+        return self._ids.get(clave, set())
+
+
+class IndiceOrdenado:
+    """
+    Índice secundario ordenado de pares (clave, id) para búsquedas por
+    prefijo y por rango.
+
+    Altas y bajas no reordenan en el momento (eso haría O(N) cada alta en una
+    importación masiva): se acumulan y se consolidan en la próxima consulta.
+    Varias consultas pueden correr a la vez (el gestor las deja pasar con el
+    cerrojo de lectura), así que la consolidación tiene su propio mutex.
+    """
+
+    def __init__(self):
+        self._pares = []        # ordenados
+        self._nuevos = []       # pendientes de mezclar
+        self._borrados = set()  # pendientes de quitar
+        self._mutex = threading.Lock()
+
+    def agregar(self, clave: str, id: int) -> None:
+        par = (clave, id)
+        if par in self._borrados:
+            # se había quitado y todavía no se consolidó: sigue en su lugar
+            self._borrados.discard(par)
+        else:
+            self._nuevos.append(par)
+
+    def quitar(self, clave: str, id: int) -> None:
+        self._borrados.add((clave, id))
+
+    def _consolidar(self) -> None:
+        if not (self._borrados or self._nuevos):
+            return
+        with self._mutex:
+            if self._borrados:
+                borrados = self._borrados
+                self._pares = [p for p in self._pares if p not in borrados]
+                self._nuevos = [p for p in self._nuevos if p not in borrados]
+                self._borrados = set()
+            if self._nuevos:
+                # timsort aprovecha los dos tramos ya ordenados
+                self._nuevos.sort()
+                self._pares.extend(self._nuevos)
+                self._pares.sort()
+                self._nuevos = []
+
+    def prefijo(self, prefijo: str):
+        """Ids cuya clave empieza con `prefijo`, en orden de clave."""
+        self._consolidar()
+        pares = self._pares
+        i = bisect_left(pares, (prefijo,))
+        while i < len(pares) and pares[i][0].startswith(prefijo):
+            yield pares[i][1]
+            i += 1
+
+    def rango(self, desde: str, hasta: str):
+        """Ids con desde <= clave < hasta, en orden de clave."""
+        self._consolidar()
+        pares = self._pares
+        i = bisect_left(pares, (desde,))
+        fin = bisect_left(pares, (hasta,))
+        for j in range(i, fin):
+            yield pares[j][1]
+
+
+class IndicesClientes:
+    """Índices secundarios del gestor: nombre (ordenado), empresa y nivel (hash)."""
+
+    def __init__(self, clientes=()):
+        self.nombre = IndiceOrdenado()
+        self.empresa = IndiceHash()
+        self.nivel = IndiceHash()
+        for c in clientes:
+            self.agregar(c)
+
+    def agregar(self, c) -> None:
+        self.nombre.agregar(normalizar_clave(c.nombre), c.id)
+        if c.TIPO == "corporativo":
+            self.empresa.agregar(normalizar_clave(c.empresa), c.id)
+        elif c.TIPO == "premium":
+            self.nivel.agregar(c.nivel, c.id)
+
+    def quitar(self, c) -> None:
+        self.nombre.quitar(normalizar_clave(c.nombre), c.id)
+        if c.TIPO == "corporativo":
+            self.empresa.quitar(normalizar_clave(c.empresa), c.id)
+        elif c.TIPO == "premium":
+            self.nivel.quitar(c.nivel, c.id)
+
+    def cambiar(self, c, campo: str, valor: str) -> None:
+        """Se llama antes de asignar: `c` todavía tiene el valor anterior."""
+        if campo == "nombre":
+            self.nombre.quitar(normalizar_clave(c.nombre), c.id)
+            self.nombre.agregar(normalizar_clave(valor), c.id)
+        elif campo == "empresa":
+            self.empresa.quitar(normalizar_clave(c.empresa), c.id)
+            self.empresa.agregar(normalizar_clave(valor), c.id)
+        elif campo == "nivel":
+            self.nivel.quitar(c.nivel, c.id)
+            self.nivel.agregar(valor, c.id)
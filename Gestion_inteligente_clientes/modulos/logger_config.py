@@ -1,19 +1,135 @@
+import atexit
+import json
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 
-def get_logger() -> logging.Logger:
-    os.makedirs("logs", exist_ok=True)
+NOMBRE_LOGGER = "gic"
+RUTA_LOG = "logs/app.log"
+MAX_BYTES = 5 * 1024 * 1024  # rotación por tamaño
+RESPALDOS = 3                # app.log.1 ... app.log.3
+LOTE = 100                   # registros por flush al disco
+FORMATO = "%(asctime)s | %(levelname)s | %(message)s"
+
+_oyente = None  # QueueListener activo (modo asíncrono)
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por registro (fácil de procesar con otras herramientas)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": self.formatTime(record),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False)
+
+
+class _ArchivoPorLotes(RotatingFileHandler):
+    """
+    RotatingFileHandler que baja al disco cada `lote` registros en vez de
+    en cada uno; el oyente de la cola además vacía el buffer cuando la cola
+    queda vacía, así nada queda retenido mientras no hay actividad.
+    """
+
+    def __init__(self, *args, lote: int = LOTE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lote = lote
+        self._pendientes = 0
+
+    def flush(self) -> None:
+        # StreamHandler.emit llama a flush() después de cada registro
+        self._pendientes += 1
+        if self._pendientes >= self.lote:
+            self.vaciar()
+
+    def vaciar(self) -> None:
+        self._pendientes = 0
+        super().flush()
+
+    def close(self) -> None:
+        self.vaciar()
+        super().close()
+
+
+class _OyenteCola(QueueListener):
+    def dequeue(self, block: bool):
+        if block and self.queue.empty():
+            # la cola se vació: bajar lo acumulado antes de esperar
+            for h in self.handlers:
+                getattr(h, "vaciar", h.flush)()
+        return self.queue.get(block)
+
 
-    logger = logging.getLogger("gic")
+def configurar_logging(ruta: str = RUTA_LOG, asincrono: bool = True, formato_json: bool = False,
+                       max_bytes: int = MAX_BYTES, respaldos: int = RESPALDOS, lote: int = LOTE,
+                       nivel: int = logging.INFO) -> logging.Logger:
+    """
+    Configura el logger "gic" una sola vez (al inicio del programa); las
+    llamadas siguientes devuelven el logger ya configurado.
+
+    - asincrono: los registros van a una cola (QueueHandler) y un hilo aparte
+      (QueueListener) los escribe, así el disco no frena altas y cambios.
+    - lote: registros por flush al disco (modo asíncrono).
+    - max_bytes / respaldos: rotación del archivo por tamaño.
+    - formato_json: una línea JSON por registro en vez de texto.
+    """
+    global _oyente
+
+    logger = logging.getLogger(NOMBRE_LOGGER)
     if logger.handlers:
         return logger  # ya configurado
 
-    logger.setLevel(logging.INFO)
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+
+    logger.setLevel(nivel)
+    fmt = FormatoJSON() if formato_json else logging.Formatter(FORMATO)
+
+    if not asincrono:
+        fh = RotatingFileHandler(ruta, maxBytes=max_bytes, backupCount=respaldos, encoding="utf-8")
+        fh.setFormatter(fmt)
+        logger.addHandler(fh)
+        return logger
 
-    fh = logging.FileHandler("logs/app.log", encoding="utf-8")
-    fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+    fh = _ArchivoPorLotes(ruta, maxBytes=max_bytes, backupCount=respaldos, encoding="utf-8", lote=lote)
     fh.setFormatter(fmt)
+    cola = queue.SimpleQueue()
+    _oyente = _OyenteCola(cola, fh)
+    _oyente.start()
+    logger.addHandler(QueueHandler(cola))
+    return logger
+
+
+def detener_logging() -> None:
+    """Vacía la cola, cierra los archivos y quita los handlers del logger."""
+    global _oyente
 
-    logger.addHandler(fh)
+    if _oyente is not None:
+        _oyente.stop()
+        for h in _oyente.handlers:
+            h.close()
+        _oyente = None
+
+    logger = logging.getLogger(NOMBRE_LOGGER)
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
+
+atexit.register(detener_logging)
+
+
+def get_logger() -> logging.Logger:
+    """Logger de la aplicación; si nadie lo configuró, usa la configuración por defecto."""
+    logger = logging.getLogger(NOMBRE_LOGGER)
+    if not logger.handlers:
+        configurar_logging()
     return logger
@@ -0,0 +1,326 @@
+"""
+Instrumentación opcional de GestorClientes y archivos, y captura de perfiles.
+
+Métricas: las operaciones de GestorClientes y GestorParticionado y las
+funciones de importación/exportación/reporte (archivos, reportes) llevan el
+decorador medir(), que mientras las métricas están activas (activar() /
+desactivar()) registra llamadas, errores, histograma de latencia y filas
+procesadas por operación. Como se instrumenta donde se definen, no importa
+el orden de importación de los módulos que las usan. El resultado sale
+como dict (instantanea) o en texto de Prometheus.
+
+Perfiles: iniciar_perfil("cpu") usa cProfile (solo mide el hilo que lo
+inicia) e iniciar_perfil("memoria") usa tracemalloc; detener_perfil() deja
+un resumen legible en perfiles/ (y el .prof de cProfile para pstats o
+snakeviz). Un perfil que sigue activo al salir del programa se guarda solo.
+
+Variables de entorno (ver configurar_desde_entorno):
+    GIC_METRICAS=1           activa las métricas al iniciar
+    GIC_PERFIL=cpu|memoria   captura un perfil de toda la ejecución
+"""
+import atexit
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from functools import wraps
+
+from .excepciones import GICError
+
+
+# Límites superiores (segundos) de los baldes del histograma de latencia
+LIMITES_LATENCIA = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0,
+)
+PERCENTILES = (50, 90, 99)
+PREFIJO_PROMETHEUS = "gic"
+
+CARPETA_PERFILES = "perfiles"
+LINEAS_PERFIL = 30          # funciones / líneas en el resumen de texto
+MODOS_PERFIL = ("cpu", "memoria")
+
+ENV_METRICAS = "GIC_METRICAS"
+ENV_PERFIL = "GIC_PERFIL"
+
+
+# ---------------------------------------------------------------------------
+# Registro de métricas
+# ---------------------------------------------------------------------------
+
+class _Serie:
+    __slots__ = ("llamadas", "errores", "segundos", "maximo", "filas", "baldes")
+
+    def __init__(self, n_baldes: int):
+        self.llamadas = 0
+        self.errores = 0
+        self.segundos = 0.0
+        self.maximo = 0.0
+        self.filas = 0
+        self.baldes = [0] * n_baldes  # el último es +Inf
+
+
+class Metricas:
+    """Contadores e histogramas por operación; se puede usar desde varios hilos."""
+
+    def __init__(self, limites: tuple = LIMITES_LATENCIA):
+        self.limites = tuple(limites)
+        self._series = {}
+        self._cerrojo = threading.Lock()
+
+    def registrar(self, operacion: str, segundos: float, filas: int = None, error: bool = False) -> None:
+        balde = bisect_left(self.limites, segundos)
+        with self._cerrojo:
+            s = self._series.get(operacion)
+            if s is None:
+                s = self._series[operacion] = _Serie(len(self.limites) + 1)
+            s.llamadas += 1
+            s.segundos += segundos
+            s.baldes[balde] += 1
+            if segundos > s.maximo:
+                s.maximo = segundos
+            if error:
+                s.errores += 1
+            if filas:
+                s.filas += filas
+
+    def reiniciar(self) -> None:
+        with self._cerrojo:
+            self._series.clear()
+
+    def _copia(self) -> dict:
+        with self._cerrojo:
+            return {
+                op: (s.llamadas, s.errores, s.segundos, s.maximo, s.filas, list(s.baldes))
+                for op, s in sorted(self._series.items())
+            }
+
+    def _percentil(self, baldes: list, llamadas: int, maximo: float, p: int) -> float:
+        """Cota superior del percentil según el histograma (el máximo si cae en +Inf)."""
+        objetivo = llamadas * p / 100
+        acumulado = 0
+        for limite, n in zip(self.limites, baldes):
+            acumulado += n
+            if acumulado >= objetivo:
+                return min(limite, maximo)
+        return maximo
+
+    def instantanea(self) -> dict:
+        """
+        {operacion: {llamadas, errores, segundos_total, segundos_promedio,
+        segundos_max, p50, p90, p99, filas, filas_por_segundo, histograma}}.
+        Los percentiles son cotas superiores (límite del balde); el
+        histograma es acumulado, como en Prometheus ({"0.001": n, ..., "+Inf": n}).
+        """
+        resultado = {}
+        for op, (llamadas, errores, segundos, maximo, filas, baldes) in self._copia().items():
+            acumulado = 0
+            histograma = {}
+            for limite, n in zip(self.limites + (None,), baldes):
+                acumulado += n
+                histograma["+Inf" if limite is None else repr(limite)] = acumulado
+
+            resultado[op] = {
+                "llamadas": llamadas,
+                "errores": errores,
+                "segundos_total": segundos,
+                "segundos_promedio": segundos / llamadas,
+                "segundos_max": maximo,
+                **{f"p{p}": self._percentil(baldes, llamadas, maximo, p) for p in PERCENTILES},
+                "filas": filas,
+                "filas_por_segundo": filas / segundos if filas and segundos > 0 else None,
+                "histograma": histograma,
+            }
+        return resultado
+
+    def a_prometheus(self, prefijo: str = PREFIJO_PROMETHEUS) -> str:
+        """Formato de exposición de texto de Prometheus (versión 0.0.4)."""
+        copia = self._copia()
+        lineas = []
+
+        def serie(nombre: str, tipo: str, ayuda: str, valores) -> None:
+            lineas.append(f"# HELP {prefijo}_{nombre} {ayuda}")
+            lineas.append(f"# TYPE {prefijo}_{nombre} {tipo}")
+            lineas.extend(valores)
+
+        def etiqueta(op: str) -> str:
+            return op.replace("\\", "\\\\").replace('"', '\\"')
+
+        serie("operaciones_total", "counter", "Llamadas por operación.",
+              [f'{prefijo}_operaciones_total{{operacion="{etiqueta(op)}"}} {v[0]}' for op, v in copia.items()])
+        serie("errores_total", "counter", "Llamadas que terminaron con una excepción.",
+              [f'{prefijo}_errores_total{{operacion="{etiqueta(op)}"}} {v[1]}' for op, v in copia.items()])
+        serie("filas_total", "counter", "Filas o clientes procesados por operación.",
+              [f'{prefijo}_filas_total{{operacion="{etiqueta(op)}"}} {v[4]}' for op, v in copia.items()])
+
+        histogramas = []
+        for op, (llamadas, _, segundos, _, _, baldes) in copia.items():
+            acumulado = 0
+            for limite, n in zip(self.limites + (None,), baldes):
+                acumulado += n
+                le = "+Inf" if limite is None else repr(limite)
+                histogramas.append(f'{prefijo}_duracion_segundos_bucket{{operacion="{etiqueta(op)}",le="{le}"}} {acumulado}')
+            histogramas.append(f'{prefijo}_duracion_segundos_sum{{operacion="{etiqueta(op)}"}} {segundos!r}')
+            histogramas.append(f'{prefijo}_duracion_segundos_count{{operacion="{etiqueta(op)}"}} {llamadas}')
+        serie("duracion_segundos", "histogram", "Latencia por operación.", histogramas)
+
+        return "\n".join(lineas) + "\n"
+
+
+METRICAS = Metricas()
+
+
+# ---------------------------------------------------------------------------
+# Instrumentación
+# ---------------------------------------------------------------------------
+
+_activas = False
+
+
+def contar(*claves):
+    """filas(resultado) para medir(): suma los largos (o valores) de esas claves del dict resultado."""
+    return lambda r: sum(len(r[k]) if isinstance(r[k], list) else r[k] for k in claves)
+
+
+def medir(operacion: str, filas=None):
+    """
+    Decorador para las operaciones a medir, aplicado donde se definen
+    (GestorClientes, GestorParticionado, archivos, reportes): mientras las
+    métricas están activas registra latencia, errores y filas(resultado)
+    bajo `operacion`; apagadas, cada llamada solo consulta una variable.
+    """
+    def decorar(funcion):
+        @wraps(funcion)
+        def envuelto(*args, **kwargs):
+            if not _activas:
+                return funcion(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                resultado = funcion(*args, **kwargs)
+            except BaseException:
+                METRICAS.registrar(operacion, time.perf_counter() - t0, error=True)
+                raise
+            METRICAS.registrar(operacion, time.perf_counter() - t0, filas(resultado) if filas else None)
+            return resultado
+        return envuelto
+    return decorar
+
+
+def activar() -> None:
+    """Empieza a registrar las operaciones decoradas con medir()."""
+    global _activas
+    _activas = True
+
+
+def desactivar() -> None:
+    """Deja de registrar (los valores registrados se conservan)."""
+    global _activas
+    _activas = False
+
+
+def activas() -> bool:
+    return _activas
+
+
+def instantanea() -> dict:
+    return METRICAS.instantanea()
+
+
+def a_prometheus() -> str:
+    return METRICAS.a_prometheus()
+
+
+def reiniciar() -> None:
+    METRICAS.reiniciar()
+
+
+# ---------------------------------------------------------------------------
+# Captura de perfiles
+# ---------------------------------------------------------------------------
+
+_perfil = None  # (modo, perfilador o None, inicio)
+
+
+def perfil_activo():
+    """Modo del perfil en curso ("cpu" / "memoria") o None."""
+    return _perfil[0] if _perfil is not None else None
+
+
+def iniciar_perfil(modo: str = "cpu") -> None:
+    global _perfil
+
+    if modo not in MODOS_PERFIL:
+        raise GICError(f"Modo de perfil desconocido: {modo!r} (usa {' o '.join(MODOS_PERFIL)})")
+    if _perfil is not None:
+        raise GICError(f"Ya hay un perfil de {_perfil[0]} en curso.")
+
+    # cProfile, pstats y tracemalloc se cargan solo al perfilar
+    if modo == "cpu":
+        import cProfile
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+    else:
+        import tracemalloc
+        perfilador = None
+        tracemalloc.start(25)
+    _perfil = (modo, perfilador, datetime.now())
+
+
+def detener_perfil(carpeta: str = CARPETA_PERFILES) -> str:
+    """Termina el perfil en curso, guarda el resumen y devuelve su ruta."""
+    global _perfil
+
+    if _perfil is None:
+        raise GICError("No hay un perfil en curso.")
+    modo, perfilador, inicio = _perfil
+    _perfil = None
+
+    os.makedirs(carpeta, exist_ok=True)
+    base = os.path.join(carpeta, f"{modo}_{inicio:%Y%m%d_%H%M%S}")
+    duracion = (datetime.now() - inicio).total_seconds()
+
+    if modo == "cpu":
+        import io
+        import pstats
+        perfilador.disable()
+        perfilador.dump_stats(base + ".prof")
+        texto = io.StringIO()
+        pstats.Stats(perfilador, stream=texto).sort_stats("cumulative").print_stats(LINEAS_PERFIL)
+        resumen = f"Perfil de CPU ({duracion:.1f}s), datos completos en {base}.prof\n{texto.getvalue()}"
+    else:
+        import tracemalloc
+        foto = tracemalloc.take_snapshot()
+        actual, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lineas = [
+            f"Perfil de memoria ({duracion:.1f}s): en uso {actual / 1e6:.1f} MB, pico {pico / 1e6:.1f} MB",
+            f"Top {LINEAS_PERFIL} líneas por memoria en uso:",
+        ]
+        for i, stat in enumerate(foto.statistics("lineno")[:LINEAS_PERFIL], start=1):
+            marco = stat.traceback[0]
+            lineas.append(f"{i:3}. {marco.filename}:{marco.lineno}: {stat.size / 1024:.1f} KiB en {stat.count} bloques")
+        resumen = "\n".join(lineas) + "\n"
+
+    ruta = base + ".txt"
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(resumen)
+    return ruta
+
+
+def _guardar_perfil_pendiente() -> None:
+    if _perfil is not None:
+        ruta = detener_perfil()
+        print(f"Perfil guardado en {ruta}", file=sys.stderr)
+
+
+atexit.register(_guardar_perfil_pendiente)
+
+
+def configurar_desde_entorno() -> None:
+    """Aplica GIC_METRICAS y GIC_PERFIL."""
+    if os.environ.get(ENV_METRICAS, "").strip().lower() in ("1", "si", "sí", "true", "on"):
+        activar()
+    modo = os.environ.get(ENV_PERFIL, "").strip().lower()
+    if modo and perfil_activo() is None:
+        iniciar_perfil(modo)
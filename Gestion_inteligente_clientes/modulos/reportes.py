@@ -0,0 +1,467 @@
+"""
+Reportes de la cartera: un modelo (totales, datos por sección y columnas de
+cada tabla) y renderizadores que lo vuelcan en distintos formatos.
+
+El modelo sale de los contadores del gestor y queda en caché hasta que la
+cartera cambia (GestorClientes.revision). Las filas no se guardan: cada
+sección recorre solo los clientes de su tipo (gestor.iterar(tipo)), cada
+cliente se convierte en fila una sola vez y esa fila se reparte entre todos
+los formatos pedidos, así el reporte TXT, los CSV, el JSON y el HTML
+comparten los mismos recorridos. Una única pasada por toda la cartera
+obligaría a guardar las filas de las secciones que van después.
+
+Formatos (RENDERIZADORES):
+    txt    el reporte de texto de siempre
+    csv    un CSV por sección: <base>_premium.csv, ... y <base>_totales.csv
+    json   un único documento con totales, datos y filas de cada sección
+    html   una página con una tabla por sección
+
+Para agregar un formato basta con una subclase de Renderizador registrada
+en RENDERIZADORES.
+"""
+import csv
+import html
+import json
+import os
+import weakref
+from contextlib import ExitStack
+
+from .agregados import TIPOS
+from .excepciones import ArchivoError
+from .metricas import medir
+
+
+BUFFER_ESCRITURA = 1024 * 1024  # bytes
+
+TITULO = "Reporte resumen - GIC"
+BENEFICIO_REGULAR = "acceso a promociones estándar (sin descuento fijo)"
+
+
+# ---------------------------------------------------------------------------
+# Modelo
+# ---------------------------------------------------------------------------
+
+class SeccionReporte:
+    """
+    Una tabla del reporte (los clientes de un tipo):
+    - datos: [(clave, etiqueta, valor, formato)]; valor puede ser un dict
+      (p. ej. la distribución por nivel) o None si no aplica
+    - columnas: [(clave, título)]; las de `si_no` llevan True/False
+    - fila(cliente) -> tupla con un valor por columna
+    """
+
+    def __init__(self, clave: str, titulo: str, cantidad: int, datos: list, columnas: list, fila,
+                 sin_clientes: str, si_no: tuple = ()):
+        self.clave = clave
+        self.titulo = titulo
+        self.cantidad = cantidad
+        self.datos = datos
+        self.columnas = columnas
+        self.fila = fila
+        self.sin_clientes = sin_clientes
+        self.si_no = si_no
+
+
+class ModeloReporte:
+    """Totales y secciones del reporte para una revisión de la cartera."""
+
+    def __init__(self, revision: int, resumen: dict, secciones: list):
+        self.titulo = TITULO
+        self.revision = revision
+        self.resumen = resumen
+        self.secciones = secciones
+
+
+def _fila_premium(c) -> tuple:
+    b = c.beneficio_exclusivo()
+    return (c.id, c.nombre, c.nivel, b["descuento"], b["sla_horas"], b["envio_gratis"], c.email)
+
+
+def _fila_corporativo(c) -> tuple:
+    b = c.beneficio_corporativo()
+    return (c.id, c.nombre, c.empresa, b["ejecutivo"], b["descuento_volumen"], b["facturacion_dias"], c.email)
+
+
+def _fila_regular(c) -> tuple:
+    return (c.id, c.nombre, c.email)
+
+
+def armar_modelo(gestor) -> ModeloReporte:
+    """Arma el modelo a partir de gestor.agregados() (O(1), sin recorrer la cartera)."""
+    revision = gestor.revision
+    agregados = gestor.agregados()
+
+    resumen = {"total": agregados["total"]}
+    resumen.update((t, agregados[t]) for t in TIPOS)
+
+    # los niveles salen del agregado (NIVELES + "otro"); "otro" solo si hay
+    por_nivel = {n: c for n, c in agregados["premium_por_nivel"].items() if n != "otro" or c}
+
+    secciones = [
+        SeccionReporte(
+            "premium", "Premium", agregados["premium"],
+            [
+                ("por_nivel", "Distribución por nivel", por_nivel, "{}"),
+                ("descuento_promedio", "Descuento promedio premium", agregados["descuento_premium_promedio"], "{:.2f}%"),
+            ],
+            [("id", "ID"), ("nombre", "Nombre"), ("nivel", "Nivel"), ("descuento", "Desc%"),
+             ("sla_horas", "SLA(h)"), ("envio_gratis", "Envío Gratis"), ("email", "Email")],
+            _fila_premium, "No hay clientes premium.", si_no=("envio_gratis",),
+        ),
+        SeccionReporte(
+            "corporativo", "Corporativo", agregados["corporativo"],
+            [
+                ("descuento_volumen_promedio", "Descuento volumen promedio", agregados["descuento_volumen_promedio"], "{:.2f}%"),
+                ("facturacion_promedio", "Facturación promedio", agregados["facturacion_promedio"], "{:.2f} días"),
+            ],
+            [("id", "ID"), ("nombre", "Nombre"), ("empresa", "Empresa"), ("ejecutivo", "Ejecutivo"),
+             ("descuento_volumen", "DescVol%"), ("facturacion_dias", "Fact(d)"), ("email", "Email")],
+            _fila_corporativo, "No hay clientes corporativos.",
+        ),
+        SeccionReporte(
+            "regular", "Regular", agregados["regular"],
+            [("beneficio", "Beneficio", BENEFICIO_REGULAR, "{}.")],
+            [("id", "ID"), ("nombre", "Nombre"), ("email", "Email")],
+            _fila_regular, "No hay clientes regulares.",
+        ),
+    ]
+    return ModeloReporte(revision, resumen, secciones)
+
+
+_modelos = weakref.WeakKeyDictionary()  # gestor -> último ModeloReporte
+
+
+def modelo_reporte(gestor) -> ModeloReporte:
+    """Modelo en caché por gestor; se rearma solo si cambió la revisión de la cartera."""
+    modelo = _modelos.get(gestor)
+    if modelo is None or modelo.revision != gestor.revision:
+        modelo = _modelos[gestor] = armar_modelo(gestor)
+    return modelo
+
+
+# ---------------------------------------------------------------------------
+# Renderizadores
+# ---------------------------------------------------------------------------
+
+_codificar_json = json.JSONEncoder(ensure_ascii=False).encode  # json.dumps(..., ensure_ascii=False) arma un encoder por llamada
+
+
+def _columnas_si_no(s: SeccionReporte) -> list:
+    return [i for i, (clave, _) in enumerate(s.columnas) if clave in s.si_no]
+
+
+def _con_si_no(valores: tuple, indices: list):
+    """Los True/False de las columnas `indices` pasan a "Sí"/"No" (el resto queda igual)."""
+    if not indices:
+        return valores
+    valores = list(valores)
+    for i in indices:
+        valores[i] = "Sí" if valores[i] else "No"
+    return valores
+
+
+def _dato(valor, formato: str) -> str:
+    return "N/A" if valor is None else formato.format(valor)
+
+
+def _crear_carpeta(ruta: str) -> None:
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+
+
+class Renderizador:
+    """
+    Recibe el modelo y las filas en orden: inicio(modelo), y por cada sección
+    seccion(s), fila(valores) por cliente y fin_seccion(s); al final fin().
+    Se usa como context manager: abre `ruta` al entrar y la cierra al salir.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._f = None
+
+    def __enter__(self):
+        _crear_carpeta(self.ruta)
+        self._f = open(self.ruta, "w", encoding="utf-8", buffering=BUFFER_ESCRITURA)
+        return self
+
+    def __exit__(self, *exc):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def inicio(self, modelo: ModeloReporte) -> None:
+        pass
+
+    def seccion(self, seccion: SeccionReporte) -> None:
+        pass
+
+    def fila(self, valores: tuple) -> None:
+        pass
+
+    def fin_seccion(self, seccion: SeccionReporte) -> None:
+        pass
+
+    def fin(self) -> None:
+        pass
+
+
+class RenderizadorTXT(Renderizador):
+    """Reporte de texto con tablas separadas por ' | '."""
+
+    # largo de la raya bajo el encabezado de cada tabla
+    ANCHOS = {"premium": 78, "corporativo": 82, "regular": 50}
+
+    def inicio(self, modelo):
+        f = self._f
+        r = modelo.resumen
+        f.write(f"{modelo.titulo}\n{'=' * len(modelo.titulo)}\n\n")
+        f.write(f"Total clientes: {r['total']}\n")
+        for tipo in TIPOS:
+            f.write(f"{tipo.capitalize()}: {r[tipo]}\n")
+        f.write("\n--- Detalle y Beneficios (extra) ---\n")
+        self._separador = "\n"
+
+    def seccion(self, s):
+        f = self._f
+        f.write(f"{self._separador}[{s.titulo}]\n")
+        self._separador = "\n\n"
+        for _, etiqueta, valor, formato in s.datos:
+            if isinstance(valor, dict):
+                f.write(f"{etiqueta}:\n")
+                for k, v in valor.items():
+                    f.write(f"  - {k.capitalize()}: {v}\n")
+            else:
+                f.write(f"{etiqueta}: {_dato(valor, formato)}\n")
+        f.write("\n")
+
+        if s.cantidad:
+            f.write(" | ".join(titulo for _, titulo in s.columnas) + "\n")
+            f.write("-" * self.ANCHOS.get(s.clave, 50) + "\n")
+        else:
+            f.write(f"{s.sin_clientes}\n")
+
+        # una plantilla por tabla: format() es bastante más rápido que join(map(str, ...))
+        self._plantilla = " | ".join(["{}"] * len(s.columnas)) + "\n"
+        self._si_no = _columnas_si_no(s)
+
+    def fila(self, valores):
+        self._f.write(self._plantilla.format(*_con_si_no(valores, self._si_no)))
+
+    def fin(self):
+        self._f.write("\n\nFin del reporte.\n")
+
+
+class RenderizadorCSV(Renderizador):
+    """
+    Un CSV por sección (encabezado con las claves de las columnas) más uno
+    de totales (seccion,dato,valor). `ruta` es la base: para
+    reportes/resumen.csv quedan reportes/resumen_premium.csv, ...
+    """
+
+    def __enter__(self):
+        _crear_carpeta(self.ruta)
+        self._base = os.path.splitext(self.ruta)[0]
+        self._rutas = []
+        return self
+
+    def _abrir(self, sufijo: str):
+        ruta = f"{self._base}_{sufijo}.csv"
+        self._f = open(ruta, "w", newline="", encoding="utf-8", buffering=BUFFER_ESCRITURA)
+        self._rutas.append(ruta)
+        return csv.writer(self._f)
+
+    def inicio(self, modelo):
+        w = self._abrir("totales")
+        w.writerow(("seccion", "dato", "valor"))
+        w.writerows(("resumen", k, v) for k, v in modelo.resumen.items())
+        for s in modelo.secciones:
+            for clave, _, valor, _ in s.datos:
+                if isinstance(valor, dict):
+                    w.writerows((s.clave, f"{clave}.{k}", v) for k, v in valor.items())
+                else:
+                    w.writerow((s.clave, clave, "" if valor is None else valor))
+        self._f.close()
+
+    def seccion(self, s):
+        self._writer = self._abrir(s.clave)
+        self._writer.writerow(clave for clave, _ in s.columnas)
+        self._si_no = _columnas_si_no(s)
+
+    def fila(self, valores):
+        self._writer.writerow(_con_si_no(valores, self._si_no))
+
+    def fin_seccion(self, s):
+        self._f.close()
+        self._f = None
+
+
+class RenderizadorJSON(Renderizador):
+    """
+    Un documento {"titulo", "resumen", "secciones": [{..., "columnas",
+    "filas": [[...], ...]}]} escrito en streaming, una fila por línea.
+    """
+
+    def inicio(self, modelo):
+        cabecera = _codificar_json({"titulo": modelo.titulo, "resumen": modelo.resumen})
+        self._f.write(cabecera[:-1] + ', "secciones": [')
+        self._primera_seccion = True
+
+    def seccion(self, s):
+        datos = {clave: valor for clave, _, valor, _ in s.datos}
+        cabecera = _codificar_json(
+            {"clave": s.clave, "titulo": s.titulo, "cantidad": s.cantidad, "datos": datos,
+             "columnas": [clave for clave, _ in s.columnas]}
+        )
+        self._f.write(("\n" if self._primera_seccion else ",\n") + cabecera[:-1] + ', "filas": [')
+        self._primera_seccion = False
+        self._separador = "\n"
+
+    def fila(self, valores):
+        self._f.write(self._separador + _codificar_json(valores))
+        self._separador = ",\n"
+
+    def fin_seccion(self, s):
+        self._f.write("]}")
+
+    def fin(self):
+        self._f.write("\n]}\n")
+
+
+class RenderizadorHTML(Renderizador):
+    """Página HTML autocontenida: totales, datos y una tabla por sección."""
+
+    ESTILO = (
+        "body{font-family:sans-serif;margin:2em}"
+        "table{border-collapse:collapse;margin-bottom:1em}"
+        "th,td{border:1px solid #ccc;padding:2px 8px;text-align:left}"
+        "th{background:#eee}"
+    )
+
+    def inicio(self, modelo):
+        f = self._f
+        titulo = html.escape(modelo.titulo)
+        f.write(
+            f'<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{titulo}</title>\n<style>{self.ESTILO}</style>\n</head>\n<body>\n<h1>{titulo}</h1>\n"
+        )
+        f.write("<table>\n")
+        f.write(f"<tr><th>Total clientes</th><td>{modelo.resumen['total']}</td></tr>\n")
+        for tipo in TIPOS:
+            f.write(f"<tr><th>{tipo.capitalize()}</th><td>{modelo.resumen[tipo]}</td></tr>\n")
+        f.write("</table>\n")
+
+    def seccion(self, s):
+        f = self._f
+        f.write(f"<h2>{html.escape(s.titulo)}</h2>\n<ul>\n")
+        for _, etiqueta, valor, formato in s.datos:
+            if isinstance(valor, dict):
+                detalle = ", ".join(f"{html.escape(k.capitalize())}: {v}" for k, v in valor.items())
+                f.write(f"<li>{html.escape(etiqueta)}: {detalle}</li>\n")
+            else:
+                f.write(f"<li>{html.escape(etiqueta)}: {html.escape(_dato(valor, formato))}</li>\n")
+        f.write("</ul>\n")
+
+        if s.cantidad:
+            encabezado = "".join(f"<th>{html.escape(titulo)}</th>" for _, titulo in s.columnas)
+            f.write(f"<table>\n<thead><tr>{encabezado}</tr></thead>\n<tbody>\n")
+        else:
+            f.write(f"<p>{html.escape(s.sin_clientes)}</p>\n")
+
+        self._plantilla = "<tr>" + "<td>{}</td>" * len(s.columnas) + "</tr>\n"
+        self._si_no = _columnas_si_no(s)
+
+    def fila(self, valores):
+        # solo los textos necesitan escape; los números se formatean tal cual
+        escapar = html.escape
+        self._f.write(self._plantilla.format(
+            *[escapar(v) if isinstance(v, str) else v for v in _con_si_no(valores, self._si_no)]
+        ))
+
+    def fin_seccion(self, s):
+        if s.cantidad:
+            self._f.write("</tbody>\n</table>\n")
+
+    def fin(self):
+        self._f.write("</body>\n</html>\n")
+
+
+RENDERIZADORES = {
+    "txt": RenderizadorTXT,
+    "csv": RenderizadorCSV,
+    "json": RenderizadorJSON,
+    "html": RenderizadorHTML,
+}
+
+
+# ---------------------------------------------------------------------------
+# Generación
+# ---------------------------------------------------------------------------
+
+def renderizar(gestor, renderizadores: list) -> int:
+    """
+    Vuelca el reporte en todos los renderizadores (ya abiertos) con un
+    recorrido filtrado por sección, compartido por todos los formatos.
+    Devuelve la cantidad de clientes del reporte.
+    """
+    modelo = modelo_reporte(gestor)
+    for r in renderizadores:
+        r.inicio(modelo)
+
+    for s in modelo.secciones:
+        for r in renderizadores:
+            r.seccion(s)
+        if s.cantidad:
+            fila = s.fila
+            if len(renderizadores) == 1:
+                escribir = renderizadores[0].fila
+                for c in gestor.iterar(s.clave):
+                    escribir(fila(c))
+            else:
+                escritores = [r.fila for r in renderizadores]
+                for c in gestor.iterar(s.clave):
+                    valores = fila(c)
+                    for escribir in escritores:
+                        escribir(valores)
+        for r in renderizadores:
+            r.fin_seccion(s)
+
+    for r in renderizadores:
+        r.fin()
+    return modelo.resumen["total"]
+
+
+def rutas_por_formato(ruta: str, formatos) -> dict:
+    """
+    {formato: ruta}. Con un solo formato se usa `ruta` tal cual; con varios,
+    `ruta` con la extensión de cada formato (resumen.txt, resumen.json, ...).
+    """
+    formatos = list(formatos)
+    if len(formatos) == 1:
+        return {formatos[0]: ruta}
+    base = os.path.splitext(ruta)[0]
+    return {formato: f"{base}.{formato}" for formato in formatos}
+
+
+@medir("reportes.generar_reportes", int)
+def generar_reportes(gestor, destinos: dict) -> int:
+    """
+    Genera el reporte en cada formato de `destinos` ({formato: ruta}) con los
+    mismos recorridos de la cartera (uno por sección) para todos. Devuelve la
+    cantidad de clientes incluidos.
+    """
+    desconocidos = [f for f in destinos if f not in RENDERIZADORES]
+    if desconocidos:
+        raise ArchivoError(f"Formato de reporte desconocido: {', '.join(desconocidos)} "
+                           f"(disponibles: {', '.join(RENDERIZADORES)})")
+
+    try:
+        with ExitStack() as pila:
+            renderizadores = [
+                pila.enter_context(RENDERIZADORES[formato](ruta)) for formato, ruta in destinos.items()
+            ]
+            return renderizar(gestor, renderizadores)
+    except Exception as e:
+        etiqueta = ", ".join(f"{formato.upper()} ({ruta})" for formato, ruta in destinos.items())
+        raise ArchivoError(f"Error generando reporte {etiqueta}: {e}") from e
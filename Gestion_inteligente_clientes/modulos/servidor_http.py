@@ -0,0 +1,395 @@
+"""
+Servicio HTTP/JSON sobre GestorClientes (solo biblioteca estándar: asyncio).
+
+Uso (desde la carpeta del proyecto):
+    python -m modulos.servidor_http
+Variables de entorno: GIC_HOST (127.0.0.1), GIC_PUERTO (8080), GIC_ALMACEN (memoria),
+GIC_METRICAS y GIC_PERFIL (ver modulos/metricas.py).
+
+Rutas:
+    GET    /clientes?tipo=&offset=&limite=     listado en orden de ID
+    POST   /clientes                           alta (JSON con tipo, id, nombre, ...)
+    GET    /clientes/{id}
+    PATCH  /clientes/{id}                      cambia los campos enviados (solo los editables del tipo)
+    DELETE /clientes/{id}
+    GET    /buscar?nombre=&empresa=&nivel=&offset=&limite=
+    GET    /resumen                            totales por tipo
+    GET    /agregados                          totales, niveles y promedios
+    GET    /metricas?formato=prometheus        métricas de modulos/metricas.py (JSON o texto)
+    POST   /importar   {"ruta": ..., "procesos": n}
+    POST   /exportar   {"ruta": ...}
+    POST   /reporte    {"ruta": ..., "formatos": ["txt", "csv", "json", "html"]}
+
+Las conexiones son persistentes (keep-alive) y admiten pipelining: los
+pedidos que llegan juntos se responden en orden. Nada que toque el gestor
+corre en el event loop: importar, exportar y el reporte van a un pool de
+tareas largas, y las consultas y cambios a otro pool de hilos, así esperar
+el cerrojo del gestor (p. ej. mientras una importación escribe) no frena
+las demás conexiones. Por eso el gestor trabaja en modo concurrente.
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlsplit, parse_qsl
+
+from .excepciones import GICError, ClienteExistenteError, ClienteNoEncontradoError
+from .fabrica_clientes import crear_cliente
+from .gestor_clientes import GestorClientes
+from .archivos import exportar_csv, importar_csv_en_lotes
+from .logger_config import get_logger
+from . import metricas
+from .reportes import generar_reportes, rutas_por_formato
+from .validaciones import MENSAJES_ERROR
+
+
+HOST = "127.0.0.1"
+PUERTO = 8080
+MAX_CUERPO = 1024 * 1024      # bytes
+MAX_ENCABEZADOS = 64 * 1024   # bytes
+INACTIVIDAD = 15              # segundos de espera por el próximo pedido
+HILOS_TAREAS = 2              # pool para importación, exportación y reporte
+HILOS_OPERACIONES = 4         # pool para las consultas y cambios sobre el gestor
+MAX_ERRORES_IMPORTACION = 100
+MAX_SALIDA = 256 * 1024       # bytes pendientes de envío antes de esperar al cliente
+
+RUTA_ENTRADA = "datos/clientes_entradas.csv"
+RUTA_SALIDA = "datos/clientes.csv"
+RUTA_REPORTE = "reportes/resumen.txt"
+
+_ESTADOS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error", 501: "Not Implemented",
+}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _entero(params: dict, nombre: str, defecto=None):
+    valor = params.get(nombre)
+    if valor is None or valor == "":
+        return defecto
+    try:
+        return int(valor)
+    except ValueError:
+        raise ErrorHTTP(400, f"'{nombre}' debe ser un número entero.")
+
+
+def _ruta_local(ruta: str, defecto: str) -> str:
+    """Solo se aceptan rutas dentro de la carpeta del proyecto."""
+    ruta = ruta or defecto
+    base = os.path.realpath(os.getcwd())
+    real = os.path.realpath(ruta)
+    if os.path.commonpath([base, real]) != base:
+        raise ErrorHTTP(400, f"Ruta fuera de la carpeta del proyecto: {ruta}")
+    return ruta
+
+
+class ServidorClientes:
+    def __init__(self, gestor: GestorClientes = None, almacen=None):
+        self.gestor = gestor or GestorClientes(almacen, concurrente=True)
+        self._pool = ThreadPoolExecutor(max_workers=HILOS_TAREAS, thread_name_prefix="gic-tareas")
+        self._pool_operaciones = ThreadPoolExecutor(max_workers=HILOS_OPERACIONES, thread_name_prefix="gic-operaciones")
+        self._log = get_logger()
+        self._servidor = None
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def iniciar(self, host: str = HOST, puerto: int = PUERTO):
+        self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=MAX_ENCABEZADOS)
+        self._log.info(f"Servidor HTTP escuchando en {host}:{self.puerto}")
+        return self._servidor
+
+    @property
+    def puerto(self) -> int:
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def servir(self, host: str = HOST, puerto: int = PUERTO) -> None:
+        await self.iniciar(host, puerto)
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        finally:
+            self.cerrar()
+
+    def cerrar(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._pool_operaciones.shutdown(wait=True)
+        self.gestor.cerrar()
+
+    # ------------------------------------------------------------------
+    # Protocolo
+    # ------------------------------------------------------------------
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Atiende una conexión: lee pedidos uno tras otro y responde en orden.
+
+        Con pipelining, los pedidos que ya están en el buffer se leen sin
+        ceder el event loop; sus respuestas se acumulan y salen juntas en un
+        solo write (un envío por tanda en vez de uno por pedido) cuando el
+        loop vuelve a correr, es decir, cuando hay que esperar al cliente.
+        """
+        salida = bytearray()
+        envio_programado = False
+
+        def enviar() -> None:
+            nonlocal envio_programado
+            envio_programado = False
+            if salida and not writer.is_closing():
+                writer.write(bytes(salida))
+            salida.clear()
+
+        async def responder(estado: int, datos, mantener: bool) -> None:
+            nonlocal envio_programado
+            salida.extend(self._respuesta(estado, datos, mantener))
+            if not envio_programado:
+                asyncio.get_running_loop().call_soon(enviar)
+                envio_programado = True
+            if writer.transport.get_write_buffer_size() > MAX_SALIDA:
+                await writer.drain()  # el cliente no está leyendo: esperar
+
+        try:
+            while True:
+                try:
+                    # asyncio.timeout (3.11+) no crea una tarea por pedido como wait_for
+                    async with asyncio.timeout(INACTIVIDAD):
+                        cabecera = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await responder(431, {"error": "Encabezados demasiado grandes."}, False)
+                    break
+
+                try:
+                    metodo, destino, version, encabezados = self._parsear_cabecera(cabecera)
+                    mantener = self._mantener_conexion(version, encabezados)
+                    cuerpo = await self._leer_cuerpo(reader, encabezados)
+                except ErrorHTTP as e:
+                    await responder(e.estado, {"error": str(e)}, False)
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                estado, datos = await self._despachar(metodo, destino, cuerpo)
+                await responder(estado, datos, mantener)
+                if not mantener:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            enviar()
+            writer.close()
+
+    @staticmethod
+    def _parsear_cabecera(cabecera: bytes) -> tuple:
+        try:
+            lineas = cabecera.decode("latin-1").split("\r\n")
+            metodo, destino, version = lineas[0].split(" ", 2)
+        except ValueError:
+            raise ErrorHTTP(400, "Línea de pedido inválida.")
+
+        encabezados = {}
+        for linea in lineas[1:]:
+            if not linea:
+                continue
+            nombre, sep, valor = linea.partition(":")
+            if not sep:
+                raise ErrorHTTP(400, "Encabezado inválido.")
+            encabezados[nombre.strip().lower()] = valor.strip()
+        return metodo.upper(), destino, version, encabezados
+
+    @staticmethod
+    def _mantener_conexion(version: str, encabezados: dict) -> bool:
+        conexion = encabezados.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return conexion == "keep-alive"
+        return conexion != "close"
+
+    @staticmethod
+    async def _leer_cuerpo(reader: asyncio.StreamReader, encabezados: dict) -> bytes:
+        if "transfer-encoding" in encabezados:
+            raise ErrorHTTP(501, "Transfer-Encoding no soportado; enviar Content-Length.")
+        try:
+            largo = int(encabezados.get("content-length", "0"))
+        except ValueError:
+            raise ErrorHTTP(400, "Content-Length inválido.")
+        if largo < 0:
+            raise ErrorHTTP(400, "Content-Length inválido.")
+        if largo > MAX_CUERPO:
+            raise ErrorHTTP(413, f"El cuerpo supera {MAX_CUERPO} bytes.")
+        return await reader.readexactly(largo) if largo else b""
+
+    @staticmethod
+    def _respuesta(estado: int, datos, mantener: bool) -> bytes:
+        # un str sale tal cual como texto (p. ej. métricas de Prometheus)
+        if isinstance(datos, str):
+            cuerpo, tipo = datos.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            cuerpo = b"" if datos is None else json.dumps(datos, ensure_ascii=False).encode("utf-8")
+            tipo = "application/json; charset=utf-8"
+        cabecera = (
+            f"HTTP/1.1 {estado} {_ESTADOS.get(estado, '')}\r\n"
+            f"Content-Type: {tipo}\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        return cabecera.encode("latin-1") + cuerpo
+
+    # ------------------------------------------------------------------
+    # Rutas
+    # ------------------------------------------------------------------
+
+    async def _despachar(self, metodo: str, destino: str, cuerpo: bytes) -> tuple:
+        try:
+            url = urlsplit(destino)
+            partes = [p for p in url.path.split("/") if p]
+            params = dict(parse_qsl(url.query))
+            datos = json.loads(cuerpo) if cuerpo else {}
+            if not isinstance(datos, dict):
+                raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON.")
+            return await self._rutear(metodo, partes, params, datos)
+
+        except ErrorHTTP as e:
+            return e.estado, {"error": str(e)}
+        except json.JSONDecodeError:
+            return 400, {"error": "JSON inválido."}
+        except ClienteNoEncontradoError as e:
+            return 404, {"error": str(e)}
+        except ClienteExistenteError as e:
+            return 409, {"error": str(e)}
+        except (GICError, ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            self._log.error(f"Error inesperado en {metodo} {destino}: {e}")
+            return 500, {"error": "Error interno."}
+
+    async def _rutear(self, metodo: str, partes: list, params: dict, datos: dict) -> tuple:
+        g = self.gestor
+        recurso = partes[0] if partes else ""
+
+        if recurso == "clientes" and len(partes) == 1:
+            if metodo == "GET":
+                offset = _entero(params, "offset", 0)
+                limite = _entero(params, "limite")
+                fin = None if limite is None else offset + limite
+                tipo = params.get("tipo")
+                return 200, await self._operacion(
+                    lambda: [c.to_dict() for c in islice(g.iterar(tipo), offset, fin)]
+                )
+            if metodo == "POST":
+                c = self._cliente_desde_json(datos)
+                await self._operacion(g.agregar, c)
+                return 201, c.to_dict()
+            raise ErrorHTTP(405, "Método no permitido.")
+
+        if recurso == "clientes" and len(partes) == 2:
+            try:
+                id_ = int(partes[1])
+            except ValueError:
+                raise ErrorHTTP(404, f"No existe cliente con ID {partes[1]}")
+            if metodo == "GET":
+                return 200, await self._operacion(lambda: g.buscar_por_id(id_).to_dict())
+            if metodo in ("PATCH", "PUT"):
+                campos = {k: v for k, v in datos.items() if k not in ("id", "tipo")}
+                return 200, await self._operacion(self._actualizar, id_, campos)
+            if metodo == "DELETE":
+                await self._operacion(g.eliminar, id_)
+                return 204, None
+            raise ErrorHTTP(405, "Método no permitido.")
+
+        if len(partes) == 1 and metodo == "GET":
+            if recurso == "buscar":
+                encontrados = await self._operacion(
+                    g.buscar, params.get("nombre"), params.get("empresa"), params.get("nivel"),
+                    _entero(params, "offset", 0), _entero(params, "limite"),
+                )
+                return 200, [c.to_dict() for c in encontrados]
+            if recurso == "resumen":
+                return 200, await self._operacion(g.resumen_por_tipo)
+            if recurso == "agregados":
+                return 200, await self._operacion(g.agregados)
+            if recurso == "metricas":
+                if params.get("formato") == "prometheus":
+                    return 200, metricas.a_prometheus()
+                return 200, {"activas": metricas.activas(), "operaciones": metricas.instantanea()}
+
+        if len(partes) == 1 and metodo == "POST":
+            if recurso == "importar":
+                return 200, await self._en_pool(self._importar, datos)
+            if recurso == "exportar":
+                ruta = _ruta_local(datos.get("ruta"), RUTA_SALIDA)
+                # la instantánea (g.iterar()) también se arma en el pool, no en el loop
+                await self._en_pool(lambda: exportar_csv(ruta, g.iterar(), True, True, True))
+                return 200, {"ruta": ruta}
+            if recurso == "reporte":
+                ruta = _ruta_local(datos.get("ruta"), RUTA_REPORTE)
+                formatos = datos.get("formatos", ["txt"])
+                if not isinstance(formatos, list) or not formatos or not all(isinstance(f, str) for f in formatos):
+                    raise ErrorHTTP(400, "'formatos' debe ser una lista no vacía (txt, csv, json, html).")
+                destinos = rutas_por_formato(ruta, formatos)
+                await self._en_pool(generar_reportes, g, destinos)
+                return 200, {"ruta": ruta, "rutas": destinos}
+
+        raise ErrorHTTP(404, "Ruta inexistente.")
+
+    async def _en_pool(self, fn, *args):
+        """Corre `fn` en el pool de tareas largas sin bloquear el event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    async def _operacion(self, fn, *args):
+        """Corre una operación del gestor (que puede esperar su cerrojo) fuera del event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._pool_operaciones, fn, *args)
+
+    def _actualizar(self, id_: int, campos: dict) -> dict:
+        editables = self.gestor.buscar_por_id(id_).CAMPOS_EDITABLES
+        invalidos = sorted(k for k in campos if k not in editables)
+        if invalidos:
+            raise ErrorHTTP(400, f"Campos no editables: {', '.join(invalidos)} "
+                                 f"(se aceptan: {', '.join(editables)}).")
+        return self.gestor.actualizar(id_, **campos).to_dict()
+
+    def _importar(self, datos: dict) -> dict:
+        ruta = _ruta_local(datos.get("ruta"), RUTA_ENTRADA)
+        errores = []
+        resumen = importar_csv_en_lotes(ruta, self.gestor, errores=errores, procesos=datos.get("procesos"))
+        resumen["errores"] = errores[:MAX_ERRORES_IMPORTACION]
+        return resumen
+
+    @staticmethod
+    def _cliente_desde_json(datos: dict):
+        if "id" not in datos:
+            raise ErrorHTTP(400, "Falta el campo 'id'.")
+        try:
+            id_ = int(datos["id"])
+        except (TypeError, ValueError):
+            raise ErrorHTTP(400, MENSAJES_ERROR["ID_INVALIDO"])
+        return crear_cliente(
+            str(datos.get("tipo") or "regular").strip().lower(),
+            id_,
+            datos.get("nombre"), datos.get("email"), datos.get("telefono"), datos.get("direccion"),
+            nivel=datos.get("nivel"), empresa=datos.get("empresa"), contacto=datos.get("contacto"),
+        )
+
+
+def main():
+    metricas.configurar_desde_entorno()
+    servidor = ServidorClientes(almacen=os.environ.get("GIC_ALMACEN", "memoria"))
+    host = os.environ.get("GIC_HOST", HOST)
+    puerto = int(os.environ.get("GIC_PUERTO", PUERTO))
+    try:
+        asyncio.run(servidor.servir(host, puerto))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,117 @@ import re
 from .excepciones import EmailInvalidoError, TelefonoInvalidoError, DireccionInvalidaError
 
 
+# Patrones precompilados (se usan en cada setter y en validar_lote)
 _EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+_TELEFONO_RE = re.compile(r"^\+?\d{8,15}$")  # 8 a 15 dígitos (puede empezar con +)
+_ID_RE = re.compile(r"^[+-]?\d+$")
 
+MIN_DIRECCION = 5
 
-def validar_no_vacio(valor: str, campo: str) -> None:
+
+def validar_no_vacio(valor: str, campo: str) -> str:
+    """Valida y devuelve el valor sin espacios extremos."""
     if not isinstance(valor, str) or not valor.strip():
         raise ValueError(f"El campo '{campo}' no puede estar vacío.")
+    return valor.strip()
 
 
-def validar_email(email: str) -> None:
-    validar_no_vacio(email, "email")
-    if not _EMAIL_RE.match(email.strip()):
+def validar_email(email: str) -> str:
+    email = validar_no_vacio(email, "email")
+    if not _EMAIL_RE.match(email):
         raise EmailInvalidoError("Email inválido. Ej: nombre@dominio.com")
+    return email
 
 
-def validar_telefono(telefono: str) -> None:
-    validar_no_vacio(telefono, "teléfono")
-    tel = telefono.strip().replace(" ", "")
-    # Regla simple: 8 a 15 dígitos (puede empezar con +)
-    if not re.match(r"^\+?\d{8,15}$", tel):
+def validar_telefono(telefono: str) -> str:
+    telefono = validar_no_vacio(telefono, "teléfono")
+    if not _TELEFONO_RE.match(telefono.replace(" ", "")):
         raise TelefonoInvalidoError("Teléfono inválido. Usa 8-15 dígitos (opcional +).")
+    return telefono
 
 
-def validar_direccion(direccion: str) -> None:
-    validar_no_vacio(direccion, "dirección")
-    if len(direccion.strip()) < 5:
+def validar_direccion(direccion: str) -> str:
+    direccion = validar_no_vacio(direccion, "dirección")
+    if len(direccion) < MIN_DIRECCION:
         raise DireccionInvalidaError("Dirección inválida. Debe tener al menos 5 caracteres.")
+    return direccion
+
+
+# ---------------------------------------------------------------------------
+# Validación por lotes
+# ---------------------------------------------------------------------------
+
+# Código de error -> mensaje (los mismos textos que las excepciones)
+MENSAJES_ERROR = {
+    "ID_INVALIDO": "ID inválido o dato no numérico.",
+    "NOMBRE_VACIO": "El campo 'nombre' no puede estar vacío.",
+    "EMAIL_VACIO": "El campo 'email' no puede estar vacío.",
+    "EMAIL_INVALIDO": "Email inválido. Ej: nombre@dominio.com",
+    "TELEFONO_VACIO": "El campo 'teléfono' no puede estar vacío.",
+    "TELEFONO_INVALIDO": "Teléfono inválido. Usa 8-15 dígitos (opcional +).",
+    "DIRECCION_VACIA": "El campo 'dirección' no puede estar vacío.",
+    "DIRECCION_INVALIDA": "Dirección inválida. Debe tener al menos 5 caracteres.",
+    "NIVEL_VACIO": "El campo 'nivel' no puede estar vacío.",
+    "EMPRESA_VACIA": "El campo 'empresa' no puede estar vacío.",
+    "CONTACTO_VACIO": "El campo 'contacto' no puede estar vacío.",
+}
+
+
+def _no_vacio(valores: list) -> list:
+    return [isinstance(v, str) and bool(v.strip()) for v in valores]
+
+
+def _coincide(patron, valores: list) -> list:
+    # map + match precompilado: el recorrido de la columna queda en C
+    return [m is not None for m in map(patron.match, valores)]
+
+
+def validar_lote(filas: list, parcial: bool = False) -> list:
+    """
+    Valida un lote de filas (dicts con las columnas del CSV, valores sin
+    espacios extremos) columna por columna, sin lanzar excepciones.
+
+    Devuelve una lista alineada con `filas`: None si la fila es válida o el
+    código (clave de MENSAJES_ERROR) del primer campo inválido, en el mismo
+    orden en que los valida el constructor del cliente.
+    Con parcial=True solo se validan los campos presentes y distintos de None
+    (útil para actualizaciones).
+    """
+    errores = [None] * len(filas)
+
+    def revisar(campo: str, chequeos: list, filtro=None) -> None:
+        indices = [
+            i for i, f in enumerate(filas)
+            if (filtro is None or filtro(f)) and (not parcial or f.get(campo) is not None)
+        ]
+        valores = [filas[i].get(campo) or "" for i in indices]
+        # Cada chequeo recibe la columna completa; se marcan los que fallan
+        for codigo, fn in reversed(chequeos):
+            for i, ok in zip(indices, fn(valores)):
+                if not ok:
+                    errores[i] = codigo
+
+    def es(tipo):
+        return lambda f: f.get("tipo") == tipo
+
+    # Se revisan en orden inverso: así queda registrado el primer error de cada fila
+    revisar("contacto", [("CONTACTO_VACIO", _no_vacio)], es("corporativo"))
+    revisar("empresa", [("EMPRESA_VACIA", _no_vacio)], es("corporativo"))
+    revisar("nivel", [("NIVEL_VACIO", _no_vacio)], es("premium"))
+    revisar("direccion", [
+        ("DIRECCION_VACIA", _no_vacio),
+        ("DIRECCION_INVALIDA", lambda vs: [len(v.strip()) >= MIN_DIRECCION for v in vs]),
+    ])
+    revisar("telefono", [
+        ("TELEFONO_VACIO", _no_vacio),
+        ("TELEFONO_INVALIDO", lambda vs: _coincide(_TELEFONO_RE, [v.strip().replace(" ", "") for v in vs])),
+    ])
+    revisar("email", [
+        ("EMAIL_VACIO", _no_vacio),
+        ("EMAIL_INVALIDO", lambda vs: _coincide(_EMAIL_RE, [v.strip() for v in vs])),
+    ])
+    revisar("nombre", [("NOMBRE_VACIO", _no_vacio)])
+    if not parcial:
+        revisar("id", [("ID_INVALIDO", lambda vs: _coincide(_ID_RE, vs))])
+
+    return errores
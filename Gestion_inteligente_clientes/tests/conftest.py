@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.logger_config import configurar_logging, detener_logging  # noqa: E402
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _log_temporal(tmp_path_factory):
+    """Los registros de las pruebas van a un archivo temporal, no a logs/app.log."""
+    configurar_logging(str(tmp_path_factory.mktemp("logs") / "app.log"), asincrono=False)
+    yield
+    detener_logging()
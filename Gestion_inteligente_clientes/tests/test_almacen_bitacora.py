@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from modulos.almacen_bitacora import AlmacenBitacora
+from modulos.excepciones import ArchivoError
+from modulos.fabrica_clientes import crear_cliente, cliente_a_fila
+from modulos.gestor_clientes import GestorClientes
+
+
+def _cliente(id_: int):
+    return crear_cliente("premium", id_, f"Cliente {id_}", f"c{id_}@x.com", f"+569{id_:08d}",
+                         f"Calle {id_} #100", nivel="gold")
+
+
+def _abrir(carpeta, **kwargs) -> GestorClientes:
+    return GestorClientes(AlmacenBitacora(carpeta=str(carpeta), **kwargs))
+
+
+def _diario(carpeta) -> str:
+    diarios = sorted(n for n in os.listdir(carpeta) if n.startswith("diario_"))
+    return os.path.join(carpeta, diarios[-1])
+
+
+def _filas(gestor) -> list:
+    return [cliente_a_fila(c) for c in gestor.iterar()]
+
+
+@pytest.fixture
+def carpeta(tmp_path):
+    gestor = _abrir(tmp_path)
+    for i in (1, 2, 3):
+        gestor.agregar(_cliente(i))
+    gestor.buscar_por_id(2).email = "nuevo@x.com"
+    gestor.eliminar(3)
+    gestor.cerrar()
+    return tmp_path
+
+
+def test_recupera_altas_cambios_y_bajas(carpeta):
+    gestor = _abrir(carpeta)
+    assert [f[1] for f in _filas(gestor)] == [1, 2]
+    assert gestor.buscar_por_id(2).email == "nuevo@x.com"
+    assert gestor.existe_email("c3@x.com") is False
+    gestor.cerrar()
+
+
+def test_ultima_linea_cortada_se_descarta_y_se_trunca(carpeta):
+    ruta = _diario(carpeta)
+    largo = os.path.getsize(ruta)
+    with open(ruta, "ab") as f:
+        f.write(b'[6,"a",["regular",9,"Cortado"')  # escritura interrumpida por una caída
+
+    gestor = _abrir(carpeta)
+    assert [f[1] for f in _filas(gestor)] == [1, 2]
+    assert os.path.getsize(ruta) == largo
+
+    # lo que se escribe después queda en una línea propia y se recupera
+    gestor.agregar(_cliente(4))
+    gestor.cerrar()
+    gestor = _abrir(carpeta)
+    assert [f[1] for f in _filas(gestor)] == [1, 2, 4]
+    gestor.cerrar()
+
+
+def test_registro_final_a_medias_pierde_solo_ese_cambio(carpeta):
+    ruta = _diario(carpeta)
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    # se corta la baja del cliente 3 (último registro) a la mitad
+    inicio_ultimo = contenido.rstrip(b"\n").rfind(b"\n") + 1
+    with open(ruta, "wb") as f:
+        f.write(contenido[:inicio_ultimo + 3])
+
+    gestor = _abrir(carpeta)
+    assert [f[1] for f in _filas(gestor)] == [1, 2, 3]
+    gestor.cerrar()
+
+
+def test_linea_dañada_en_el_medio_es_un_error(carpeta):
+    ruta = _diario(carpeta)
+    with open(ruta, "rb") as f:
+        lineas = f.readlines()
+    lineas[1] = b"{no es json\n"
+    with open(ruta, "wb") as f:
+        f.writelines(lineas)
+
+    with pytest.raises(ArchivoError):
+        _abrir(carpeta)
+
+
+def test_foto_mas_diario_posterior(tmp_path):
+    gestor = _abrir(tmp_path, compactar_cada=3)
+    for i in range(1, 6):
+        gestor.agregar(_cliente(i))
+    gestor.buscar_por_id(5).nivel = "platinum"
+    esperado = _filas(gestor)
+    gestor.cerrar()
+
+    assert any(n.startswith("foto_") for n in os.listdir(tmp_path))
+    gestor = _abrir(tmp_path, compactar_cada=3)
+    assert _filas(gestor) == esperado
+    assert gestor.agregados()["premium_por_nivel"]["platinum"] == 1
+    gestor.cerrar()
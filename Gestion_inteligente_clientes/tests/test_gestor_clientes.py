@@ -0,0 +1,52 @@
+import pytest
+
+from modulos.excepciones import CampoInvalidoError, TelefonoInvalidoError
+from modulos.fabrica_clientes import crear_cliente
+from modulos.gestor_clientes import GestorClientes
+
+
+@pytest.fixture
+def gestor():
+    g = GestorClientes()
+    g.agregar(crear_cliente("regular", 1, "Ana", "ana@x.com", "+56911111111", "Calle 1 #100"))
+    g.agregar(crear_cliente("premium", 2, "Beto", "beto@x.com", "+56922222222", "Calle 2 #200", nivel="gold"))
+    return g
+
+
+@pytest.mark.parametrize("campos", [{"_email": "ana@x.com"}, {"_id": 1}, {"to_dict": 1}, {"nivel": "gold"}])
+def test_actualizar_rechaza_campos_no_editables(gestor, campos):
+    with pytest.raises(CampoInvalidoError):
+        gestor.actualizar(1, nombre="Otro", **campos)
+    cliente = gestor.buscar_por_id(1)
+    assert (cliente.nombre, cliente.email) == ("Ana", "ana@x.com")
+    assert cliente.to_dict()["id"] == 1
+
+
+def test_actualizar_muchos_rechaza_la_fila_con_campos_no_editables(gestor):
+    r = gestor.actualizar_muchos([
+        {"id": 1, "_email": "beto@x.com"},
+        {"id": 2, "nivel": "platinum", "empresa": None},
+    ])
+    assert [x["id"] for x in r["rechazados"]] == [1]
+    assert [c.id for c in r["actualizados"]] == [2]
+    assert gestor.buscar_por_id(1).email == "ana@x.com"
+    assert gestor.buscar_por_id(2).nivel == "platinum"
+
+
+@pytest.mark.parametrize("almacen", ["memoria", "sqlite"])
+def test_actualizar_con_un_valor_invalido_no_cambia_nada(tmp_path, almacen):
+    if almacen == "sqlite":
+        from modulos.almacen_sqlite import AlmacenSQLite
+        almacen = AlmacenSQLite(str(tmp_path / "clientes.db"))
+    g = GestorClientes(almacen)
+    g.agregar(crear_cliente("premium", 2, "Beto", "beto@x.com", "+56922222222", "Calle 2 #200", nivel="gold"))
+
+    with pytest.raises(TelefonoInvalidoError):
+        g.actualizar(2, nivel="platinum", nombre="Zoe", telefono="malo")
+
+    cliente = g.buscar_por_id(2)
+    assert (cliente.nivel, cliente.nombre) == ("gold", "Beto")
+    niveles = g.agregados()["premium_por_nivel"]
+    assert (niveles["gold"], niveles["platinum"]) == (1, 0)
+    assert g.buscar(nivel="platinum") == [] and g.buscar(nombre="zoe") == []
+    g.cerrar()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from modulos.excepciones import ClienteExistenteError
+from modulos.fabrica_clientes import crear_cliente
+from modulos.gestor_clientes import GestorClientes
+
+
+HILOS = 4
+CAMBIOS_POR_HILO = 50
+
+
+def _cliente(id_: int, email: str):
+    return crear_cliente("regular", id_, f"Cliente {id_}", email, f"+569{id_:08d}", f"Calle {id_} #100")
+
+
+def test_cambios_de_email_simultaneos_no_dejan_emails_huerfanos():
+    gestor = GestorClientes(concurrente=True)
+    gestor.agregar(_cliente(1, "inicial@x.com"))
+    cliente = gestor.buscar_por_id(1)
+
+    # una pausa al volver del gestor: si el atributo se asignara recién ahí,
+    # otro hilo partiría del mismo email anterior
+    al_cambiar = gestor._al_cambiar
+
+    def al_cambiar_lento(*args):
+        al_cambiar(*args)
+        time.sleep(0.0005)
+
+    gestor._al_cambiar = al_cambiar_lento
+    barrera = threading.Barrier(HILOS)
+
+    def cambiar(n):
+        barrera.wait()
+        for i in range(CAMBIOS_POR_HILO):
+            cliente.email = f"h{n}-{i}@x.com"
+
+    hilos = [threading.Thread(target=cambiar, args=(n,)) for n in range(HILOS)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    # solo el email vigente queda indexado; los anteriores se pueden volver a usar
+    usados = ["inicial@x.com"] + [f"h{n}-{i}@x.com" for n in range(HILOS) for i in range(CAMBIOS_POR_HILO)]
+    assert [e for e in usados if gestor.existe_email(e)] == [cliente.email]
+
+
+def test_cambio_rechazado_no_modifica_el_cliente():
+    gestor = GestorClientes(concurrente=True)
+    gestor.agregar(_cliente(1, "uno@x.com"))
+    gestor.agregar(_cliente(2, "dos@x.com"))
+    cliente = gestor.buscar_por_id(2)
+
+    with pytest.raises(ClienteExistenteError):
+        cliente.email = "uno@x.com"
+    assert cliente.email == "dos@x.com"
+    assert gestor.existe_email("dos@x.com")
+
+
+def test_busquedas_simultaneas_comparten_el_cerrojo_de_lectura():
+    gestor = GestorClientes(concurrente=True)
+    for i in range(1, 201):
+        gestor.agregar(_cliente(i, f"c{i}@x.com"))
+    version = gestor._version
+
+    barrera = threading.Barrier(HILOS)
+    resultados = []
+
+    def buscar():
+        barrera.wait()
+        # la primera búsqueda arma los índices y consolida el de nombres
+        resultados.append([c.id for c in gestor.buscar(nombre="cliente 1")])
+
+    hilos = [threading.Thread(target=buscar) for _ in range(HILOS)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    esperados = sorted(range(1, 201), key=lambda i: f"cliente {i}")
+    esperados = [i for i in esperados if str(i).startswith("1")]
+    assert resultados == [esperados] * HILOS
+    # buscar no es una escritura: la instantánea de listar() sigue vigente
+    assert gestor._version == version
@@ -0,0 +1,101 @@
+import pytest
+
+from modulos.excepciones import CampoInvalidoError, ClienteExistenteError, ClienteNoEncontradoError
+from modulos.fabrica_clientes import crear_cliente
+from modulos.gestor_particionado import GestorParticionado
+
+
+PARTICIONES = 3
+
+
+def _cliente(id_: int, email: str = None, tipo: str = "regular"):
+    return crear_cliente(tipo, id_, f"Cliente {id_}", email or f"c{id_}@x.com", f"+569{id_:08d}",
+                         f"Calle {id_} #100", nivel="gold", empresa="ACME", contacto="Ejecutivo")
+
+
+@pytest.fixture
+def gestor():
+    g = GestorParticionado(PARTICIONES)
+    yield g
+    g.cerrar()
+
+
+def test_cada_cliente_vive_en_la_particion_de_su_id(gestor):
+    r = gestor.agregar_muchos([_cliente(i) for i in range(1, 11)])
+    assert len(r["aceptados"]) == 10
+
+    for id_ in range(1, 11):
+        for i, particion in enumerate(gestor._particiones):
+            if i == id_ % PARTICIONES:
+                assert particion.llamar("obtener", id_)[1] == id_
+            else:
+                with pytest.raises(ClienteNoEncontradoError):
+                    particion.llamar("obtener", id_)
+    assert [c.id for c in gestor.listar()] == list(range(1, 11))
+
+
+def test_alta_rechazada_por_la_particion_libera_el_email(gestor):
+    gestor.agregar(_cliente(1))
+    # el email está libre en el índice, pero la partición ya tiene el ID 1
+    with pytest.raises(ClienteExistenteError):
+        gestor.agregar(_cliente(1, "nuevo@x.com"))
+    assert not gestor.existe_email("nuevo@x.com")
+    gestor.agregar(_cliente(2, "nuevo@x.com"))
+    assert gestor.buscar_por_id(2).email == "nuevo@x.com"
+
+
+def test_alta_masiva_rechazada_por_la_particion_libera_los_emails(gestor):
+    gestor.agregar(_cliente(4))
+    r = gestor.agregar_muchos([_cliente(4, "otro@x.com"), _cliente(5)])
+    assert [x["cliente"].id for x in r["rechazados"]] == [4]
+    assert [c.id for c in r["aceptados"]] == [5]
+    assert not gestor.existe_email("otro@x.com")
+    assert gestor.existe_email("c4@x.com") and gestor.existe_email("c5@x.com")
+
+
+def test_actualizacion_rechazada_libera_el_email_reservado(gestor):
+    gestor.agregar(_cliente(1))
+    with pytest.raises(CampoInvalidoError):
+        gestor.actualizar(1, email="nuevo@x.com", _id=2)
+    assert not gestor.existe_email("nuevo@x.com")
+    assert gestor.buscar_por_id(1).email == "c1@x.com"
+
+    r = gestor.actualizar_muchos([{"id": 1, "email": "otro@x.com", "nivel": "gold"}])
+    assert [x["id"] for x in r["rechazados"]] == [1]
+    assert not gestor.existe_email("otro@x.com")
+    gestor.agregar(_cliente(2, "otro@x.com"))
+
+
+def test_cambio_de_email_por_asignacion(gestor):
+    gestor.agregar(_cliente(1))
+    gestor.agregar(_cliente(2))
+    cliente = gestor.buscar_por_id(1)
+
+    with pytest.raises(ClienteExistenteError):
+        cliente.email = "c2@x.com"
+    cliente.email = "nuevo@x.com"
+    assert cliente.email == "nuevo@x.com"
+    assert gestor.buscar_por_id(1).email == "nuevo@x.com"
+    assert not gestor.existe_email("c1@x.com")
+
+
+def test_baja_libera_el_email(gestor):
+    gestor.agregar(_cliente(1))
+    gestor.eliminar(1)
+    with pytest.raises(ClienteNoEncontradoError):
+        gestor.buscar_por_id(1)
+    gestor.agregar(_cliente(7, "c1@x.com"))
+
+
+@pytest.mark.parametrize("almacen", ["sqlite", "columnar"])
+def test_actualizar_mueve_el_email_con_almacenes_que_materializan_copias(tmp_path, almacen):
+    g = GestorParticionado(2, almacen, carpeta=str(tmp_path))
+    try:
+        g.agregar(_cliente(1, "viejo@x.com"))
+        cliente = g.actualizar(1, email="nuevo@x.com", nombre="Otro")
+        assert (cliente.email, cliente.nombre) == ("nuevo@x.com", "Otro")
+        assert g.existe_email("nuevo@x.com") and not g.existe_email("viejo@x.com")
+        # el email anterior quedó libre para otro cliente
+        g.agregar(_cliente(2, "viejo@x.com"))
+    finally:
+        g.cerrar()
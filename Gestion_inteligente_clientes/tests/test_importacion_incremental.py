@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+
+from modulos.archivos import importar_csv_incremental
+from modulos.gestor_clientes import GestorClientes
+
+
+HEADER = "tipo,id,nombre,email,telefono,direccion,nivel,empresa,contacto\n"
+
+
+def _fila(id_: int, nombre: str = None) -> str:
+    return f"regular,{id_},{nombre or f'Cliente {id_}'},c{id_}@x.com,+569{id_:08d},Calle {id_} #100,,,\n"
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    ruta = tmp_path / "entradas.csv"
+    ruta.write_text(HEADER + _fila(1) + _fila(2), encoding="utf-8")
+    return str(ruta)
+
+
+def _agregar(ruta: str, texto: str) -> None:
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write(texto)
+
+
+def test_solo_lee_lo_agregado(ruta):
+    gestor = GestorClientes()
+    assert importar_csv_incremental(ruta, gestor)["insertados"] == 2
+
+    _agregar(ruta, _fila(3) + "regular,4,Cortado")  # última línea a medio escribir
+    r = importar_csv_incremental(ruta, gestor)
+    assert (r["insertados"], r["omitidos"], r["completo"]) == (1, 0, False)
+
+    _agregar(ruta, ",c4@x.com,+56900000004,Calle 4 #100,,,\n")
+    r = importar_csv_incremental(ruta, gestor)
+    assert (r["insertados"], r["completo"]) == (1, False)
+    assert gestor.buscar_por_id(4).nombre == "Cortado"
+
+
+def test_edicion_sin_cambio_de_tamano_revisa_todo(ruta):
+    gestor = GestorClientes()
+    importar_csv_incremental(ruta, gestor)
+    mtime = os.stat(ruta).st_mtime_ns
+
+    with open(ruta, "r+", encoding="utf-8") as f:
+        texto = f.read().replace("Cliente 1", "Clienta 1")
+        f.seek(0)
+        f.write(texto)
+    os.utime(ruta, ns=(mtime + 10**9, mtime + 10**9))
+
+    r = importar_csv_incremental(ruta, gestor)
+    assert (r["actualizados"], r["omitidos"], r["completo"]) == (1, 1, True)
+    assert gestor.buscar_por_id(1).nombre == "Clienta 1"
+
+
+def test_archivo_achicado_revisa_todo(ruta):
+    gestor = GestorClientes()
+    importar_csv_incremental(ruta, gestor)
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(HEADER + _fila(1, "Otro"))
+
+    r = importar_csv_incremental(ruta, gestor)
+    assert (r["actualizados"], r["completo"]) == (1, True)
+
+
+@pytest.mark.parametrize("estado", [
+    {},
+    {"offset": "10", "lineas": 1, "huella": "x", "tamano": 1, "mtime_ns": 1},
+    {"lineas": 2, "huella": "x"},
+    {"offset": True, "lineas": None},
+    [1, 2, 3],
+    "no es un estado",
+])
+def test_estado_con_otro_esquema_revisa_todo(ruta, estado):
+    gestor = GestorClientes()
+    importar_csv_incremental(ruta, gestor)
+    with open(ruta + ".estado", "w", encoding="utf-8") as f:
+        json.dump(estado, f)
+
+    r = importar_csv_incremental(ruta, gestor)
+    assert (r["omitidos"], r["completo"]) == (2, True)
+
+    # y deja un estado válido para la próxima
+    assert importar_csv_incremental(ruta, gestor)["completo"] is False
+
+
+def test_cli_sin_almacen_persistente_vuelve_a_leer_todo(ruta, tmp_path, capsys):
+    from modulos import cli
+
+    argv = ["--almacen", "memoria", "--log", str(tmp_path / "app.log"), "import", ruta, "--incremental"]
+    for _ in range(2):
+        # cada corrida arranca con el gestor vacío: el estado de la anterior no sirve
+        assert cli.main(argv + ["+", "import", ruta, "--incremental"]) == 0
+        lineas = [l for l in capsys.readouterr().err.splitlines() if l.startswith("import:")]
+        # dentro de la misma corrida, la segunda importación sí lo aprovecha
+        assert [l.split(",")[0] for l in lineas] == ["import: 2 insertados", "import: 0 insertados"]
@@ -0,0 +1,74 @@
+import pytest
+
+from modulos import metricas
+from modulos.archivos import exportar_csv
+from modulos.fabrica_clientes import crear_cliente
+from modulos.gestor_clientes import GestorClientes
+from modulos.gestor_particionado import GestorParticionado
+
+
+@pytest.fixture(autouse=True)
+def _metricas_limpias():
+    metricas.reiniciar()
+    yield
+    metricas.desactivar()
+    metricas.reiniciar()
+
+
+def _clientes(n: int) -> list:
+    return [crear_cliente("regular", i, f"Cliente {i}", f"c{i}@x.com", f"+569{i:08d}", f"Calle {i} #100")
+            for i in range(1, n + 1)]
+
+
+def _cargar(gestor) -> None:
+    gestor.agregar_muchos(_clientes(20))
+    gestor.buscar_por_id(1)
+    with pytest.raises(Exception):
+        gestor.buscar_por_id(999)
+    gestor.buscar(nombre="cliente 1")
+
+
+def test_apagadas_no_registran():
+    _cargar(GestorClientes())
+    assert metricas.instantanea() == {}
+
+
+def test_funciones_importadas_antes_de_activar(tmp_path):
+    gestor = GestorClientes()
+    metricas.activar()
+    _cargar(gestor)
+    # exportar_csv se importó por nombre antes de activar()
+    exportar_csv(str(tmp_path / "c.csv"), gestor.iterar(), rapido=True)
+
+    datos = metricas.instantanea()
+    assert datos["gestor.buscar_por_id"]["llamadas"] == 2
+    assert datos["gestor.buscar_por_id"]["errores"] == 1
+    assert datos["gestor.agregar_muchos"]["filas"] == 20
+    assert datos["gestor.buscar"]["filas"] == 11
+    assert datos["archivos.exportar_csv"]["filas"] == 20
+
+    metricas.desactivar()
+    gestor.buscar_por_id(1)
+    assert metricas.instantanea()["gestor.buscar_por_id"]["llamadas"] == 2
+
+
+def test_desactivar_sin_activar_y_activar_dos_veces():
+    metricas.desactivar()
+    metricas.activar()
+    metricas.activar()
+    GestorClientes().agregados()
+    assert metricas.instantanea()["gestor.agregados"]["llamadas"] == 1
+
+
+def test_gestor_particionado():
+    gestor = GestorParticionado(2)
+    try:
+        metricas.activar()
+        _cargar(gestor)
+    finally:
+        gestor.cerrar()
+
+    datos = metricas.instantanea()
+    assert datos["gestor.agregar_muchos"]["filas"] == 20
+    assert (datos["gestor.buscar_por_id"]["llamadas"], datos["gestor.buscar_por_id"]["errores"]) == (2, 1)
+    assert datos["gestor.buscar"]["filas"] == 11
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from modulos.servidor_http import ServidorClientes
+
+
+ANA = {"tipo": "regular", "id": 1, "nombre": "Ana", "email": "ana@x.com",
+       "telefono": "+56911111111", "direccion": "Calle 1 #100"}
+BETO = {"tipo": "premium", "id": 2, "nombre": "Beto", "email": "beto@x.com",
+        "telefono": "+56922222222", "direccion": "Calle 2 #200", "nivel": "gold"}
+
+
+async def _enviar(reader, writer, metodo: str, ruta: str, datos=None) -> tuple:
+    cuerpo = json.dumps(datos).encode() if datos is not None else b""
+    writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+    cabecera = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    largo = next(int(l.split(":")[1]) for l in cabecera if l.lower().startswith("content-length"))
+    texto = await reader.readexactly(largo)
+    return int(cabecera[0].split()[1]), json.loads(texto) if texto else None
+
+
+def _con_servidor(prueba):
+    """Corre `prueba(servidor, conectar)` con un servidor en un puerto libre."""
+
+    async def correr():
+        servidor = ServidorClientes()
+        await servidor.iniciar("127.0.0.1", 0)
+        conexiones = []
+
+        async def conectar():
+            conexiones.append(await asyncio.open_connection("127.0.0.1", servidor.puerto))
+            return conexiones[-1]
+
+        try:
+            return await prueba(servidor, conectar)
+        finally:
+            for _, writer in conexiones:
+                writer.close()
+            servidor._servidor.close()
+            await servidor._servidor.wait_closed()
+            servidor.cerrar()
+
+    return asyncio.run(correr())
+
+
+def _pedidos(pedidos: list) -> list:
+    """Envía los pedidos por una conexión y devuelve [(estado, cuerpo)]."""
+
+    async def prueba(servidor, conectar):
+        reader, writer = await conectar()
+        return [await _enviar(reader, writer, *p) for p in pedidos]
+
+    return _con_servidor(prueba)
+
+
+@pytest.mark.parametrize("campos", [{"_email": "ana@x.com"}, {"_id": 1}, {"to_dict": 1}, {"nivel": "gold"}])
+def test_patch_rechaza_campos_no_editables(campos):
+    estados = _pedidos([
+        ("POST", "/clientes", ANA),
+        ("POST", "/clientes", BETO),
+        ("PATCH", "/clientes/1", campos),
+        ("GET", "/clientes", None),
+    ])
+    assert [e for e, _ in estados[:3]] == [201, 201, 400]
+    listado = estados[3][1]
+    assert [(c["id"], c["email"]) for c in listado] == [(1, "ana@x.com"), (2, "beto@x.com")]
+
+
+def test_patch_acepta_campos_del_tipo():
+    (_, _, (estado, cliente), (estado_dup, _)) = _pedidos([
+        ("POST", "/clientes", ANA),
+        ("POST", "/clientes", BETO),
+        ("PATCH", "/clientes/2", {"nivel": "Platinum", "nombre": "Beto B", "id": 2, "tipo": "premium"}),
+        ("PATCH", "/clientes/2", {"email": "ANA@x.com"}),
+    ])
+    assert estado == 200
+    assert (cliente["nivel"], cliente["nombre"]) == ("platinum", "Beto B")
+    assert estado_dup == 409
+
+
+def test_errores_se_mapean_a_codigos_http():
+    estados = [e for e, _ in _pedidos([
+        ("GET", "/clientes/99", None),
+        ("GET", "/clientes/abc", None),
+        ("POST", "/clientes", {**ANA, "email": "no-es-email"}),
+        ("POST", "/clientes", ANA),
+        ("POST", "/clientes", ANA),
+        ("DELETE", "/clientes", None),
+        ("GET", "/inexistente", None),
+        ("DELETE", "/clientes/1", None),
+    ])]
+    assert estados == [404, 404, 400, 201, 409, 405, 404, 204]
+
+
+def test_operacion_que_espera_el_cerrojo_no_frena_el_event_loop():
+    async def prueba(servidor, conectar):
+        r1, w1 = await conectar()
+        r2, w2 = await conectar()
+        assert (await _enviar(r1, w1, "POST", "/clientes", ANA))[0] == 201
+
+        # otro hilo (p. ej. una importación) tiene el cerrojo de escritura
+        tomado, soltar = threading.Event(), threading.Event()
+
+        def escritor():
+            with servidor.gestor._cerrojo.escritura():
+                tomado.set()
+                soltar.wait(5)
+
+        hilo = threading.Thread(target=escritor)
+        hilo.start()
+        tomado.wait(5)
+        try:
+            bloqueado = asyncio.ensure_future(_enviar(r1, w1, "GET", "/clientes/1"))
+            # la otra conexión se sigue atendiendo mientras la primera espera
+            estado, _ = await asyncio.wait_for(_enviar(r2, w2, "GET", "/metricas"), 2)
+            assert estado == 200
+            assert not bloqueado.done()
+        finally:
+            soltar.set()
+            hilo.join()
+        assert (await asyncio.wait_for(bloqueado, 2))[0] == 200
+
+    _con_servidor(prueba)